@@ -24,6 +24,18 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Indexes limited to one dialect with Index.ddl_if are not expected on
+    # the others
+    ddl_if = getattr(object, "_ddl_if", None)
+    if type_ == "index" and ddl_if is not None and ddl_if.dialect is not None:
+        dialects = ddl_if.dialect
+        if isinstance(dialects, str):
+            dialects = (dialects,)
+        return context.get_context().dialect.name in dialects
+    return True
+
+
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -31,6 +43,7 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -45,7 +58,11 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,59 @@
+"""add tasks full-text index
+
+Revision ID: 2b7e9d1c4a85
+Revises: 8c4e1b2d7f60
+Create Date: 2026-10-18 13:05:47.930112
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2b7e9d1c4a85"
+down_revision: Union[str, Sequence[str], None] = "8c4e1b2d7f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other backends search through the application's in-memory index
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+        "title, description, content='tasks', content_rowid='rowid', prefix='2 3')"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); END"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description "
+        "ON tasks BEGIN "
+        "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+        "VALUES ('delete', old.rowid, old.title, old.description); "
+        "INSERT INTO tasks_fts(rowid, title, description) "
+        "VALUES (new.rowid, new.title, new.description); END"
+    )
+    # Index the tasks that already exist
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER tasks_fts_update")
+    op.execute("DROP TRIGGER tasks_fts_delete")
+    op.execute("DROP TRIGGER tasks_fts_insert")
+    op.execute("DROP TABLE tasks_fts")
@@ -0,0 +1,42 @@
+"""add tasks owner/created_at/id index
+
+Revision ID: 5d2f8a7c91b4
+Revises: 133ec3c0d449
+Create Date: 2026-10-18 09:12:31.402113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2f8a7c91b4"
+down_revision: Union[str, Sequence[str], None] = "133ec3c0d449"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        # Rows written by the CURRENT_TIMESTAMP server default lack the
+        # fractional seconds SQLAlchemy binds, which breaks (created_at, id)
+        # keyset comparisons on SQLite's text timestamps.
+        op.execute(
+            "UPDATE tasks SET created_at = "
+            "strftime('%Y-%m-%d %H:%M:%f000', created_at) "
+            "WHERE length(created_at) = 19"
+        )
+    op.create_index(
+        "ix_tasks_owner_id_created_at_id",
+        "tasks",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_created_at_id", table_name="tasks")
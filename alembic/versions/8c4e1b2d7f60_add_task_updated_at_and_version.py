@@ -0,0 +1,46 @@
+"""add task updated_at and version
+
+Revision ID: 8c4e1b2d7f60
+Revises: 5d2f8a7c91b4
+Create Date: 2026-10-18 11:40:05.218734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4e1b2d7f60"
+down_revision: Union[str, Sequence[str], None] = "5d2f8a7c91b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+    )
+    # Existing tasks were last modified no later than they were created
+    op.execute("UPDATE tasks SET updated_at = created_at")
+    op.create_index(
+        "ix_tasks_owner_id_updated_at",
+        "tasks",
+        ["owner_id", "updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_updated_at", table_name="tasks")
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_column("version")
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,265 @@
+"""binary uuid keys
+
+Revision ID: a4d9e7b3c2f1
+Revises: f1c7a2e94b30
+Create Date: 2026-10-18 17:21:09.640118
+
+"""
+
+import uuid
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d9e7b3c2f1"
+down_revision: Union[str, Sequence[str], None] = "f1c7a2e94b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+
+TASK_INDEXES = {
+    "ix_tasks_owner_id_created_at_id": ["owner_id", "created_at", "id"],
+    "ix_tasks_owner_id_title_id": ["owner_id", "title", "id"],
+    "ix_tasks_owner_id_updated_at": ["owner_id", "updated_at"],
+}
+
+# As created by 2b7e9d1c4a85; dropped along with the old tasks table
+FTS_TRIGGERS = [
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description "
+    "ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        upgrade_postgresql()
+    else:
+        rebuild_sqlite(sa.LargeBinary(16), sa.LargeBinary(16), "uuid_bytes")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        downgrade_postgresql()
+    else:
+        rebuild_sqlite(sa.String(36), sa.String(), "uuid_text")
+
+
+def rebuild_sqlite(id_type, owner_type, convert: str):
+    """Copy users and tasks into tables with the new key types.
+
+    SQLite cannot change a column's type in place. Rows keep their rowid, so
+    the external-content FTS index stays valid. Readers carry on under WAL;
+    writers wait for the copy.
+    """
+    connection = op.get_bind().connection.driver_connection
+    connection.create_function(
+        "uuid_bytes", 1, lambda value: uuid.UUID(value).bytes, deterministic=True
+    )
+    connection.create_function(
+        "uuid_text", 1, lambda value: str(uuid.UUID(bytes=value)), deterministic=True
+    )
+
+    op.create_table(
+        "users_new",
+        sa.Column("id", id_type, nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO users_new (rowid, id, email, hashed_password, is_active) "
+        f"SELECT rowid, {convert}(id), email, hashed_password, is_active FROM users"
+    )
+    op.create_table(
+        "tasks_new",
+        sa.Column("id", id_type, nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("owner_id", owner_type, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column(
+            "text_escaped", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        "INSERT INTO tasks_new (rowid, id, title, description, owner_id, "
+        "created_at, updated_at, version, text_escaped) "
+        f"SELECT rowid, {convert}(id), title, description, {convert}(owner_id), "
+        "created_at, updated_at, version, text_escaped FROM tasks"
+    )
+
+    # Takes the indexes and FTS triggers of the old tables with them
+    op.drop_table("tasks")
+    op.drop_table("users")
+    op.rename_table("users_new", "users")
+    op.rename_table("tasks_new", "tasks")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    for name, columns in TASK_INDEXES.items():
+        op.create_index(name, "tasks", columns, unique=False)
+    if (
+        op.get_bind()
+        .execute(sa.text("SELECT 1 FROM sqlite_master WHERE name = 'tasks_fts'"))
+        .first()
+    ):
+        for trigger in FTS_TRIGGERS:
+            op.execute(trigger)
+
+
+def upgrade_postgresql():
+    """Swap the text keys for uuid columns without a long lock.
+
+    The uuid columns are added empty and kept current for new writes by a
+    trigger while existing rows are filled in batches and their indexes are
+    built concurrently. Only the final swap of columns and constraints takes
+    an exclusive lock, and it does not rewrite or scan the tables.
+    """
+    op.add_column("users", sa.Column("id_uuid", postgresql.UUID(), nullable=True))
+    op.add_column("tasks", sa.Column("id_uuid", postgresql.UUID(), nullable=True))
+    op.add_column("tasks", sa.Column("owner_uuid", postgresql.UUID(), nullable=True))
+    op.execute(
+        "CREATE FUNCTION users_id_uuid() RETURNS trigger AS $$ BEGIN "
+        "NEW.id_uuid := NEW.id::uuid; RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER users_id_uuid BEFORE INSERT OR UPDATE ON users "
+        "FOR EACH ROW EXECUTE FUNCTION users_id_uuid()"
+    )
+    op.execute(
+        "CREATE FUNCTION tasks_id_uuid() RETURNS trigger AS $$ BEGIN "
+        "NEW.id_uuid := NEW.id::uuid; NEW.owner_uuid := NEW.owner_id::uuid; "
+        "RETURN NEW; END $$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER tasks_id_uuid BEFORE INSERT OR UPDATE ON tasks "
+        "FOR EACH ROW EXECUTE FUNCTION tasks_id_uuid()"
+    )
+    # Let SET NOT NULL below skip its full-table scan
+    for table, column in (
+        ("users", "id_uuid"),
+        ("tasks", "id_uuid"),
+        ("tasks", "owner_uuid"),
+    ):
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_{column}_not_null "
+            f"CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+
+    with op.get_context().autocommit_block():
+        for table, assignments in (
+            ("users", "id_uuid = id::uuid"),
+            ("tasks", "id_uuid = id::uuid, owner_uuid = owner_id::uuid"),
+        ):
+            # One short transaction per batch
+            while (
+                op.get_bind()
+                .execute(
+                    sa.text(
+                        f"UPDATE {table} SET {assignments} WHERE id IN ("
+                        f"SELECT id FROM {table} WHERE id_uuid IS NULL "
+                        f"LIMIT {BATCH_SIZE})"
+                    )
+                )
+                .rowcount
+            ):
+                pass
+        for table, column in (
+            ("users", "id_uuid"),
+            ("tasks", "id_uuid"),
+            ("tasks", "owner_uuid"),
+        ):
+            op.execute(
+                f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_{column}_not_null"
+            )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY users_id_uuid_key ON users (id_uuid)"
+        )
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY tasks_id_uuid_key ON tasks (id_uuid)"
+        )
+        for name, columns in TASK_INDEXES.items():
+            columns = ", ".join(
+                {"id": "id_uuid", "owner_id": "owner_uuid"}.get(column, column)
+                for column in columns
+            )
+            op.execute(f"CREATE INDEX CONCURRENTLY {name}_uuid ON tasks ({columns})")
+
+    # The swap: catalog changes only
+    op.execute("LOCK TABLE users, tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER tasks_id_uuid ON tasks")
+    op.execute("DROP TRIGGER users_id_uuid ON users")
+    op.execute("DROP FUNCTION tasks_id_uuid()")
+    op.execute("DROP FUNCTION users_id_uuid()")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_owner_id_fkey")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_pkey")
+    op.execute("ALTER TABLE users DROP CONSTRAINT users_pkey")
+    for name in TASK_INDEXES:
+        op.execute(f"DROP INDEX {name}")
+    op.execute("ALTER TABLE tasks DROP COLUMN id, DROP COLUMN owner_id")
+    op.execute("ALTER TABLE users DROP COLUMN id")
+    op.execute("ALTER TABLE users RENAME COLUMN id_uuid TO id")
+    op.execute("ALTER TABLE tasks RENAME COLUMN id_uuid TO id")
+    op.execute("ALTER TABLE tasks RENAME COLUMN owner_uuid TO owner_id")
+    op.execute("ALTER TABLE users ALTER COLUMN id SET NOT NULL")
+    op.execute("ALTER TABLE tasks ALTER COLUMN id SET NOT NULL")
+    op.execute("ALTER TABLE tasks ALTER COLUMN owner_id SET NOT NULL")
+    op.execute("ALTER TABLE users DROP CONSTRAINT users_id_uuid_not_null")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_id_uuid_not_null")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_owner_uuid_not_null")
+    op.execute(
+        "ALTER TABLE users ADD CONSTRAINT users_pkey "
+        "PRIMARY KEY USING INDEX users_id_uuid_key"
+    )
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_pkey "
+        "PRIMARY KEY USING INDEX tasks_id_uuid_key"
+    )
+    for name in TASK_INDEXES:
+        op.execute(f"ALTER INDEX {name}_uuid RENAME TO {name}")
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_owner_id_fkey "
+        "FOREIGN KEY (owner_id) REFERENCES users (id) NOT VALID"
+    )
+
+    # Checks existing rows without blocking writes
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE tasks VALIDATE CONSTRAINT tasks_owner_id_fkey")
+
+
+def downgrade_postgresql():
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT tasks_owner_id_fkey")
+    op.execute("ALTER TABLE users ALTER COLUMN id TYPE VARCHAR(36) USING id::text")
+    op.execute(
+        "ALTER TABLE tasks ALTER COLUMN id TYPE VARCHAR(36) USING id::text, "
+        "ALTER COLUMN owner_id TYPE VARCHAR USING owner_id::text"
+    )
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT tasks_owner_id_fkey "
+        "FOREIGN KEY (owner_id) REFERENCES users (id)"
+    )
@@ -0,0 +1,38 @@
+"""add tasks title pattern index
+
+Revision ID: a9c3e6f1d2b4
+Revises: f4a7d2c9b8e1
+Create Date: 2026-10-19 10:04:18.562907
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c3e6f1d2b4"
+down_revision: Union[str, Sequence[str], None] = "f4a7d2c9b8e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite filters title prefixes on ix_tasks_owner_id_title_id
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_tasks_owner_id_title_pattern ON tasks "
+            "(owner_id, title text_pattern_ops) WHERE deleted_at IS NULL"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY ix_tasks_owner_id_title_pattern")
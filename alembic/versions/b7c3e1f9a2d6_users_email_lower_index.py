@@ -0,0 +1,60 @@
+"""index users by lower(email)
+
+Revision ID: b7c3e1f9a2d6
+Revises: a4d9e7b3c2f1
+Create Date: 2026-10-18 18:02:44.215307
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c3e1f9a2d6"
+down_revision: Union[str, Sequence[str], None] = "a4d9e7b3c2f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT lower(email) FROM users GROUP BY lower(email) "
+                "HAVING COUNT(*) > 1"
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Users share an email differing only in case, merge or rename "
+            f"them first: {', '.join(duplicates)}"
+        )
+
+    if op.get_bind().dialect.name == "postgresql":
+        # Registration keeps working while the new index is built
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE UNIQUE INDEX CONCURRENTLY ix_users_email_lower "
+                "ON users (lower(email))"
+            )
+            op.execute("DROP INDEX CONCURRENTLY ix_users_email")
+            op.execute("ALTER INDEX ix_users_email_lower RENAME TO ix_users_email")
+    else:
+        op.drop_index("ix_users_email", table_name="users")
+        op.create_index(
+            "ix_users_email", "users", [sa.text("lower(email)")], unique=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_email", table_name="users")
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
@@ -0,0 +1,64 @@
+"""add per-owner task change sequence and tombstones
+
+Revision ID: c5e2a8d4f1b3
+Revises: b7c3e1f9a2d6
+Create Date: 2026-10-18 20:14:09.581126
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e2a8d4f1b3"
+down_revision: Union[str, Sequence[str], None] = "b7c3e1f9a2d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+uuid_key = sa.LargeBinary(16).with_variant(postgresql.UUID(), "postgresql")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "task_owners",
+        sa.Column("owner_id", uuid_key, nullable=False),
+        sa.Column("seq", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("owner_id"),
+    )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("owner_id", uuid_key, nullable=False),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.Column("task_id", uuid_key, nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "seq"),
+    )
+    # Existing rows keep seq 0 and no backfill is needed: the (seq, id) order
+    # of a first sync covers them, and their next write numbers them. A
+    # constant default is a catalog-only change on both SQLite and PostgreSQL.
+    op.add_column(
+        "tasks", sa.Column("seq", sa.Integer(), server_default="0", nullable=False)
+    )
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_tasks_owner_id_seq_id "
+                "ON tasks (owner_id, seq, id)"
+            )
+    else:
+        op.create_index("ix_tasks_owner_id_seq_id", "tasks", ["owner_id", "seq", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_seq_id", table_name="tasks")
+    # SQLite 3.35+ drops the column in place, leaving the FTS triggers alone
+    op.drop_column("tasks", "seq")
+    op.drop_table("task_tombstones")
+    op.drop_table("task_owners")
@@ -0,0 +1,87 @@
+"""add task soft delete and purge horizon
+
+Revision ID: d8f3b6a1e5c7
+Revises: c5e2a8d4f1b3
+Create Date: 2026-10-18 21:37:52.104863
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f3b6a1e5c7"
+down_revision: Union[str, Sequence[str], None] = "c5e2a8d4f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Owner indexes rebuilt to hold live rows only
+OWNER_INDEXES = {
+    "ix_tasks_owner_id_created_at_id": ["owner_id", "created_at", "id"],
+    "ix_tasks_owner_id_title_id": ["owner_id", "title", "id"],
+    "ix_tasks_owner_id_updated_at": ["owner_id", "updated_at"],
+}
+
+
+def rebuild_owner_indexes(where):
+    if op.get_bind().dialect.name == "postgresql":
+        # Build the replacement next to the old index, so reads keep an index
+        # the whole time
+        condition = f" WHERE {where}" if where else ""
+        with op.get_context().autocommit_block():
+            for name, columns in OWNER_INDEXES.items():
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY {name}_new ON tasks "
+                    f"({', '.join(columns)}){condition}"
+                )
+                op.execute(f"DROP INDEX CONCURRENTLY {name}")
+                op.execute(f"ALTER INDEX {name}_new RENAME TO {name}")
+    else:
+        for name, columns in OWNER_INDEXES.items():
+            op.drop_index(name, table_name="tasks")
+            op.create_index(
+                name,
+                "tasks",
+                columns,
+                sqlite_where=sa.text(where) if where else None,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.add_column(
+        "task_owners",
+        sa.Column("purged_seq", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_index("ix_task_tombstones_deleted_at", "task_tombstones", ["deleted_at"])
+    rebuild_owner_indexes("deleted_at IS NULL")
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY ix_tasks_deleted_at ON tasks (deleted_at) "
+                "WHERE deleted_at IS NOT NULL"
+            )
+    else:
+        op.create_index(
+            "ix_tasks_deleted_at",
+            "tasks",
+            ["deleted_at"],
+            sqlite_where=sa.text("deleted_at IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Soft-deleted rows would show up again without the column
+    op.execute("DELETE FROM tasks WHERE deleted_at IS NOT NULL")
+    op.drop_index("ix_tasks_deleted_at", table_name="tasks")
+    rebuild_owner_indexes(None)
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_column("task_owners", "purged_seq")
+    op.drop_column("tasks", "deleted_at")
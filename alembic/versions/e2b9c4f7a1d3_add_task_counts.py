@@ -0,0 +1,61 @@
+"""add per-owner task counts
+
+Revision ID: e2b9c4f7a1d3
+Revises: d8f3b6a1e5c7
+Create Date: 2026-10-18 23:05:41.772310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b9c4f7a1d3"
+down_revision: Union[str, Sequence[str], None] = "d8f3b6a1e5c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+uuid_key = sa.LargeBinary(16).with_variant(postgresql.UUID(), "postgresql")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "task_owners",
+        sa.Column("task_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "task_daily_counts",
+        sa.Column("owner_id", uuid_key, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("task_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("owner_id", "day"),
+    )
+
+    # Count what is there now. Writes made while this runs can leave the
+    # counts off; python -m app.tasks.reconcile repairs them afterwards
+    if op.get_bind().dialect.name == "postgresql":
+        day = "(created_at AT TIME ZONE 'UTC')::date"
+    else:
+        day = "date(created_at)"
+    op.execute(
+        "INSERT INTO task_owners (owner_id, seq, purged_seq, task_count) "
+        "SELECT owner_id, 0, 0, COUNT(*) FROM tasks WHERE deleted_at IS NULL "
+        "GROUP BY owner_id "
+        "ON CONFLICT (owner_id) DO UPDATE SET task_count = excluded.task_count"
+    )
+    op.execute(
+        "INSERT INTO task_daily_counts (owner_id, day, task_count) "
+        f"SELECT owner_id, {day}, COUNT(*) FROM tasks WHERE deleted_at IS NULL "
+        f"GROUP BY owner_id, {day}"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("task_daily_counts")
+    op.drop_column("task_owners", "task_count")
@@ -0,0 +1,33 @@
+"""add tasks owner/title/id index
+
+Revision ID: e3a6c5f08d19
+Revises: 2b7e9d1c4a85
+Create Date: 2026-10-18 14:22:16.504381
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a6c5f08d19"
+down_revision: Union[str, Sequence[str], None] = "2b7e9d1c4a85"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_owner_id_title_id",
+        "tasks",
+        ["owner_id", "title", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_owner_id_title_id", table_name="tasks")
@@ -0,0 +1,62 @@
+"""add task text_escaped
+
+Revision ID: f1c7a2e94b30
+Revises: e3a6c5f08d19
+Create Date: 2026-10-18 15:02:47.193025
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c7a2e94b30"
+down_revision: Union[str, Sequence[str], None] = "e3a6c5f08d19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ENTITIES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#x27;"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every existing row was stored HTML-escaped; app.tasks.backfill
+    # rewrites them as raw text and clears the flag
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "text_escaped", sa.Boolean(), nullable=False, server_default=sa.true()
+        ),
+    )
+    # SQLite cannot change a default without rebuilding the table (and its
+    # FTS triggers); the application always writes the column itself
+    if op.get_bind().dialect.name != "sqlite":
+        op.alter_column("tasks", "text_escaped", server_default=sa.false())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The previous code stores and serves text escaped
+    tasks = sa.table(
+        "tasks",
+        sa.column("title", sa.String),
+        sa.column("description", sa.Text),
+        sa.column("text_escaped", sa.Boolean),
+    )
+    values = {}
+    for name in ("title", "description"):
+        expression = tasks.c[name]
+        for char, entity in ENTITIES:
+            expression = sa.func.replace(expression, char, entity)
+        values[name] = expression
+    op.execute(tasks.update().where(tasks.c.text_escaped == sa.false()).values(values))
+    op.drop_column("tasks", "text_escaped")
@@ -0,0 +1,39 @@
+"""add tasks seq claim trigger
+
+Revision ID: f4a7d2c9b8e1
+Revises: e2b9c4f7a1d3
+Create Date: 2026-10-19 09:12:30.418255
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a7d2c9b8e1"
+down_revision: Union[str, Sequence[str], None] = "e2b9c4f7a1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL claims the number with a CTE in the UPDATE instead
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE TRIGGER tasks_claim_seq AFTER UPDATE OF seq ON tasks "
+        "WHEN new.seq > old.seq BEGIN "
+        "INSERT INTO task_owners (owner_id, seq) VALUES (new.owner_id, new.seq) "
+        "ON CONFLICT (owner_id) DO UPDATE SET seq = excluded.seq "
+        "WHERE excluded.seq > task_owners.seq; END"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER tasks_claim_seq")
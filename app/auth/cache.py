@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import settings
+from app.metrics import Counter, Gauge
+from .schemas import User
+
+principal_cache_hits = Counter(
+    "principal_cache_hits_total", "Authenticated requests served from the cache"
+)
+principal_cache_misses = Counter(
+    "principal_cache_misses_total", "Authenticated requests that loaded the user"
+)
+principal_cache_evictions = Counter(
+    "principal_cache_evictions_total",
+    "Principals dropped from the cache",
+    labels=("reason",),
+)
+
+
+class PrincipalCache:
+    """In-process TTL + LRU cache of authenticated users keyed by bearer token.
+
+    An entry lives until the TTL or the token's own ``exp``, whichever comes
+    first. Entries are indexed by user id as well so that deactivating a user
+    or changing their email drops every token they hold.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, User]] = OrderedDict()
+        self.tokens_by_user: dict[str, set[str]] = {}
+        self.lock = threading.Lock()
+        self.size_gauge = Gauge(
+            "principal_cache_size",
+            "Principals currently cached",
+            callback=lambda: len(self.entries),
+        )
+
+    def get(self, token: str) -> Optional[User]:
+        with self.lock:
+            entry = self.entries.get(token)
+            if entry is not None:
+                expires_at, user = entry
+                if expires_at > time.monotonic():
+                    self.entries.move_to_end(token)
+                    principal_cache_hits.inc()
+                    return user
+                self._remove(token, "expired")
+        principal_cache_misses.inc()
+        return None
+
+    def peek(self, token: str) -> Optional[User]:
+        """The user holding ``token`` if cached, without counting a hit or
+        miss"""
+        with self.lock:
+            entry = self.entries.get(token)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, token: str, user: User, token_expires_at: Optional[float] = None):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(
+                expires_at, time.monotonic() + token_expires_at - time.time()
+            )
+        with self.lock:
+            if token in self.entries:
+                self._remove(token, "replaced")
+            self.entries[token] = (expires_at, user)
+            self.tokens_by_user.setdefault(user.id, set()).add(token)
+            while len(self.entries) > self.max_size:
+                self._remove(next(iter(self.entries)), "capacity")
+
+    def invalidate_user(self, user_id: str):
+        with self.lock:
+            for token in list(self.tokens_by_user.get(user_id, ())):
+                self._remove(token, "invalidated")
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.tokens_by_user.clear()
+
+    def _remove(self, token: str, reason: str):
+        _, user = self.entries.pop(token)
+        tokens = self.tokens_by_user.get(user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.tokens_by_user[user.id]
+        principal_cache_evictions.inc(reason=reason)
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -1,19 +1,18 @@
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Index, func
 from app.database import Base
-import uuid
-
-
-def generate_uuid():
-    return str(uuid.uuid4())
+from app.ids import BinaryUUID, generate_uuid
 
 
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
-    email = Column(String, unique=True, index=True, nullable=False)
+    id = Column(BinaryUUID, primary_key=True, default=generate_uuid)
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
 
+    # Addresses are unique and looked up regardless of case
+    __table_args__ = (Index("ix_users_email", func.lower(email), unique=True),)
+
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email})>"
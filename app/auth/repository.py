@@ -1,7 +1,14 @@
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.database import DBSession
+from .cache import principal_cache
 from .models import User
 from .schemas import UserCreate
-from .utils import get_password_hash
+from .utils import get_password_hash, password_hasher
 
 
 class UserRepository:
@@ -12,13 +19,68 @@ class UserRepository:
         return self.db.query(User).filter(User.id == user_id).first()
 
     def get_user_by_email(self, email: str):
-        return self.db.query(User).filter(User.email == email).first()
+        # Matches ix_users_email, so this stays an index lookup
+        return (
+            self.db.query(User)
+            .filter(func.lower(User.email) == func.lower(email))
+            .first()
+        )
 
-    def create_user(self, user: UserCreate):
+    def create_user(self, user: UserCreate, hashed_password: Optional[str] = None):
+        """Insert the user, raising IntegrityError if the email is taken"""
         db_user = User(
-            email=user.email, hashed_password=get_password_hash(user.password)
+            email=user.email,
+            hashed_password=hashed_password or get_password_hash(user.password),
         )
         self.db.add(db_user)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise
+        self.db.refresh(db_user)
+        return db_user
+
+    def deactivate_user(self, db_user: User):
+        db_user.is_active = False
         self.db.commit()
         self.db.refresh(db_user)
+        principal_cache.invalidate_user(db_user.id)
         return db_user
+
+    def update_user_email(self, db_user: User, email: str):
+        db_user.email = email
+        self.db.commit()
+        self.db.refresh(db_user)
+        principal_cache.invalidate_user(db_user.id)
+        return db_user
+
+
+class AsyncUserRepository:
+    """Awaitable front for UserRepository, see AsyncTaskRepository."""
+
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    async def _run(self, method, *args):
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(
+                lambda session: method(UserRepository(session), *args)
+            )
+        return method(UserRepository(self.db), *args)
+
+    async def get_user(self, user_id: str):
+        return await self._run(UserRepository.get_user, user_id)
+
+    async def get_user_by_email(self, email: str):
+        return await self._run(UserRepository.get_user_by_email, email)
+
+    async def create_user(self, user: UserCreate):
+        hashed_password = await password_hasher.hash(user.password)
+        return await self._run(UserRepository.create_user, user, hashed_password)
+
+    async def deactivate_user(self, db_user: User):
+        return await self._run(UserRepository.deactivate_user, db_user)
+
+    async def update_user_email(self, db_user: User, email: str):
+        return await self._run(UserRepository.update_user_email, db_user, email)
@@ -1,13 +1,14 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.config import settings
-from .repository import UserRepository
-from app.database import get_db
+from app.exceptions import EmailExistsError
+from .repository import AsyncUserRepository
+from app.database import DBSession, get_session
 from .schemas import UserCreate, User, Token, UserLogin
 from .service import create_access_token, get_current_user
-from .utils import verify_password
+from .utils import password_hasher
 
 router = APIRouter(tags=["users"])
 
@@ -18,10 +19,11 @@ router = APIRouter(tags=["users"])
     responses={
         400: {"description": "Email already registered"},
         500: {"description": "Internal server error"},
+        503: {"description": "Password hashing pool saturated"},
     },
     status_code=status.HTTP_201_CREATED,
 )
-async def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: DBSession = Depends(get_session)):
     """
     Register a new user.
 
@@ -29,24 +31,15 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     - User object if successful
     - 400 error if email exists
     - 500 error for server issues
+    - 503 error when the password hashing pool is saturated
     """
     try:
-        user_repo = UserRepository(db)
-
-        # Check if email exists
-        if user_repo.get_user_by_email(email=user.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error": "Email already registered",
-                    "code": "EMAIL_EXISTS",
-                    "message": "This email address is already in use",
-                },
-            )
-
-        # Create new user
-        db_user = user_repo.create_user(user)
-        return db_user
+        # One INSERT; the unique index on lower(email) settles concurrent
+        # registrations of the same address
+        return await AsyncUserRepository(db).create_user(user)
+
+    except IntegrityError as e:
+        raise EmailExistsError() from e
 
     except HTTPException as http_exc:
         raise http_exc
@@ -63,10 +56,10 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 # Consolidated login function for swagger and direct client call to avoid code duplication
-def get_login_token(email: str, password: str, db: Session):
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_email(email)
-    if not user or not verify_password(password, user.hashed_password):
+async def get_login_token(email: str, password: str, db: DBSession):
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get_user_by_email(email)
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         raise HTTPException(
             status_code=401,
             detail="Incorrect email or password",
@@ -80,18 +73,19 @@ def get_login_token(email: str, password: str, db: Session):
 
 
 @router.post("/login/form", response_model=Token)
-def login_user_form(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login_user_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: DBSession = Depends(get_session),
 ):
-    access_token = get_login_token(form_data.username, form_data.password, db)
+    access_token = await get_login_token(form_data.username, form_data.password, db)
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.post("/login", response_model=Token)
-def login_user(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_login: UserLogin, db: DBSession = Depends(get_session)):
     try:
-        access_token = get_login_token(user_login.email, user_login.password, db)
+        access_token = await get_login_token(user_login.email, user_login.password, db)
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException as http_exc:
         raise http_exc
@@ -1,16 +1,15 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional
 
-from sqlalchemy.orm import Session
-
 from jose import JWTError, jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 
 from app.config import settings
-from app.auth.schemas import TokenData
-from .repository import UserRepository
-from app.database import get_db
+from app.auth.schemas import TokenData, User
+from .cache import principal_cache
+from .repository import AsyncUserRepository
+from app.database import DBSession, get_read_session, get_session
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/users/login/form")
 
@@ -28,18 +27,38 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def decode_token(token: str) -> dict:
+    """Claims of ``token`` once its signature and expiry check out; raises
+    JWTError otherwise"""
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+
+def token_claims(request: Request, token: str) -> dict:
+    """Claims of ``token``, reusing those RateLimitMiddleware verified for this
+    request rather than checking the signature twice"""
+    verified = getattr(request.state, "token_claims", None)
+    if verified is not None and verified[0] == token:
+        return verified[1]
+    return decode_token(token)
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: DBSession = Depends(get_read_session),
+    primary: DBSession = Depends(get_session),
 ):
+    user = principal_cache.get(token)
+    if user is not None:
+        return user
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = token_claims(request, token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
@@ -47,8 +66,16 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_email(email=token_data.email)
-    if user is None:
+    db_user = await AsyncUserRepository(db).get_user_by_email(email=token_data.email)
+    if db_user is None and db is not primary:
+        # Just registered: the replica may not have the user yet
+        db_user = await AsyncUserRepository(primary).get_user_by_email(
+            email=token_data.email
+        )
+    if db_user is None or not db_user.is_active:
         raise credentials_exception
+
+    # Cache a detached snapshot, never the session-bound ORM object
+    user = User.model_validate(db_user)
+    principal_cache.put(token, user, payload.get("exp"))
     return user
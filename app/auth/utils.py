@@ -1,7 +1,26 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.config import settings
+from app.exceptions import ServiceBusyError
+from app.metrics import Gauge, Histogram
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+password_hash_seconds = Histogram(
+    "password_hash_seconds",
+    "Time spent hashing or verifying a password",
+    labels=("operation",),
+)
+password_hash_queue_wait_seconds = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a password hash job waited for a free worker",
+    labels=("operation",),
+)
+
 
 def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
@@ -9,3 +28,64 @@ def verify_password(plain_password: str, hashed_password: str):
 
 def get_password_hash(password: str):
     return pwd_context.hash(password)
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool with a bounded backlog.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without pickling costs. Once ``max_pending`` jobs are queued or running,
+    new ones are rejected with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self.pending = 0
+        self.pending_gauge = Gauge(
+            "password_hash_pending",
+            "Password hash jobs queued or running",
+            callback=lambda: self.pending,
+        )
+
+    async def _submit(self, operation: str, func, *args):
+        if self.pending >= self.max_pending:
+            raise ServiceBusyError(self.retry_after)
+
+        queued_at = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            password_hash_queue_wait_seconds.observe(
+                started - queued_at, operation=operation
+            )
+            try:
+                return func(*args)
+            finally:
+                password_hash_seconds.observe(
+                    time.perf_counter() - started, operation=operation
+                )
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, run)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(
+            "verify", verify_password, plain_password, hashed_password
+        )
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
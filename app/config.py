@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +10,87 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # Serve requests through an AsyncEngine/AsyncSession instead of the sync engine
+    DATABASE_ASYNC: bool = False
+    # Defaults to DATABASE_URL with the matching async driver (aiosqlite/asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Replica for read-only routes, and how long a principal keeps reading
+    # from the primary after a write so it sees its own changes
+    READ_DATABASE_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    # Connection pool for server databases and SQLite files
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Pragmas applied to every new SQLite connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456
+
+    # Dedicated bcrypt pool; requests beyond MAX_PENDING get a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    PASSWORD_HASH_RETRY_AFTER: int = 1
+
+    # Token buckets: login/registration per client address, task routes
+    # per user. Limits are per worker process
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_AUTH_PER_MINUTE: float = 10
+    RATE_LIMIT_AUTH_BURST: int = 10
+    RATE_LIMIT_USER_PER_MINUTE: float = 600
+    RATE_LIMIT_USER_BURST: int = 100
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # Authenticated principals cached per token; 0 disables the cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+
+    # Largest batch accepted by the /tasks/bulk endpoints
+    BULK_MAX_ITEMS: int = 1000
+
+    # HTML-escape task text in responses unless a request sends
+    # X-Escape-HTML: false. Text is always stored as sent
+    ESCAPE_HTML_OUTPUT: bool = True
+
+    # Encode GET /tasks pages straight from column tuples with orjson instead
+    # of validating every row through the response model
+    FAST_SERIALIZATION: bool = False
+
+    # Queue POST /tasks for a single writer that inserts and commits many at
+    # once, after up to MAX_DELAY_MS or MAX_BATCH rows. Requests still return
+    # only once their task is committed; beyond MAX_PENDING they get a 503
+    WRITE_BEHIND_ENABLED: bool = False
+    WRITE_BEHIND_MAX_BATCH: int = 500
+    WRITE_BEHIND_MAX_DELAY_MS: float = 2
+    WRITE_BEHIND_MAX_PENDING: int = 10000
+
+    # GET /tasks/events: events kept for Last-Event-ID resume, undelivered
+    # events per stream before it is told to resync, and how often an idle
+    # stream gets a keepalive
+    TASK_EVENTS_LOG_SIZE: int = 10000
+    TASK_EVENTS_BUFFER_SIZE: int = 100
+    TASK_EVENTS_KEEPALIVE_SECONDS: float = 15
+
+    # Deletes set deleted_at and leave the row for app.tasks.purge, which
+    # removes rows and tombstones older than PURGE_RETENTION_HOURS in chunks
+    # of PURGE_BATCH_SIZE at no more than PURGE_ROWS_PER_SECOND
+    TASK_SOFT_DELETE: bool = False
+    TASK_PURGE_RETENTION_HOURS: float = 168
+    TASK_PURGE_BATCH_SIZE: int = 500
+    TASK_PURGE_ROWS_PER_SECOND: float = 5000
+
+    # Most IDs accepted by /tasks/batch-get
+    BATCH_GET_MAX_IDS: int = 500
+
+    # Rows fetched per round trip and flushed per chunk by /tasks/export
+    EXPORT_BATCH_SIZE: int = 1000
+
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
 
@@ -1,21 +1,324 @@
-from sqlalchemy import create_engine
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Union
+
+from fastapi import Depends, Request
+from jose import JWTError, jwt
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.metrics import Gauge, Histogram
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+DBSession = Union[Session, AsyncSession]
+
+
+def get_async_database_url(url: str) -> str:
+    database_url = make_url(url)
+    driver = ASYNC_DRIVERS.get(database_url.get_backend_name(), database_url.drivername)
+    return database_url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+db_pool_checkout_wait_seconds = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection",
+    labels=("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    labels=("engine",),
+)
+db_pool_utilization = Gauge(
+    "db_pool_utilization",
+    "Checked out connections over pool_size + max_overflow",
+    labels=("engine",),
 )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited"""
+
+    engine_name = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.engine_name = self.engine_name
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_wait_seconds.observe(
+                time.perf_counter() - started, engine=self.engine_name
+            )
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_sqlite_memory(url: str) -> bool:
+    database_url = make_url(url)
+    return database_url.get_backend_name() == "sqlite" and database_url.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def engine_options(url: str) -> dict:
+    """Tuned create_engine() arguments for the URL's backend"""
+    backend = make_url(url).get_backend_name()
+    options = {}
+    if backend == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        # In-memory databases keep SQLAlchemy's single-connection pools
+        if is_sqlite_memory(url):
+            return options
+    else:
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE
+        options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    options["pool_size"] = settings.DB_POOL_SIZE
+    options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    options["pool_timeout"] = settings.DB_POOL_TIMEOUT
+    return options
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.close()
+
+
+def instrument_pool(sync_engine, name: str):
+    pool = sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+    pool.engine_name = name
+    capacity = pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+
+    def update_utilization():
+        checked_out = db_pool_checked_out.value(engine=name)
+        db_pool_utilization.set(checked_out / capacity, engine=name)
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        db_pool_checked_out.inc(engine=name)
+        update_utilization()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        db_pool_checked_out.dec(engine=name)
+        update_utilization()
+
+
+def create_db_engine(url: str, name: str = "primary", use_async: bool = False):
+    """Build an engine with the per-dialect profile from engine_options()"""
+    options = engine_options(url)
+    if "pool_size" in options:
+        options["poolclass"] = (
+            InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool
+        )
+    db_engine = (create_async_engine if use_async else create_engine)(url, **options)
+    sync_engine = db_engine.sync_engine if use_async else db_engine
+
+    if sync_engine.dialect.name == "sqlite" and not is_sqlite_memory(url):
+        event.listen(sync_engine, "connect", apply_sqlite_pragmas)
+    instrument_pool(sync_engine, name)
+    return db_engine
+
+
+engine = create_db_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_db_engine(
+        settings.ASYNC_DATABASE_URL or get_async_database_url(SQLALCHEMY_DATABASE_URL),
+        name="primary_async",
+        use_async=True,
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+# Optional replica for read-only routes; without one they use the primary
+read_engine = None
+ReadSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if settings.READ_DATABASE_URL:
+    if settings.DATABASE_ASYNC:
+        async_read_engine = create_db_engine(
+            get_async_database_url(settings.READ_DATABASE_URL),
+            name="replica_async",
+            use_async=True,
+        )
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine, autoflush=False, expire_on_commit=False
+        )
+    else:
+        read_engine = create_db_engine(settings.READ_DATABASE_URL, name="replica")
+        ReadSessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=read_engine
+        )
+
 Base = declarative_base()
 
 
-def get_db():
+class PrimaryPins:
+    """Principals that read from the primary until their pin runs out.
+
+    A principal is pinned for ``window`` seconds after each write so its
+    reads never come from a replica that has not caught up with it yet.
+    """
+
+    def __init__(self, window: float, max_size: int = 100_000):
+        self.window = window
+        self.max_size = max_size
+        self.pinned_until: dict[str, float] = {}
+
+    def pin(self, key: str):
+        now = time.monotonic()
+        if len(self.pinned_until) >= self.max_size:
+            self.pinned_until = {
+                k: until for k, until in self.pinned_until.items() if until > now
+            }
+        self.pinned_until[key] = now + self.window
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        return self.pinned_until.get(key, 0) > time.monotonic()
+
+    def clear(self):
+        self.pinned_until.clear()
+
+
+primary_pins = PrimaryPins(settings.READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(Session, "after_commit")
+def mark_written(session):
+    session.info["wrote"] = True
+
+
+def pin_key(request: Request) -> Optional[str]:
+    """Subject of the request's bearer token.
+
+    The signature is not checked: the key only picks a database, and
+    get_current_user still validates the token.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
+def pin_if_written(request: Request, db: Session):
+    if db.info.get("wrote"):
+        key = pin_key(request)
+        if key is not None:
+            primary_pins.pin(key)
+
+
+def use_replica(request: Request, read_session_factory) -> bool:
+    return read_session_factory is not None and not primary_pins.is_pinned(
+        pin_key(request)
+    )
+
+
+def get_db(request: Request):
     db = SessionLocal()
     try:
         yield db
     finally:
+        pin_if_written(request, db)
         db.close()
+
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            pin_if_written(request, db.sync_session)
+
+
+def get_read_db(request: Request, primary: Session = Depends(get_db)):
+    """Session for read-only routes: the replica unless the caller is pinned.
+
+    The primary session is only opened lazily, so depending on it costs
+    nothing when the replica serves the request.
+    """
+    if not use_replica(request, ReadSessionLocal):
+        yield primary
+        return
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: Request, primary: AsyncSession = Depends(get_async_db)
+):
+    if not use_replica(request, AsyncReadSessionLocal):
+        yield primary
+        return
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+# Session dependencies used by the routers, selected by settings.DATABASE_ASYNC
+get_session = get_async_db if settings.DATABASE_ASYNC else get_db
+get_read_session = get_async_read_db if settings.DATABASE_ASYNC else get_read_db
+
+
+def get_session_factory():
+    """Session factory for work that outlives the request's dependencies"""
+    return AsyncSessionLocal if settings.DATABASE_ASYNC else SessionLocal
+
+
+def get_read_session_factory(
+    request: Request, primary_factory=Depends(get_session_factory)
+):
+    """Like get_session_factory, routed the same way as get_read_session"""
+    factory = AsyncReadSessionLocal if settings.DATABASE_ASYNC else ReadSessionLocal
+    return factory if use_replica(request, factory) else primary_factory
+
+
+@asynccontextmanager
+async def open_session(session_factory):
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        if isinstance(db, AsyncSession):
+            await db.close()
+        else:
+            db.close()
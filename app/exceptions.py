@@ -7,3 +7,74 @@ class TaskNotFoundError(HTTPException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Task with ID {task_id} not found",
         )
+
+
+class ServiceBusyError(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class RateLimitedError(HTTPException):
+    def __init__(self, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail={
+                "error": "Too many requests",
+                "code": "RATE_LIMITED",
+                "message": f"Rate limit exceeded, retry in {retry_after} seconds",
+            },
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class EmailExistsError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Email already registered",
+                "code": "EMAIL_EXISTS",
+                "message": "This email address is already in use",
+            },
+        )
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "Invalid cursor",
+                "code": "INVALID_CURSOR",
+                "message": "The pagination cursor is malformed or expired",
+            },
+        )
+
+
+class PreconditionFailedError(HTTPException):
+    def __init__(self, etag: str):
+        super().__init__(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail={
+                "error": "Precondition failed",
+                "code": "VERSION_MISMATCH",
+                "message": "The task was modified since the given ETag",
+            },
+            headers={"ETag": etag},
+        )
+
+
+class SyncTokenExpiredError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail={
+                "error": "Sync token expired",
+                "code": "SYNC_TOKEN_EXPIRED",
+                "message": "Deletions since this token were purged, sync from scratch",
+            },
+        )
@@ -0,0 +1,88 @@
+import os
+import time
+import uuid
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.types import TypeDecorator
+
+# Bound for strings that are not UUIDs: equal to no stored key and sorting
+# before all of them
+NIL = uuid.UUID(int=0)
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds, so keys made close
+    together land next to each other in an index instead of all over it.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def generate_uuid() -> str:
+    return str(uuid7())
+
+
+def as_uuid(value) -> uuid.UUID:
+    if isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(value)
+    except (TypeError, ValueError):
+        return NIL
+
+
+def uuid_bytes(value) -> bytes:
+    # Canonical strings, the ones generate_uuid and the API hand out, skip the
+    # uuid.UUID round trip, which costs four times as much
+    if isinstance(value, str) and len(value) == 36 and value[8] == value[23] == "-":
+        try:
+            key = bytes.fromhex(value.replace("-", ""))
+        except ValueError:
+            key = b""
+        if len(key) == 16 and value[13] == value[18] == "-":
+            return key
+    return as_uuid(value).bytes
+
+
+class BinaryUUID(TypeDecorator):
+    """A UUID kept as 16 bytes, or PostgreSQL's native uuid, and exchanged
+    with the application as its usual 36-character string.
+
+    Byte order matches the order of the strings, so keyset pagination over
+    ids behaves as it did with text keys.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PostgresUUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == "postgresql":
+            return as_uuid(value)
+        return uuid_bytes(value)
+
+    def literal_processor(self, dialect):
+        if dialect.name == "postgresql":
+            return lambda value: f"'{as_uuid(value)}'"
+        return lambda value: f"X'{as_uuid(value).hex}'"
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        # Same as str(uuid.UUID(bytes=value)) at a quarter of the cost, which
+        # adds up over every id and owner_id read
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
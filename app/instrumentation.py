@@ -0,0 +1,122 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import Counter, Gauge, Histogram
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+http_requests = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    labels=("method", "route", "status"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    labels=("method",),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to finishing its response",
+    labels=("method", "route", "status"),
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Database statements executed per request",
+    labels=("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_duration_seconds = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing database statements per request",
+    labels=("method", "route"),
+)
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds", "Execution time of a single database statement"
+)
+
+
+class RequestStats:
+    """Database work attributed to the request being handled."""
+
+    __slots__ = ("queries", "duration")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+
+
+# Holds a mutable RequestStats so statements executed from copied contexts
+# (threadpool dependencies, run_sync) still add to the request's totals
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_query_duration_seconds.observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.duration += elapsed
+
+
+class MetricsMiddleware:
+    """Record count, latency and database work per method, route and status.
+
+    Routes are labelled by their path template (``/api/v1/tasks/{task_id}``)
+    so the label set stays bounded; requests that match no route share the
+    ``unmatched`` label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        http_requests_in_progress.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method=method)
+            request_stats.reset(token)
+
+            route = scope.get("route")
+            template = route.path if route is not None else "unmatched"
+            http_requests.inc(method=method, route=template, status=status)
+            http_request_duration_seconds.observe(
+                elapsed, method=method, route=template, status=status
+            )
+            http_request_db_queries.observe(
+                stats.queries, method=method, route=template
+            )
+            http_request_db_duration_seconds.observe(
+                stats.duration, method=method, route=template
+            )
@@ -1,7 +1,25 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.auth import routes as users
+from app.database import async_engine
+from app.instrumentation import MetricsMiddleware
+from app.metrics import CONTENT_TYPE, REGISTRY
+from app.ratelimit import RateLimitMiddleware
 from app.tasks import routes as tasks
+from app.tasks.writebehind import task_writer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Queued tasks have requests waiting on them
+    await task_writer.stop()
+    # aiosqlite keeps a worker thread per connection until the pool is closed
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="TaskMaster API",
@@ -9,6 +27,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+# Inside CORS so that 429 responses carry CORS headers too
+app.add_middleware(
+    RateLimitMiddleware,
+    by_ip=("/api/v1/users/login", "/api/v1/users/register"),
+    by_user=("/api/v1/tasks", "/api/v1/users/me"),
 )
 
 # CORS configuration
@@ -19,6 +45,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 # Include routers
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["tasks"])
@@ -35,6 +62,11 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     from app.config import settings
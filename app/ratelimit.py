@@ -0,0 +1,194 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from fastapi.responses import JSONResponse
+from jose import JWTError
+
+from app.auth.cache import principal_cache
+from app.auth.service import decode_token
+from app.config import settings
+from app.exceptions import RateLimitedError
+from app.metrics import Counter, Gauge
+
+rate_limited_requests = Counter(
+    "http_requests_rate_limited_total",
+    "Requests rejected with 429 by the rate limiter",
+    labels=("limit",),
+)
+
+
+class RateLimit:
+    """Up to ``burst`` requests at once, refilled at ``per_minute``"""
+
+    __slots__ = ("name", "rate", "burst")
+
+    def __init__(self, name: str, per_minute: float, burst: int):
+        self.name = name
+        self.rate = per_minute / 60
+        self.burst = burst
+
+
+class RateLimitStore(ABC):
+    """Where token buckets live.
+
+    The in-process store below limits each worker on its own; a shared store
+    (Redis, memcached) implements ``take`` the same way so that every worker
+    draws from one bucket per key.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, limit: RateLimit) -> float:
+        """Take a token from the bucket of ``key``.
+
+        Returns 0 when the request may proceed, otherwise the seconds until a
+        token will be available.
+        """
+
+    @abstractmethod
+    def clear(self):
+        """Drop every bucket, so all keys start again with a full burst"""
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Token buckets in a dict of this process.
+
+    Each bucket is an immutable ``(tokens, updated_at, full_at)`` tuple
+    replaced by a single assignment, and ``take`` never awaits, so buckets need
+    no lock on the event loop. A bucket that has refilled is the same as no
+    bucket; those are swept once the store holds ``max_keys``, and if that is
+    not enough the oldest keys go too.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self.buckets: dict[str, tuple[float, float, float]] = {}
+
+    async def take(self, key: str, limit: RateLimit) -> float:
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            tokens = limit.burst
+            if len(self.buckets) >= self.max_keys:
+                self._sweep(now)
+        else:
+            tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / limit.rate
+        self.buckets[key] = (tokens, now, now + (limit.burst - tokens) / limit.rate)
+        return retry_after
+
+    def clear(self):
+        self.buckets.clear()
+
+    def _sweep(self, now: float):
+        self.buckets = {
+            key: bucket for key, bucket in self.buckets.items() if bucket[2] > now
+        }
+        # Leave room so a flood of new keys does not sweep on every request
+        excess = len(self.buckets) - self.max_keys * 3 // 4
+        if excess > 0:
+            for key in list(self.buckets)[:excess]:
+                del self.buckets[key]
+
+
+auth_limit = RateLimit(
+    "auth", settings.RATE_LIMIT_AUTH_PER_MINUTE, settings.RATE_LIMIT_AUTH_BURST
+)
+user_limit = RateLimit(
+    "user", settings.RATE_LIMIT_USER_PER_MINUTE, settings.RATE_LIMIT_USER_BURST
+)
+rate_limit_store = InMemoryRateLimitStore(settings.RATE_LIMIT_MAX_KEYS)
+rate_limit_buckets = Gauge(
+    "rate_limit_buckets",
+    "Token buckets held by the in-process rate limiter",
+    callback=lambda: len(rate_limit_store.buckets),
+)
+
+
+def bearer_token(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else None
+    return None
+
+
+def token_subject(scope, token: str) -> Optional[str]:
+    """Email of the user ``token`` was issued to, or None for an invalid token.
+
+    Taken from the principal cache when it holds the token, otherwise from
+    the token's own claims once its signature and expiry check out, so that
+    users are told apart even with the cache disabled. The claims are left in
+    the request state for get_current_user, which need not verify them again;
+    whether the user still exists is left to it.
+    """
+    user = principal_cache.peek(token)
+    if user is not None:
+        return user.email
+    try:
+        claims = decode_token(token)
+    except JWTError:
+        return None
+    scope.setdefault("state", {})["token_claims"] = (token, claims)
+    return claims.get("sub")
+
+
+class RateLimitMiddleware:
+    """Reject requests over their limit with 429 and Retry-After.
+
+    Paths under ``by_ip`` (login, registration) are limited per client
+    address with ``auth_limit``. Paths under ``by_user`` are limited per user
+    with ``user_limit``, identified by ``token_subject``; requests without a
+    valid token count against the client address instead.
+    """
+
+    def __init__(
+        self,
+        app,
+        by_ip: tuple[str, ...] = (),
+        by_user: tuple[str, ...] = (),
+        store: Optional[RateLimitStore] = None,
+    ):
+        self.app = app
+        self.by_ip = by_ip
+        self.by_user = by_user
+        self.store = store or rate_limit_store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+        if path.startswith(self.by_ip):
+            limit = auth_limit
+        elif path.startswith(self.by_user):
+            limit = user_limit
+            token = bearer_token(scope)
+            subject = token_subject(scope, token) if token else None
+            if subject is not None:
+                key = subject
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await self.store.take(f"{limit.name}:{key}", limit)
+        if not retry_after:
+            await self.app(scope, receive, send)
+            return
+
+        rate_limited_requests.inc(limit=limit.name)
+        error = RateLimitedError(math.ceil(retry_after))
+        response = JSONResponse(
+            {"detail": error.detail},
+            status_code=error.status_code,
+            headers=error.headers,
+        )
+        await response(scope, receive, send)
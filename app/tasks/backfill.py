@@ -0,0 +1,66 @@
+"""Rewrite task text stored HTML-escaped as raw text.
+
+Rows written before escaping moved to the response encoder carry
+``text_escaped``. This job un-escapes them in primary key order, one short
+transaction per batch, so writers are never held up for more than a batch.
+Responses are the same before and after a row is rewritten, so it can run
+while the API serves traffic, and be stopped and restarted at any point.
+
+    python -m app.tasks.backfill --batch-size 1000 --pause 0.05
+"""
+
+import argparse
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .escaping import raw_text_values
+from .models import Task
+
+
+def unescape_stored_text(db: Session, batch_size: int = 1000, pause: float = 0) -> int:
+    """Rewrite every escaped row, ``batch_size`` at a time; returns the count"""
+    rewritten = 0
+    last_id = ""
+    while True:
+        task_ids = db.scalars(
+            select(Task.id)
+            .where(Task.text_escaped, Task.id > last_id)
+            .order_by(Task.id)
+            .limit(batch_size)
+        ).all()
+        if not task_ids:
+            return rewritten
+        result = db.execute(
+            update(Task)
+            .where(Task.id.in_(task_ids), Task.text_escaped)
+            # Same representation, so versions and timestamps stay put
+            .values(**raw_text_values(), updated_at=Task.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        rewritten += result.rowcount
+        last_id = task_ids[-1]
+        if pause:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--pause", type=float, default=0, help="seconds to sleep between batches"
+    )
+    args = parser.parse_args()
+
+    from app.auth.models import User  # noqa: F401
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        rewritten = unescape_stored_text(db, args.batch_size, args.pause)
+    print(f"rewrote {rewritten} tasks")
+
+
+if __name__ == "__main__":
+    main()
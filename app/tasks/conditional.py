@@ -0,0 +1,89 @@
+import hashlib
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timestamps back naive; they are stored in UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def task_etag(task_id: str, version: int) -> str:
+    return f'"{task_id}-{version}"'
+
+
+def if_match_version(header: Optional[str], task_id: str) -> Optional[int]:
+    """Version required by an If-Match header, None when any will do.
+
+    Returns -1 when the header cannot match any version of this task (another
+    task's ETag, or garbage), so the conditional update fails with a 412.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    for value in header.split(","):
+        value = value.strip()
+        # If-Match uses strong comparison, so weak tags never match
+        prefix = f'"{task_id}-'
+        if value.startswith(prefix) and value.endswith('"'):
+            version = value[len(prefix) : -1]
+            if version.isdigit():
+                return int(version)
+    return -1
+
+
+def list_etag(count: int, last_updated: Optional[datetime], view: str = "") -> str:
+    """ETag of a list response: the state of the user's tasks, and ``view``,
+    what the query asked for, so no other page or filter can match it"""
+    stamp = int(_as_utc(last_updated).timestamp() * 1_000_000) if last_updated else 0
+    digest = hashlib.blake2b(view.encode(), digest_size=8).hexdigest()
+    return f'"{count}-{stamp}-{digest}"'
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime]) -> dict[str, str]:
+    # Text is HTML-escaped or not depending on X-Escape-HTML
+    headers = {"ETag": etag, "Vary": "X-Escape-HTML"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match/If-Match value"""
+    if header.strip() == "*":
+        return True
+    candidates = (value.strip().removeprefix("W/") for value in header.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Whether the client's cached copy is current (RFC 9110 section 13.2.2).
+
+    If-Modified-Since is only consulted when If-None-Match is absent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second precision
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=cache_headers(etag, last_modified),
+    )
@@ -0,0 +1,59 @@
+from typing import Any, Iterable
+
+from pydantic import TypeAdapter
+
+from .escaping import output_text
+from .models import Task as TaskModel
+from .schemas import Task
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# Fields of the Task response schema, in order
+TASK_FIELDS = tuple(
+    name for name, field in Task.model_fields.items() if not field.exclude
+)
+# Their columns, then the flag output_text needs
+TASK_COLUMNS = tuple(TaskModel.__table__.columns[name] for name in TASK_FIELDS) + (
+    TaskModel.text_escaped,
+)
+
+_records_adapter = TypeAdapter(list[dict[str, Any]])
+
+
+_record_adapter = TypeAdapter(dict[str, Any])
+
+
+def task_values(task) -> tuple:
+    """``TASK_COLUMNS`` tuple of a Task entity or a row returned by a write"""
+    return tuple(getattr(task, name) for name in TASK_FIELDS) + (task.text_escaped,)
+
+
+def _record(row: tuple) -> dict:
+    *values, text_escaped = row
+    record = dict(zip(TASK_FIELDS, values))
+    record["title"] = output_text(record["title"], text_escaped)
+    record["description"] = output_text(record["description"], text_escaped)
+    return record
+
+
+def encode_tasks(rows: Iterable[tuple]) -> bytes:
+    """JSON for a list of Task rows selected as ``TASK_COLUMNS`` tuples.
+
+    Produces what ``response_model=list[Task]`` would, without validating
+    each row into a model and encoding it a second time.
+    """
+    records = [_record(row) for row in rows]
+    if orjson is not None:
+        # Same datetime rendering as pydantic: "Z" for UTC, naive kept naive
+        return orjson.dumps(records, option=orjson.OPT_UTC_Z)
+    return _records_adapter.dump_json(records)
+
+
+def encode_task(row: tuple) -> bytes:
+    """JSON for one ``TASK_COLUMNS`` tuple, as ``response_model=Task`` gives"""
+    if orjson is not None:
+        return orjson.dumps(_record(row), option=orjson.OPT_UTC_Z)
+    return _record_adapter.dump_json(_record(row))
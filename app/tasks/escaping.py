@@ -0,0 +1,99 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Header
+from sqlalchemy import case, func
+
+from app.config import settings
+from .models import Task
+
+# What html.escape(quote=True) substitutes; reversed with "&amp;" last
+ENTITIES = (
+    ("&", "&amp;"),
+    ("<", "&lt;"),
+    (">", "&gt;"),
+    ('"', "&quot;"),
+    ("'", "&#x27;"),
+)
+
+# Whether task text is HTML-escaped in responses; None means the setting
+escape_output: ContextVar[Optional[bool]] = ContextVar("escape_output", default=None)
+
+
+def escape_html(text: str) -> str:
+    """``html.escape(text)``, skipping the five replace passes for the common
+    case of text without any special character"""
+    if (
+        "&" not in text
+        and "<" not in text
+        and ">" not in text
+        and '"' not in text
+        and "'" not in text
+    ):
+        return text
+    for char, entity in ENTITIES:
+        text = text.replace(char, entity)
+    return text
+
+
+def unescape_html(text: str) -> str:
+    """Exact inverse of ``escape_html``; other entities are left alone"""
+    if "&" not in text:
+        return text
+    for char, entity in reversed(ENTITIES):
+        text = text.replace(entity, char)
+    return text
+
+
+def unescape_sql(column):
+    """``unescape_html`` as a SQL expression, for rewriting rows in place"""
+    for char, entity in reversed(ENTITIES):
+        column = func.replace(column, entity, char)
+    return column
+
+
+def raw_text_values() -> dict:
+    """UPDATE values turning rows stored escaped into raw text.
+
+    Rows that are already raw keep their text.
+    """
+    return {
+        "title": case((Task.text_escaped, unescape_sql(Task.title)), else_=Task.title),
+        "description": case(
+            (Task.text_escaped, unescape_sql(Task.description)),
+            else_=Task.description,
+        ),
+        "text_escaped": False,
+    }
+
+
+def escaping_output() -> bool:
+    value = escape_output.get()
+    return settings.ESCAPE_HTML_OUTPUT if value is None else value
+
+
+def output_text(text: Optional[str], stored_escaped: bool = False) -> Optional[str]:
+    """Task text as it goes out in this response.
+
+    ``stored_escaped`` marks rows written before text was stored raw, which
+    are already escaped until the backfill rewrites them.
+    """
+    if text is None:
+        return text
+    if stored_escaped:
+        return text if escaping_output() else unescape_html(text)
+    return escape_html(text) if escaping_output() else text
+
+
+async def output_escaping(
+    x_escape_html: Optional[bool] = Header(
+        None,
+        description="Whether task text is HTML-escaped in the response. "
+        "Defaults to the ESCAPE_HTML_OUTPUT setting",
+    ),
+):
+    token = escape_output.set(x_escape_html)
+    try:
+        yield
+    finally:
+        escape_output.reset(token)
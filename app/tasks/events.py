@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+import os
+from collections import deque
+from typing import Iterable, Optional
+
+from app.config import settings
+from app.metrics import Counter, Gauge
+from .encoding import encode_task, task_values
+
+task_events_published = Counter(
+    "task_events_published_total",
+    "Task change events published to the in-process broker",
+    labels=("kind",),
+)
+task_events_resyncs = Counter(
+    "task_events_resyncs_total",
+    "Subscribers told to resync after a buffer overflow or an unknown Last-Event-ID",
+)
+
+# (seq, owner_id, kind, task_id, TASK_COLUMNS values or None for a delete)
+TaskEvent = tuple
+
+
+class Subscription:
+    """One event stream's buffer of undelivered events.
+
+    An idle subscription is a small deque and nothing else; a future is only
+    created while its stream waits. Once more than ``limit`` events are
+    undelivered they are all dropped and the stream is told to resync.
+    """
+
+    __slots__ = ("owner_id", "events", "resync", "waiter")
+
+    def __init__(self, owner_id: str):
+        self.owner_id = owner_id
+        self.events: deque = deque()
+        self.resync = False
+        self.waiter: Optional[asyncio.Future] = None
+
+    def push(self, event: TaskEvent, limit: int):
+        if self.resync:
+            return
+        if len(self.events) >= limit:
+            self.events.clear()
+            self.resync = True
+        else:
+            self.events.append(event)
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    async def wait(self, timeout: float):
+        """Until there is something to deliver, or ``timeout`` seconds"""
+        if self.events or self.resync:
+            return
+        self.waiter = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.waiter, timeout)
+        except TimeoutError:
+            pass
+        finally:
+            self.waiter = None
+
+
+class TaskEventBroker:
+    """In-process pub/sub of task changes, per owner.
+
+    Events are numbered by one sequence per process and the last
+    ``log_size`` of them are kept in a ring buffer, so a stream resuming with
+    ``Last-Event-ID`` gets what it missed. Ids carry a per-process epoch: an
+    id from another worker or before a restart, or one already evicted from
+    the log, cannot be resumed and the stream is told to resync instead.
+
+    Repository writes publish after their commit, on the event loop thread
+    like every other repository call in the app, so no locking is needed.
+    """
+
+    def __init__(self, log_size: int, buffer_size: int):
+        self.epoch = os.urandom(4).hex()
+        self.seq = 0
+        self.log: deque[TaskEvent] = deque(maxlen=log_size)
+        self.buffer_size = buffer_size
+        self.subscribers: dict[str, set[Subscription]] = {}
+        self.subscribers_gauge = Gauge(
+            "task_events_subscribers",
+            "Open task event streams",
+            callback=lambda: sum(map(len, self.subscribers.values())),
+        )
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def publish(self, kind: str, owner_id: str, task_id: str, values=None):
+        self.seq += 1
+        event = (self.seq, owner_id, kind, task_id, values)
+        self.log.append(event)
+        task_events_published.inc(kind=kind)
+        for subscription in self.subscribers.get(owner_id, ()):
+            subscription.push(event, self.buffer_size)
+
+    def publish_tasks(self, kind: str, tasks: Iterable):
+        for task in tasks:
+            self.publish(kind, task.owner_id, task.id, task_values(task))
+
+    def publish_deleted(self, owner_id: str, task_ids: Iterable[str]):
+        for task_id in task_ids:
+            self.publish("deleted", owner_id, task_id)
+
+    def subscribe(self, owner_id: str) -> Subscription:
+        subscription = Subscription(owner_id)
+        self.subscribers.setdefault(owner_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self.subscribers.get(subscription.owner_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscribers[subscription.owner_id]
+
+    def replay(self, owner_id: str, last_event_id: str) -> Optional[list]:
+        """The owner's events after ``last_event_id``, None if unknown"""
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self.seq:
+            return None
+        seq = int(seq)
+        oldest = self.log[0][0] if self.log else self.seq + 1
+        if seq < oldest - 1:
+            return None
+        missed = itertools.islice(self.log, seq - oldest + 1, None)
+        return [event for event in missed if event[1] == owner_id]
+
+    def clear(self):
+        self.log.clear()
+        self.subscribers.clear()
+
+
+def encode_event(broker: TaskEventBroker, event: TaskEvent) -> bytes:
+    """One SSE frame: the task as GET /tasks/{id} returns it, or its id"""
+    seq, _, kind, task_id, values = event
+    if values is not None:
+        data = encode_task(values)
+    else:
+        data = b'{"id":"%s"}' % task_id.encode()
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (
+        broker.event_id(seq).encode(),
+        kind.encode(),
+        data,
+    )
+
+
+def encode_resync(broker: TaskEventBroker) -> bytes:
+    return b"id: %s\nevent: resync\ndata: {}\n\n" % broker.event_id(broker.seq).encode()
+
+
+def encode_position(broker: TaskEventBroker) -> bytes:
+    """A keepalive that also moves the client's Last-Event-ID to the present.
+
+    Only sent once the stream has delivered everything, so a quiet stream's
+    resume point is never evicted from the log by other users' events.
+    """
+    return b": keepalive\nid: %s\n\n" % broker.event_id(broker.seq).encode()
+
+
+task_events = TaskEventBroker(
+    settings.TASK_EVENTS_LOG_SIZE, settings.TASK_EVENTS_BUFFER_SIZE
+)
@@ -0,0 +1,34 @@
+import csv
+import io
+from typing import Iterable
+
+from .encoding import TASK_FIELDS
+from .schemas import ExportFormat, Task
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+CSV_FIELDS = list(TASK_FIELDS)
+
+
+def encode_ndjson(rows: Iterable) -> bytes:
+    return b"".join(
+        Task.model_validate(row).model_dump_json().encode() + b"\n" for row in rows
+    )
+
+
+def encode_csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_FIELDS)
+    return buffer.getvalue()
+
+
+def encode_csv(rows: Iterable) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        values = Task.model_validate(row).model_dump(mode="json")
+        writer.writerow([values[field] for field in CSV_FIELDS])
+    return buffer.getvalue()
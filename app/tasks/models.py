@@ -1,21 +1,206 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from datetime import date, datetime, UTC
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    String,
+    Text,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    event,
+    false,
+    text,
+)
 from sqlalchemy.sql import func
 from app.database import Base
-import uuid
+from app.ids import BinaryUUID, generate_uuid
 
 
-def generate_uuid():
-    return str(uuid.uuid4())
+def utcnow():
+    return datetime.now(UTC)
+
+
+def utc_day(moment: datetime) -> date:
+    """The UTC day of a timestamp; naive ones, as SQLite returns them, are UTC"""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.date()
+
+
+live = text("deleted_at IS NULL")
+deleted = text("deleted_at IS NOT NULL")
 
 
 class Task(Base):
     __tablename__ = "tasks"
 
-    id = Column(String(36), primary_key=True, default=generate_uuid)
+    id = Column(BinaryUUID, primary_key=True, default=generate_uuid)
     title = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
-    owner_id = Column(String, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    owner_id = Column(BinaryUUID, ForeignKey("users.id"), nullable=False)
+    # Set client side too so every row carries microseconds in the same
+    # format as bound parameters, which keyset comparisons rely on
+    created_at = Column(
+        DateTime(timezone=True), default=utcnow, server_default=func.now()
+    )
+    # Bumped on every write; together they back ETag/Last-Modified
+    updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Set on rows written while text was stored HTML-escaped, until
+    # app.tasks.backfill rewrites them as raw text
+    text_escaped = Column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
+    # Position in the owner's change sequence (TaskOwner.seq), taken by every
+    # write made through TaskRepository; 0 for rows older than the sequence
+    seq = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set instead of deleting the row when TASK_SOFT_DELETE is on, until
+    # app.tasks.purge removes it
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The owner indexes only hold live rows: reads filter on
+        # deleted_at IS NULL and stay index seeks, and deleted rows add
+        # nothing to their size
+        Index(
+            "ix_tasks_owner_id_created_at_id",
+            "owner_id",
+            "created_at",
+            "id",
+            sqlite_where=live,
+            postgresql_where=live,
+        ),
+        Index(
+            "ix_tasks_owner_id_title_id",
+            "owner_id",
+            "title",
+            "id",
+            sqlite_where=live,
+            postgresql_where=live,
+        ),
+        # Title prefixes on PostgreSQL, whose collations do not order by code
+        # point: LIKE 'prefix%' is a range seek on this byte-ordered copy
+        Index(
+            "ix_tasks_owner_id_title_pattern",
+            "owner_id",
+            "title",
+            postgresql_ops={"title": "text_pattern_ops"},
+            postgresql_where=live,
+        ).ddl_if(dialect="postgresql"),
+        # Covers the per-owner count/max(updated_at) behind the list ETag
+        Index(
+            "ix_tasks_owner_id_updated_at",
+            "owner_id",
+            "updated_at",
+            sqlite_where=live,
+            postgresql_where=live,
+        ),
+        # Changes since a sync token, in (seq, id) order, deletions included
+        Index("ix_tasks_owner_id_seq_id", "owner_id", "seq", "id"),
+        # Soft-deleted rows by age, for the purge
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            sqlite_where=deleted,
+            postgresql_where=deleted,
+        ),
+    )
 
     def __repr__(self):
         return f"<Task(id={self.id}, title={self.title})>"
+
+
+class TaskOwner(Base):
+    """Per-owner bookkeeping for tasks.
+
+    ``seq`` is the last change sequence number handed out for the owner.
+    Taking numbers updates this row, which holds its lock until commit, so
+    an owner's writes commit in sequence order. ``purged_seq`` is the
+    highest number of a deletion app.tasks.purge has since forgotten; sync
+    tokens from before it can no longer be answered. ``task_count`` is the
+    number of live tasks, kept in the same statement.
+    """
+
+    __tablename__ = "task_owners"
+
+    owner_id = Column(BinaryUUID, ForeignKey("users.id"), primary_key=True)
+    seq = Column(Integer, nullable=False, default=0, server_default="0")
+    purged_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# On SQLite a PATCH numbers the task inside its UPDATE, as TaskOwner.seq + 1
+# (see TaskRepository.patch_user_task), and this trigger moves TaskOwner.seq
+# up to match within the same statement. SQLite runs one writer at a time,
+# so no other claim can come in between. Created along with the tasks table
+# on SQLite, and by migration f4a7d2c9b8e1.
+SEQ_CLAIM_DDL = (
+    "CREATE TRIGGER IF NOT EXISTS tasks_claim_seq AFTER UPDATE OF seq ON tasks "
+    "WHEN new.seq > old.seq BEGIN "
+    "INSERT INTO task_owners (owner_id, seq) VALUES (new.owner_id, new.seq) "
+    "ON CONFLICT (owner_id) DO UPDATE SET seq = excluded.seq "
+    "WHERE excluded.seq > task_owners.seq; END"
+)
+
+event.listen(
+    Task.__table__, "after_create", DDL(SEQ_CLAIM_DDL).execute_if(dialect="sqlite")
+)
+
+
+# External-content FTS5 index over tasks for app.tasks.search, kept in sync
+# by triggers. Created along with the tasks table on SQLite, and by migration
+# 2b7e9d1c4a85. It is keyed by the tasks rowid, which VACUUM may renumber:
+# follow a VACUUM with INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild').
+FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='rowid', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update "
+    "AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+]
+
+for ddl in FTS_DDL:
+    event.listen(Task.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
+
+
+class TaskDailyCount(Base):
+    """Live tasks per owner and UTC day of creation, behind /tasks/stats"""
+
+    __tablename__ = "task_daily_counts"
+
+    owner_id = Column(BinaryUUID, primary_key=True)
+    day = Column(Date, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+
+
+class TaskTombstone(Base):
+    """A hard-deleted task, kept so incremental syncs can report the deletion.
+
+    Soft-deleted rows serve as their own tombstones.
+    """
+
+    __tablename__ = "task_tombstones"
+
+    owner_id = Column(BinaryUUID, primary_key=True)
+    seq = Column(Integer, primary_key=True)
+    task_id = Column(BinaryUUID, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=utcnow)
+
+    __table_args__ = (Index("ix_task_tombstones_deleted_at", "deleted_at"),)
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from app.exceptions import InvalidCursorError
+from .models import Task
+from .schemas import TaskSort
+
+
+def _encode(values: list) -> str:
+    payload = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(task: Task, sort: TaskSort = TaskSort.created_at) -> str:
+    """Opaque cursor pointing just past ``task`` in (sort key, id) order."""
+    key = getattr(task, sort.field)
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    return _encode([sort.value, key, task.id])
+
+
+def decode_cursor(cursor: str, sort: TaskSort = TaskSort.created_at) -> tuple:
+    """``(sort key, id)`` of a cursor issued for the same ``sort``"""
+    try:
+        cursor_sort, key, task_id = _decode(cursor)
+        if cursor_sort != sort.value:
+            raise ValueError("cursor belongs to another sort order")
+        if not isinstance(key, str):
+            raise TypeError("cursor key must be a string")
+        if sort.field == "created_at":
+            key = datetime.fromisoformat(key)
+        return key, str(task_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError() from e
+
+
+def encode_search_cursor(rank: float, task_id: str) -> str:
+    """Opaque cursor pointing just past a search hit in (rank, id) order."""
+    return _encode([rank, task_id])
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        rank, task_id = _decode(cursor)
+        return float(rank), str(task_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError() from e
+
+
+def encode_sync_token(seq: int, task_id: str) -> str:
+    """Opaque token for the user's change sequence up to (seq, id)"""
+    return _encode(["sync", seq, str(task_id)])
+
+
+def decode_sync_token(token: str) -> tuple[int, str]:
+    try:
+        kind, seq, task_id = _decode(token)
+        if kind != "sync" or not isinstance(seq, int) or seq < 0:
+            raise ValueError("not a sync token")
+        return seq, str(task_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError() from e
@@ -0,0 +1,157 @@
+"""Hard-delete soft-deleted tasks and tombstones past their retention.
+
+Deleted tasks (rows with ``deleted_at``, under TASK_SOFT_DELETE) and the
+tombstones left by hard deletes are kept so incremental syncs can report
+them. This job removes the ones older than the retention, oldest first, one
+short transaction per chunk, and sleeps between chunks to stay under a rate,
+so the writers it shares locks with are never held up for long. Each chunk
+raises its owners' ``purged_seq``: sync tokens older than that could have
+missed a purged deletion and get 410 instead.
+
+    python -m app.tasks.purge --retention-hours 168 --rows-per-second 5000
+"""
+
+import argparse
+import time
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import bindparam, delete, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from .models import Task, TaskOwner, TaskTombstone, utcnow
+from .repository import TaskRepository
+
+
+class PurgeReport:
+    """Rows purged, and the seconds spent in total and waiting for locks"""
+
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+        self.elapsed = 0.0
+        self.lock_wait = 0.0
+        self.max_lock_wait = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (
+            f"purged {self.rows} rows in {self.chunks} chunks, {self.elapsed:.1f}s "
+            f"({self.rows_per_second:.0f} rows/s); waited "
+            f"{self.lock_wait * 1000:.1f} ms for locks, "
+            f"{self.max_lock_wait * 1000:.1f} ms at most"
+        )
+
+
+def expired_tasks(db: Session, cutoff, batch_size: int):
+    """Soft-deleted tasks past ``cutoff`` from ix_tasks_deleted_at, and a
+    statement deleting them"""
+    rows = db.execute(
+        select(Task.id, Task.owner_id, Task.seq)
+        .where(Task.deleted_at < cutoff)
+        .order_by(Task.deleted_at)
+        .limit(batch_size)
+    ).all()
+    statement = delete(Task).where(
+        Task.id.in_([row.id for row in rows]), Task.deleted_at.is_not(None)
+    )
+    return rows, statement
+
+
+def expired_tombstones(db: Session, cutoff, batch_size: int):
+    rows = db.execute(
+        select(TaskTombstone.owner_id, TaskTombstone.seq)
+        .where(TaskTombstone.deleted_at < cutoff)
+        .order_by(TaskTombstone.deleted_at)
+        .limit(batch_size)
+    ).all()
+    statement = delete(TaskTombstone).where(
+        tuple_(TaskTombstone.owner_id, TaskTombstone.seq).in_(
+            [(row.owner_id, row.seq) for row in rows]
+        )
+    )
+    return rows, statement
+
+
+def purge_deleted(
+    db: Session,
+    retention: timedelta,
+    batch_size: int = 500,
+    rows_per_second: Optional[float] = None,
+) -> PurgeReport:
+    """Remove deletions older than ``retention``, ``batch_size`` at a time"""
+    cutoff = utcnow() - retention
+    report = PurgeReport()
+    started = time.perf_counter()
+    raise_purged_seq = (
+        update(TaskOwner.__table__)
+        .where(
+            TaskOwner.owner_id == bindparam("owner"),
+            TaskOwner.purged_seq < bindparam("purged"),
+        )
+        .values(purged_seq=bindparam("purged"))
+    )
+    for expired in (expired_tasks, expired_tombstones):
+        while True:
+            rows, statement = expired(db, cutoff, batch_size)
+            if not rows:
+                db.rollback()
+                break
+            purged = {}
+            for row in rows:
+                purged[row.owner_id] = max(purged.get(row.owner_id, 0), row.seq)
+
+            waited = TaskRepository(db).lock_owners(sorted(purged))
+            report.lock_wait += waited
+            report.max_lock_wait = max(report.max_lock_wait, waited)
+            result = db.execute(statement)
+            db.execute(
+                raise_purged_seq,
+                [{"owner": owner, "purged": seq} for owner, seq in purged.items()],
+            )
+            db.commit()
+            report.rows += result.rowcount
+            report.chunks += 1
+
+            report.elapsed = time.perf_counter() - started
+            if rows_per_second:
+                time.sleep(max(0.0, report.rows / rows_per_second - report.elapsed))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--retention-hours", type=float, default=settings.TASK_PURGE_RETENTION_HOURS
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.TASK_PURGE_BATCH_SIZE
+    )
+    parser.add_argument(
+        "--rows-per-second",
+        type=float,
+        default=settings.TASK_PURGE_ROWS_PER_SECOND,
+        help="0 for no limit",
+    )
+    args = parser.parse_args()
+
+    from app.auth.models import User  # noqa: F401
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        report = purge_deleted(
+            db,
+            timedelta(hours=args.retention_hours),
+            args.batch_size,
+            args.rows_per_second,
+        )
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
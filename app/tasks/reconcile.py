@@ -0,0 +1,125 @@
+"""Repair drift in the task counts behind /tasks/stats and X-Total-Count.
+
+TaskRepository keeps ``task_owners.task_count`` and ``task_daily_counts`` in
+step with every create and delete it makes, in the same transaction. Writes
+that go around it, such as bulk imports or manual fixes, make them drift.
+This job recounts the live tasks of ``batch_size`` owners at a time and
+corrects the counts that differ, holding the owners' locks so no write slips
+in between the count and the fix. One short transaction per batch, so it can
+run while the API serves traffic.
+
+    python -m app.tasks.reconcile --batch-size 100 --pause 0.05
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.auth.models import User
+from app.ids import NIL
+from .models import Task, TaskDailyCount, TaskOwner, utc_day
+from .repository import TaskRepository
+
+
+class ReconcileReport:
+    """Owners checked and repaired, count rows corrected, seconds waited for
+    locks"""
+
+    def __init__(self):
+        self.owners = 0
+        self.repaired = 0
+        self.rows = 0
+        self.lock_wait = 0.0
+
+    def __str__(self):
+        return (
+            f"checked {self.owners} owners, repaired {self.repaired} "
+            f"({self.rows} counts corrected); waited "
+            f"{self.lock_wait * 1000:.1f} ms for locks"
+        )
+
+
+def reconcile_batch(db: Session, owner_ids: list[str]) -> tuple[int, int]:
+    """Correct the owners' counts; ``(owners repaired, counts corrected)``.
+
+    Runs in the transaction the caller started with ``lock_owners``.
+    """
+    tasks, days = Counter(), Counter()
+    live = select(Task.owner_id, Task.created_at).where(
+        Task.owner_id.in_(owner_ids), Task.deleted_at.is_(None)
+    )
+    for owner_id, created_at in db.execute(live):
+        tasks[owner_id] += 1
+        days[owner_id, utc_day(created_at)] += 1
+
+    stored = select(TaskOwner.owner_id, TaskOwner.task_count).where(
+        TaskOwner.owner_id.in_(owner_ids)
+    )
+    for owner_id, count in db.execute(stored):
+        tasks[owner_id] -= count
+    stored = select(
+        TaskDailyCount.owner_id, TaskDailyCount.day, TaskDailyCount.task_count
+    ).where(TaskDailyCount.owner_id.in_(owner_ids))
+    for owner_id, day, count in db.execute(stored):
+        days[owner_id, day] -= count
+
+    # What is left is the drift
+    tasks = Counter({owner: n for owner, n in tasks.items() if n})
+    days = Counter({key: n for key, n in days.items() if n})
+    if not tasks and not days:
+        return 0, 0
+    TaskRepository(db).adjust_counts(tasks, days)
+    db.execute(
+        delete(TaskDailyCount).where(
+            TaskDailyCount.owner_id.in_(owner_ids), TaskDailyCount.task_count == 0
+        )
+    )
+    repaired = set(tasks) | {owner_id for owner_id, _ in days}
+    return len(repaired), len(tasks) + len(days)
+
+
+def reconcile_counts(
+    db: Session, batch_size: int = 100, pause: float = 0
+) -> ReconcileReport:
+    """Recount every owner's tasks, ``batch_size`` owners at a time"""
+    report = ReconcileReport()
+    repo = TaskRepository(db)
+    last_id = NIL
+    while True:
+        owner_ids = db.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(batch_size)
+        ).all()
+        if not owner_ids:
+            db.rollback()
+            return report
+        report.lock_wait += repo.lock_owners(owner_ids)
+        repaired, rows = reconcile_batch(db, owner_ids)
+        db.commit()
+        report.owners += len(owner_ids)
+        report.repaired += repaired
+        report.rows += rows
+        last_id = owner_ids[-1]
+        if pause:
+            time.sleep(pause)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument(
+        "--pause", type=float, default=0, help="seconds to sleep between batches"
+    )
+    args = parser.parse_args()
+
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        report = reconcile_counts(db, args.batch_size, args.pause)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,800 @@
+import heapq
+import re
+import time
+from collections import Counter
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from .models import Task
-from .schemas import TaskCreate
+from app.config import settings
+from app.database import DBSession
+from .escaping import raw_text_values
+from .events import task_events
+from app.ids import NIL
+from .models import (
+    Task,
+    TaskDailyCount,
+    TaskOwner,
+    TaskTombstone,
+    utc_day,
+    utcnow,
+)
+from .search import search_backend
+from .schemas import BulkItemStatus, TaskBulkUpdateItem, TaskCreate, TaskFilter
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """The least string after every string starting with ``prefix``, in code
+    point order, or None if there is none"""
+    chars = list(prefix)
+    while chars:
+        last = ord(chars.pop())
+        if last < 0x10FFFF:
+            # Skip the surrogates, which UTF-8 cannot encode
+            following = 0xE000 if 0xD800 <= last + 1 <= 0xDFFF else last + 1
+            return "".join(chars) + chr(following)
+    return None
 
 
 class TaskRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def get_user_tasks(self, user_id: str, skip: int = 0, limit: int = 100):
+    @property
+    def search_index(self):
+        return search_backend(self.db)
+
+    def list_statement(
+        self,
+        user_id: str,
+        filters: Optional[TaskFilter] = None,
+        after: Optional[tuple] = None,
+    ):
+        """The user's tasks, filtered and ordered by ``filters``.
+
+        ``after`` continues a keyset page past a ``(sort key, id)`` pair.
+        Every combination is a range seek on ix_tasks_owner_id_created_at_id
+        or ix_tasks_owner_id_title_id (ix_tasks_owner_id_title_pattern for
+        title prefixes on PostgreSQL).
+        """
+        filters = filters or TaskFilter()
+        statement = select(Task).where(
+            Task.owner_id == user_id, Task.deleted_at.is_(None)
+        )
+        if filters.created_after is not None:
+            statement = statement.where(Task.created_at > filters.created_after)
+        if filters.created_before is not None:
+            statement = statement.where(Task.created_at < filters.created_before)
+        prefix = filters.title_prefix
+        if prefix is not None and self.db.get_bind().dialect.name == "postgresql":
+            # Collations there do not order by code point, so no range of
+            # them holds exactly the titles starting with the prefix
+            # The whole pattern in one parameter, so the planner sees its
+            # prefix and seeks ix_tasks_owner_id_title_pattern
+            pattern = re.sub(r"([/%_])", r"/\1", prefix) + "%"
+            statement = statement.where(Task.title.like(pattern, escape="/"))
+        elif prefix is not None:
+            # A range rather than LIKE, which SQLite cannot serve from an
+            # index; its BINARY collation orders by code point
+            statement = statement.where(Task.title >= prefix)
+            upper_bound = prefix_upper_bound(prefix)
+            if upper_bound is not None:
+                statement = statement.where(Task.title < upper_bound)
+
+        key = getattr(Task, filters.sort.field)
+        if after is not None:
+            position = tuple_(key, Task.id)
+            statement = statement.where(
+                position < after if filters.sort.descending else position > after
+            )
+        if filters.sort.descending:
+            return statement.order_by(key.desc(), Task.id.desc())
+        return statement.order_by(key, Task.id)
+
+    def _fetch(self, statement, columns: Optional[tuple]):
+        if columns is None:
+            return self.db.scalars(statement).all()
+        # Plain tuples: no entity construction or identity map bookkeeping
+        return self.db.execute(statement.with_only_columns(*columns)).all()
+
+    def get_user_tasks(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        columns: Optional[tuple] = None,
+    ):
+        """A page of the user's tasks, as ``columns`` rows if given"""
+        statement = self.list_statement(user_id, filters).offset(skip).limit(limit)
+        return self._fetch(statement, columns)
+
+    def get_user_tasks_after(
+        self,
+        user_id: str,
+        after: Optional[tuple] = None,
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        columns: Optional[tuple] = None,
+    ):
+        """Keyset page starting after ``after``.
+
+        Every page costs an index seek plus ``limit`` rows no matter how deep
+        it is.
+        """
+        statement = self.list_statement(user_id, filters, after).limit(limit)
+        return self._fetch(statement, columns)
+
+    def get_user_tasks_stamp(self, user_id: str):
+        """``(count, max(updated_at))`` over the user's tasks.
+
+        Any create, update or delete changes one of the two, so they identify
+        the state of the list without reading it. Answered from
+        ix_tasks_owner_id_updated_at alone.
+        """
+        statement = select(func.count(), func.max(Task.updated_at)).where(
+            Task.owner_id == user_id, Task.deleted_at.is_(None)
+        )
+        return tuple(self.db.execute(statement).one())
+
+    def get_user_task_count(self, user_id: str) -> int:
+        """Live tasks of the user, from the count kept on its TaskOwner row"""
+        statement = select(TaskOwner.task_count).where(TaskOwner.owner_id == user_id)
+        return self.db.scalar(statement) or 0
+
+    def get_user_task_days(self, user_id: str, since: date) -> dict:
+        """``{day: live tasks created that day}`` from ``since`` on, from the
+        kept per-day counts; days without tasks are left out"""
+        statement = select(TaskDailyCount.day, TaskDailyCount.task_count).where(
+            TaskDailyCount.owner_id == user_id, TaskDailyCount.day >= since
+        )
+        return dict(self.db.execute(statement).all())
+
+    @staticmethod
+    def export_statement(user_id: str, batch_size: int):
+        # Plain columns rather than entities keep rows out of the identity map
         return (
-            self.db.query(Task)
-            .filter(Task.owner_id == user_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
+            select(*Task.__table__.columns)
+            .where(Task.owner_id == user_id, Task.deleted_at.is_(None))
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=batch_size)
         )
 
+    def iter_user_tasks(self, user_id: str, batch_size: int = 1000):
+        """Yield the user's tasks in batches from a server-side cursor"""
+        result = self.db.execute(self.export_statement(user_id, batch_size))
+        yield from result.partitions()
+
+    def search_user_tasks(
+        self,
+        user_id: str,
+        q: str,
+        after: Optional[tuple[float, str]] = None,
+        limit: int = 20,
+    ):
+        """``(task, rank)`` pairs matching ``q``, best first, after ``after``"""
+        return self.search_index.search(self.db, user_id, q, after, limit)
+
+    def get_user_task_changes(
+        self, user_id: str, after: Optional[tuple[int, str]], limit: int
+    ):
+        """The user's changes after ``after``, in (seq, id) order.
+
+        Returns up to ``limit + 1`` ``(seq, id, task)`` entries, ``task``
+        being None for a deleted one, or None when deletions after ``after``
+        have been purged. Without ``after`` this is every live task and no
+        deletions. Both reads are range seeks on (owner_id, seq), so the cost
+        follows the number of changes rather than of tasks.
+        """
+        position = after or (0, NIL)
+        statement = (
+            select(Task)
+            .where(Task.owner_id == user_id, tuple_(Task.seq, Task.id) > position)
+            .order_by(Task.seq, Task.id)
+            .limit(limit + 1)
+        )
+        if after is None:
+            statement = statement.where(Task.deleted_at.is_(None))
+        tasks = self.db.scalars(statement).all()
+        deleted = []
+        if after is not None:
+            # Tombstone seqs are unique per owner, so seq alone orders them
+            deleted = self.db.execute(
+                select(TaskTombstone.seq, TaskTombstone.task_id)
+                .where(
+                    TaskTombstone.owner_id == user_id, TaskTombstone.seq > position[0]
+                )
+                .order_by(TaskTombstone.seq)
+                .limit(limit + 1)
+            ).all()
+            # Checked after both reads: a purge that committed before them is
+            # seen here, and one committing later hid nothing from them
+            purged_seq = self.db.scalar(
+                select(TaskOwner.purged_seq).where(TaskOwner.owner_id == user_id)
+            )
+            if after[0] < (purged_seq or 0):
+                return None
+        changes = heapq.merge(
+            (
+                (task.seq, task.id, task if task.deleted_at is None else None)
+                for task in tasks
+            ),
+            ((seq, task_id, None) for seq, task_id in deleted),
+            key=lambda change: change[:2],
+        )
+        return list(changes)[: limit + 1]
+
     def get_task(self, task_id: str):
-        return self.db.query(Task).filter(Task.id == task_id).first()
+        return (
+            self.db.query(Task)
+            .filter(Task.id == task_id, Task.deleted_at.is_(None))
+            .first()
+        )
+
+    def lock_owners(self, owner_ids: list[str]) -> float:
+        """Start a transaction that no owner's write can interleave with.
+
+        For jobs working on many owners at once. Returns the seconds spent
+        waiting for the locks.
+        """
+        started = time.perf_counter()
+        if self.db.get_bind().dialect.name == "sqlite":
+            # One writer at a time: wait for the write lock up front rather
+            # than somewhere inside the job's statements
+            self.db.connection().exec_driver_sql("BEGIN IMMEDIATE")
+        else:
+            # Writers hold their owner's row until they commit; in key order
+            # so two jobs cannot deadlock
+            self.db.execute(
+                select(TaskOwner.owner_id)
+                .where(TaskOwner.owner_id.in_(owner_ids))
+                .order_by(TaskOwner.owner_id)
+                .with_for_update()
+            )
+        return time.perf_counter() - started
+
+    def _upsert(self, model):
+        if self.db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+    def _claim_seq(self, owner_id: str, count: int = 1, tasks: int = 0) -> int:
+        """Take ``count`` change sequence numbers for the owner, returning the first.
+
+        The upsert locks the owner's TaskOwner row until the transaction
+        ends, so the owner's writes commit in the order of their numbers and
+        a sync never skips past one that has yet to commit. ``tasks`` is
+        added to the owner's live task count in the same statement.
+        """
+        statement = (
+            self._upsert(TaskOwner)
+            .values(owner_id=owner_id, seq=count, task_count=tasks)
+            .on_conflict_do_update(
+                index_elements=[TaskOwner.owner_id],
+                set_={
+                    "seq": TaskOwner.seq + count,
+                    "task_count": TaskOwner.task_count + tasks,
+                },
+            )
+            .returning(TaskOwner.seq)
+        )
+        return self.db.execute(statement).scalar_one() - count + 1
+
+    def _claim_seq_for(self, owner_id: str, matches: list):
+        """The next sequence number of the owner, as an expression for the
+        UPDATE of the task matching ``matches``.
+
+        The number is only taken when the task matches, in the UPDATE
+        itself, so a PATCH that ends in 404 or 412 writes nothing. On
+        PostgreSQL the ``_claim_seq`` upsert becomes a data-modifying CTE
+        over the matching task; on SQLite the task reads TaskOwner.seq + 1
+        and the tasks_claim_seq trigger advances it.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            claim = (
+                self._upsert(TaskOwner)
+                .from_select(
+                    [TaskOwner.owner_id, TaskOwner.seq],
+                    select(Task.owner_id, literal(1)).where(*matches),
+                )
+                .on_conflict_do_update(
+                    index_elements=[TaskOwner.owner_id],
+                    set_={"seq": TaskOwner.seq + 1},
+                )
+                .returning(TaskOwner.seq)
+                .cte("claim")
+            )
+            return select(claim.c.seq).scalar_subquery()
+        last = select(TaskOwner.seq).where(TaskOwner.owner_id == owner_id)
+        return func.coalesce(last.scalar_subquery(), 0) + 1
+
+    def _count_days(self, owner_days: Counter, sign: int = 1):
+        """Add ``{(owner_id, day): n}``, times ``sign``, to the per-day counts"""
+        upsert = self._upsert(TaskDailyCount)
+        statement = upsert.on_conflict_do_update(
+            index_elements=[TaskDailyCount.owner_id, TaskDailyCount.day],
+            set_={"task_count": TaskDailyCount.task_count + upsert.excluded.task_count},
+        )
+        params = [
+            {"owner_id": owner_id, "day": day, "task_count": sign * n}
+            for (owner_id, day), n in owner_days.items()
+            if n
+        ]
+        if params:
+            self.db.execute(statement, params)
+
+    def adjust_counts(self, owner_tasks: Counter, owner_days: Counter):
+        """Add ``{owner_id: n}`` to the owners' task counts and
+        ``{(owner_id, day): n}`` to their per-day counts"""
+        for owner_id, n in owner_tasks.items():
+            if n:
+                self._claim_seq(owner_id, 0, n)
+        self._count_days(owner_days)
+
+    def _number_rows(self, rows: list[dict], count: bool = True) -> list[dict]:
+        """``rows`` with ``seq`` set, claiming one range per owner, and added
+        to the owners' task counts when ``count`` is set"""
+        counts = Counter(row["owner_id"] for row in rows)
+        next_seq = {
+            owner: self._claim_seq(owner, n, n if count else 0)
+            for owner, n in counts.items()
+        }
+        numbered = []
+        for row in rows:
+            numbered.append({**row, "seq": next_seq[row["owner_id"]]})
+            next_seq[row["owner_id"]] += 1
+        return numbered
+
+    def _bury(self, owner_id: str, task_ids: list[str]):
+        """Delete the owner's tasks, recording what incremental syncs need.
+
+        With TASK_SOFT_DELETE the rows stay, stamped with ``deleted_at`` and
+        one new seq, until app.tasks.purge removes them; sharing a seq is fine
+        as syncs page tasks by (seq, id). Otherwise they are deleted and a
+        numbered tombstone replaces each. Task counts drop in both cases.
+        """
+        matches = [
+            Task.id.in_(task_ids),
+            Task.owner_id == owner_id,
+            Task.deleted_at.is_(None),
+        ]
+        if settings.TASK_SOFT_DELETE:
+            seq = self._claim_seq(owner_id, 1, -len(task_ids))
+            deleted = self.db.execute(
+                update(Task)
+                .where(*matches)
+                .values(deleted_at=utcnow(), seq=seq)
+                .returning(Task.id, Task.created_at)
+                .execution_options(synchronize_session=False)
+            ).all()
+        else:
+            seq = self._claim_seq(owner_id, len(task_ids), -len(task_ids))
+            deleted = self.db.execute(
+                delete(Task)
+                .where(*matches)
+                .returning(Task.id, Task.created_at)
+                .execution_options(synchronize_session=False)
+            ).all()
+            if deleted:
+                self.db.execute(
+                    insert(TaskTombstone),
+                    [
+                        {"owner_id": owner_id, "task_id": task_id, "seq": seq + n}
+                        for n, (task_id, _) in enumerate(deleted)
+                    ],
+                )
+        if len(deleted) < len(task_ids):
+            # Some went in a concurrent delete, which counted them already
+            self._claim_seq(owner_id, 0, len(task_ids) - len(deleted))
+        self._count_days(
+            Counter((owner_id, utc_day(created_at)) for _, created_at in deleted), -1
+        )
 
     def create_user_task(self, user_id: str, task: TaskCreate):
-        db_task = Task(**task.model_dump(), owner_id=user_id)
+        db_task = Task(
+            **task.model_dump(), owner_id=user_id, seq=self._claim_seq(user_id, 1, 1)
+        )
         self.db.add(db_task)
+        self.db.flush()
+        self._count_days(Counter({(user_id, utc_day(db_task.created_at)): 1}))
         self.db.commit()
         self.db.refresh(db_task)
+        self.search_index.index([db_task])
+        task_events.publish_tasks("created", [db_task])
         return db_task
 
     def update_user_task(self, user_task: Task, task: TaskCreate):
         for key, value in task.model_dump().items():
             setattr(user_task, key, value)
+        user_task.text_escaped = False
+        user_task.version = Task.version + 1
+        user_task.seq = self._claim_seq(user_task.owner_id)
 
         self.db.commit()
         self.db.refresh(user_task)
+        self.search_index.index([user_task])
+        task_events.publish_tasks("updated", [user_task])
         return user_task
 
+    def patch_user_task(
+        self,
+        task_id: str,
+        user_id: str,
+        values: dict,
+        expected_version: Optional[int] = None,
+    ):
+        """Apply ``values`` with one UPDATE ... RETURNING, without a prior read.
+
+        The row must belong to ``user_id`` and, when ``expected_version`` is
+        given, still be at that version. Returns the updated row, or None when
+        nothing matched; see ``get_task_state`` to tell why.
+        """
+        matches = [
+            Task.id == task_id,
+            Task.owner_id == user_id,
+            Task.deleted_at.is_(None),
+        ]
+        if expected_version is not None:
+            matches.append(Task.version == expected_version)
+        if not values:
+            # Nothing to change, but the conditions still have to hold; the
+            # task is read rather than written, so nothing is published
+            statement = select(*Task.__table__.columns).where(*matches)
+            return self.db.execute(statement).first()
+        # Text left out of ``values`` is rewritten raw along with the rest
+        values = {
+            **raw_text_values(),
+            **values,
+            "version": Task.version + 1,
+            "updated_at": utcnow(),
+            "seq": self._claim_seq_for(user_id, matches),
+        }
+        statement = (
+            update(Task)
+            .where(*matches)
+            .values(**values)
+            .returning(*Task.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        row = self.db.execute(statement).first()
+        self.db.commit()
+        if row is not None:
+            self.search_index.index([row])
+            task_events.publish_tasks("updated", [row])
+        return row
+
+    def get_task_state(self, task_id: str):
+        """``(owner_id, version)`` of a task, or None if it does not exist"""
+        statement = select(Task.owner_id, Task.version).where(
+            Task.id == task_id, Task.deleted_at.is_(None)
+        )
+        return self.db.execute(statement).first()
+
     def delete_task(self, user_task: Task):
-        self.db.delete(user_task)
+        task_id, owner_id = user_task.id, user_task.owner_id
+        self._bury(owner_id, [task_id])
         self.db.commit()
+        self.search_index.remove([task_id])
+        task_events.publish_deleted(owner_id, [task_id])
         return True
+
+    def _insert_tasks(self, rows: list[dict]):
+        statement = insert(Task).returning(
+            *Task.__table__.columns, sort_by_parameter_order=True
+        )
+        return self.db.execute(statement, rows).all()
+
+    def _owners(self, task_ids: list[str]) -> dict[str, str]:
+        statement = select(Task.id, Task.owner_id).where(
+            Task.id.in_(task_ids), Task.deleted_at.is_(None)
+        )
+        return dict(self.db.execute(statement).all())
+
+    def _check_owner(self, user_id: str, task_ids: list[str]):
+        """Per-id ownership status, resolved with a single IN query"""
+        owners = self._owners(task_ids)
+        statuses = []
+        for task_id in task_ids:
+            if task_id not in owners:
+                statuses.append(BulkItemStatus.not_found)
+            elif owners[task_id] != user_id:
+                statuses.append(BulkItemStatus.forbidden)
+            else:
+                statuses.append(None)
+        return statuses
+
+    def get_user_tasks_by_ids(self, user_id: str, task_ids: list[str]):
+        """Fetch many tasks with a single SELECT ... WHERE id IN (...).
+
+        Returns one entry per id: the task row, or a not_found/forbidden
+        status. Ownership is checked on the fetched rows rather than in the
+        WHERE clause so that both markers come out of the same query.
+        """
+        statement = select(*Task.__table__.columns).where(
+            Task.id.in_(task_ids), Task.deleted_at.is_(None)
+        )
+        rows = {row.id: row for row in self.db.execute(statement)}
+        results = []
+        for task_id in task_ids:
+            row = rows.get(task_id)
+            if row is None:
+                results.append(BulkItemStatus.not_found)
+            elif row.owner_id != user_id:
+                results.append(BulkItemStatus.forbidden)
+            else:
+                results.append(row)
+        return results
+
+    def create_user_tasks(
+        self, user_id: str, tasks: list[TaskCreate], atomic: bool = True
+    ):
+        rows = [{**task.model_dump(), "owner_id": user_id} for task in tasks]
+        return self.create_tasks(rows, atomic)
+
+    def create_tasks(self, rows: list[dict], atomic: bool = True):
+        """Insert all rows with one multi-row INSERT ... RETURNING.
+
+        Returns one row per input, or None for rows that failed when
+        ``atomic`` is False (each is then retried under its own savepoint).
+        """
+        try:
+            created = self._insert_tasks(self._number_rows(rows))
+            self._count_days(
+                Counter((row.owner_id, utc_day(row.created_at)) for row in created)
+            )
+            self.db.commit()
+            self.search_index.index(created)
+            task_events.publish_tasks("created", created)
+            return created
+        except SQLAlchemyError:
+            self.db.rollback()
+            if atomic:
+                raise
+
+        # The rollback returned the claimed numbers, so claim them again and
+        # count the rows that made it in once they are known
+        created = []
+        for row in self._number_rows(rows, count=False):
+            try:
+                with self.db.begin_nested():
+                    created.append(self._insert_tasks([row])[0])
+            except SQLAlchemyError:
+                created.append(None)
+        created_rows = [row for row in created if row is not None]
+        for owner_id, n in Counter(row.owner_id for row in created_rows).items():
+            self._claim_seq(owner_id, 0, n)
+        self._count_days(
+            Counter((row.owner_id, utc_day(row.created_at)) for row in created_rows)
+        )
+        self.db.commit()
+        self.search_index.index(created_rows)
+        task_events.publish_tasks("created", created_rows)
+        return created
+
+    def update_user_tasks(
+        self, user_id: str, items: list[TaskBulkUpdateItem], atomic: bool = True
+    ):
+        """Apply partial updates with one executemany UPDATE by primary key.
+
+        Returns ``(statuses, tasks)`` where ``statuses`` holds None for items
+        that were applied. Nothing is written when ``atomic`` is set and any
+        item is missing or owned by someone else, including tasks deleted
+        after the ownership check.
+        """
+        statuses = self._check_owner(user_id, [item.id for item in items])
+        if atomic and any(statuses):
+            return statuses, {}
+
+        matches = [Task.owner_id == user_id, Task.deleted_at.is_(None)]
+        params = []
+        for item, item_status in zip(items, statuses):
+            values = item.model_dump(exclude_unset=True, exclude={"id"})
+            if item_status is None and values:
+                params.append({"id": item.id, **values})
+        if params:
+            # The owner's number first, as every other write takes it
+            seq = self._claim_seq(user_id, len(params))
+            # Bump versions and store text raw from here on, including fields
+            # not updated, for the rows still there; per-row values cannot
+            # carry an expression. This also locks them until commit
+            updated = set(
+                self.db.scalars(
+                    update(Task)
+                    .where(Task.id.in_([param["id"] for param in params]), *matches)
+                    .values(
+                        **raw_text_values(),
+                        version=Task.version + 1,
+                        updated_at=utcnow(),
+                    )
+                    .returning(Task.id)
+                    .execution_options(synchronize_session=False)
+                )
+            )
+            if len(updated) < len(params):
+                # Deleted since the ownership check
+                if atomic:
+                    self.db.rollback()
+                    gone = {param["id"] for param in params} - updated
+                    return self._mark_gone(items, statuses, gone), {}
+                params = [param for param in params if param["id"] in updated]
+            for n, param in enumerate(params):
+                param["seq"] = seq + n
+            self.db.execute(
+                update(Task)
+                .where(*matches)
+                .execution_options(synchronize_session=None),
+                params,
+            )
+        self.db.commit()
+
+        ok_ids = [item.id for item, st in zip(items, statuses) if st is None]
+        tasks = self.db.scalars(select(Task).where(Task.id.in_(ok_ids), *matches)).all()
+        found = {task.id: task for task in tasks}
+        self.search_index.index(tasks)
+        if params:
+            task_events.publish_tasks("updated", tasks)
+        return self._mark_gone(items, statuses, set(ok_ids) - set(found)), found
+
+    @staticmethod
+    def _mark_gone(items, statuses: list, gone: set) -> list:
+        """``statuses`` with the items whose ids are in ``gone`` not_found"""
+        return [
+            BulkItemStatus.not_found if item.id in gone else item_status
+            for item, item_status in zip(items, statuses)
+        ]
+
+    def delete_user_tasks(self, user_id: str, task_ids: list[str], atomic=True):
+        """Delete owned tasks with a single DELETE ... WHERE id IN (...).
+
+        Returns one status per id, None for deleted ones. Nothing is deleted
+        when ``atomic`` is set and any id is missing or not owned.
+        """
+        statuses = self._check_owner(user_id, task_ids)
+        if atomic and any(statuses):
+            return statuses
+
+        ok_ids = [task_id for task_id, st in zip(task_ids, statuses) if st is None]
+        if ok_ids:
+            self._bury(user_id, ok_ids)
+            self.db.commit()
+            self.search_index.remove(ok_ids)
+            task_events.publish_deleted(user_id, ok_ids)
+        return statuses
+
+
+class AsyncTaskRepository:
+    """Awaitable front for TaskRepository used by the route handlers.
+
+    With an AsyncSession the queries run on the async driver through
+    ``run_sync`` and the event loop is free while the database works. With a
+    sync Session the call runs inline, exactly as the handlers did before.
+    """
+
+    def __init__(self, db: DBSession):
+        self.db = db
+
+    async def _run(self, method, *args):
+        if isinstance(self.db, AsyncSession):
+            return await self.db.run_sync(
+                lambda session: method(TaskRepository(session), *args)
+            )
+        return method(TaskRepository(self.db), *args)
+
+    async def get_user_tasks(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        columns: Optional[tuple] = None,
+    ):
+        return await self._run(
+            TaskRepository.get_user_tasks, user_id, skip, limit, filters, columns
+        )
+
+    async def get_user_tasks_after(
+        self,
+        user_id: str,
+        after: Optional[tuple] = None,
+        limit: int = 100,
+        filters: Optional[TaskFilter] = None,
+        columns: Optional[tuple] = None,
+    ):
+        return await self._run(
+            TaskRepository.get_user_tasks_after,
+            user_id,
+            after,
+            limit,
+            filters,
+            columns,
+        )
+
+    async def get_user_tasks_stamp(self, user_id: str):
+        return await self._run(TaskRepository.get_user_tasks_stamp, user_id)
+
+    async def get_user_task_count(self, user_id: str) -> int:
+        return await self._run(TaskRepository.get_user_task_count, user_id)
+
+    async def get_user_task_days(self, user_id: str, since: date) -> dict:
+        return await self._run(TaskRepository.get_user_task_days, user_id, since)
+
+    async def iter_user_tasks(self, user_id: str, batch_size: int = 1000):
+        if isinstance(self.db, AsyncSession):
+            statement = TaskRepository.export_statement(user_id, batch_size)
+            result = await self.db.stream(statement)
+            async for partition in result.partitions():
+                yield partition
+        else:
+            for partition in TaskRepository(self.db).iter_user_tasks(
+                user_id, batch_size
+            ):
+                yield partition
+
+    async def search_user_tasks(
+        self,
+        user_id: str,
+        q: str,
+        after: Optional[tuple[float, str]] = None,
+        limit: int = 20,
+    ):
+        return await self._run(
+            TaskRepository.search_user_tasks, user_id, q, after, limit
+        )
+
+    async def get_user_task_changes(
+        self, user_id: str, after: Optional[tuple[int, str]], limit: int
+    ):
+        return await self._run(
+            TaskRepository.get_user_task_changes, user_id, after, limit
+        )
+
+    async def get_task(self, task_id: str):
+        return await self._run(TaskRepository.get_task, task_id)
+
+    async def create_user_task(self, user_id: str, task: TaskCreate):
+        return await self._run(TaskRepository.create_user_task, user_id, task)
+
+    async def create_tasks(self, rows: list[dict], atomic: bool = True):
+        return await self._run(TaskRepository.create_tasks, rows, atomic)
+
+    async def update_user_task(self, user_task: Task, task: TaskCreate):
+        return await self._run(TaskRepository.update_user_task, user_task, task)
+
+    async def patch_user_task(
+        self,
+        task_id: str,
+        user_id: str,
+        values: dict,
+        expected_version: Optional[int] = None,
+    ):
+        return await self._run(
+            TaskRepository.patch_user_task, task_id, user_id, values, expected_version
+        )
+
+    async def get_task_state(self, task_id: str):
+        return await self._run(TaskRepository.get_task_state, task_id)
+
+    async def delete_task(self, user_task: Task):
+        return await self._run(TaskRepository.delete_task, user_task)
+
+    async def get_user_tasks_by_ids(self, user_id: str, task_ids: list[str]):
+        return await self._run(TaskRepository.get_user_tasks_by_ids, user_id, task_ids)
+
+    async def create_user_tasks(
+        self, user_id: str, tasks: list[TaskCreate], atomic: bool = True
+    ):
+        return await self._run(TaskRepository.create_user_tasks, user_id, tasks, atomic)
+
+    async def update_user_tasks(
+        self, user_id: str, items: list[TaskBulkUpdateItem], atomic: bool = True
+    ):
+        return await self._run(TaskRepository.update_user_tasks, user_id, items, atomic)
+
+    async def delete_user_tasks(self, user_id: str, task_ids: list[str], atomic=True):
+        return await self._run(
+            TaskRepository.delete_user_tasks, user_id, task_ids, atomic
+        )
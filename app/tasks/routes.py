@@ -1,13 +1,87 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.config import settings
+from app.database import (
+    DBSession,
+    get_read_session,
+    get_read_session_factory,
+    get_session,
+    get_session_factory,
+    open_session,
+    pin_key,
+    primary_pins,
+)
 from app.auth.service import get_current_user
 from app.auth.models import User
-from .schemas import TaskCreate, Task
-from .repository import TaskRepository
+from app.exceptions import PreconditionFailedError, SyncTokenExpiredError
+from app.ids import NIL
+from .schemas import (
+    BulkItemStatus,
+    BulkMode,
+    ExportFormat,
+    Task,
+    TaskBatchGet,
+    TaskBatchGetResult,
+    TaskBulkCreate,
+    TaskBulkDelete,
+    TaskBulkItemResult,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskChanges,
+    TaskCreate,
+    TaskFilter,
+    TaskPeriodCount,
+    TaskSort,
+    TaskStats,
+    TaskUpdate,
+)
+from .conditional import (
+    cache_headers,
+    if_match_version,
+    is_not_modified,
+    list_etag,
+    not_modified,
+    task_etag,
+)
+from .encoding import TASK_COLUMNS, encode_tasks
+from .escaping import escape_output, escaping_output, output_escaping
+from .events import (
+    encode_event,
+    encode_position,
+    encode_resync,
+    task_events,
+    task_events_resyncs,
+)
+from .export import MEDIA_TYPES, encode_csv, encode_csv_header, encode_ndjson
+from .pagination import (
+    decode_cursor,
+    decode_search_cursor,
+    decode_sync_token,
+    encode_cursor,
+    encode_search_cursor,
+    encode_sync_token,
+)
+from .models import utc_day, utcnow
+from .repository import AsyncTaskRepository
+from .writebehind import task_writer
 
 
-router = APIRouter(tags=["tasks"])
+router = APIRouter(tags=["tasks"], dependencies=[Depends(output_escaping)])
 
 
 @router.post(
@@ -19,7 +93,9 @@ router = APIRouter(tags=["tasks"])
 )
 async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: DBSession = Depends(get_session),
+    session_factory=Depends(get_session_factory),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -28,8 +104,15 @@ async def create_task(
     - **description**: optional, max 500 characters
     """
     try:
-        repo = TaskRepository(db)
-        return repo.create_user_task(current_user.id, task)
+        if settings.WRITE_BEHIND_ENABLED:
+            created = await task_writer.create(session_factory, current_user.id, task)
+            # Committed by the writer's session, not this request's
+            key = pin_key(request)
+            if key is not None:
+                primary_pins.pin(key)
+            return created
+        repo = AsyncTaskRepository(db)
+        return await repo.create_user_task(current_user.id, task)
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
@@ -43,22 +126,609 @@ async def create_task(
         ) from e
 
 
+def task_filter(
+    created_after: Optional[datetime] = Query(
+        None, description="Only tasks created strictly after this time"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only tasks created strictly before this time"
+    ),
+    title_prefix: Optional[str] = Query(
+        None, description="Only tasks whose title starts with this (case-sensitive)"
+    ),
+    sort: TaskSort = Query(
+        TaskSort.created_at,
+        description="created_at or title, prefixed with - for descending order",
+    ),
+) -> TaskFilter:
+    try:
+        return TaskFilter(
+            created_after=created_after,
+            created_before=created_before,
+            title_prefix=title_prefix,
+            sort=sort,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from e
+
+
 @router.get(
     "/",
     response_model=list[Task],
     summary="Get all tasks",
     response_description="List of all tasks",
+    responses={304: {"description": "Not modified since the given ETag"}},
 )
 async def get_tasks(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor for keyset pagination in creation order. "
+        "Pass an empty value for the first page, then the X-Next-Cursor header.",
+    ),
+    filters: TaskFilter = Depends(task_filter),
+    total: bool = Query(
+        False,
+        description="Send the user's task count as X-Total-Count, without filters",
+    ),
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
-    """Retrieve all tasks for the current user"""
+    """
+    Retrieve all tasks for the current user
+
+    - **created_after**/**created_before**: creation time range (exclusive)
+    - **title_prefix**: titles starting with this, case-sensitive
+    - **sort**: `created_at` (default), `-created_at`, `title` or `-title`
+    - **skip**/**limit**: offset pagination
+    - **cursor**: keyset pagination in the chosen order; the cursor for the
+      next page is returned in the `X-Next-Cursor` header
+    - **total**: add `X-Total-Count` with all of the user's tasks, read from a
+      kept counter rather than counted; not sent along with filters, which
+      the counter cannot answer
+
+    Send the returned `ETag` as `If-None-Match` to get a 304 while none of
+    the user's tasks changed. The tag is specific to the query parameters,
+    so another page or filter never matches it.
+    """
     try:
-        repo = TaskRepository(db)
-        return repo.get_user_tasks(current_user.id, skip, limit)
+        repo = AsyncTaskRepository(db)
+        count, last_updated = await repo.get_user_tasks_stamp(current_user.id)
+        # Normalized, so equivalent spellings of a query share a tag
+        view = json.dumps(
+            [filters.model_dump(mode="json"), skip, limit, cursor, total],
+            sort_keys=True,
+        )
+        etag = list_etag(count, last_updated, view)
+        if is_not_modified(request, etag, last_updated):
+            return not_modified(etag, last_updated)
+        response.headers.update(cache_headers(etag, last_updated))
+        if total and filters == TaskFilter(sort=filters.sort):
+            count = await repo.get_user_task_count(current_user.id)
+            response.headers["X-Total-Count"] = str(count)
+
+        columns = TASK_COLUMNS if settings.FAST_SERIALIZATION else None
+        if cursor is None:
+            tasks = await repo.get_user_tasks(
+                current_user.id, skip, limit, filters, columns
+            )
+        else:
+            after = decode_cursor(cursor, filters.sort) if cursor else None
+            # One extra row tells whether another page exists
+            tasks = await repo.get_user_tasks_after(
+                current_user.id, after, limit + 1, filters, columns
+            )
+            if limit > 0 and len(tasks) > limit:
+                tasks = tasks[:limit]
+                response.headers["X-Next-Cursor"] = encode_cursor(
+                    tasks[-1], filters.sort
+                )
+
+        if columns is None:
+            return tasks
+        # Fast path: JSON straight from the column tuples, same shape as the
+        # response_model would produce
+        return Response(
+            encode_tasks(tasks), media_type="application/json", headers=response.headers
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task retrieval failed",
+                "code": "TASK_RETRIEVAL_ERROR",
+                "message": "Could not complete task retrieval",
+            },
+        ) from e
+
+
+@router.get(
+    "/search",
+    response_model=list[Task],
+    summary="Search tasks",
+    response_description="Matching tasks, best match first",
+)
+async def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description="The X-Next-Cursor header of the previous page"
+    ),
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Full-text search over the titles and descriptions of the user's tasks
+
+    - **q**: words to look for; each matches as a prefix and all must match
+    - **limit**: page size
+    - **cursor**: continue after a previous page
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        after = decode_search_cursor(cursor) if cursor else None
+        hits = await repo.search_user_tasks(current_user.id, q, after, limit + 1)
+        if len(hits) > limit:
+            hits = hits[:limit]
+            task, rank = hits[-1]
+            response.headers["X-Next-Cursor"] = encode_search_cursor(rank, task.id)
+        return [task for task, _ in hits]
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task search failed",
+                "code": "TASK_SEARCH_ERROR",
+                "message": "Could not complete task search",
+            },
+        ) from e
+
+
+@router.get(
+    "/stats",
+    response_model=TaskStats,
+    summary="Task counts",
+    response_description="Total tasks and tasks created per day and week",
+)
+async def get_task_stats(
+    days: int = Query(30, ge=1, le=366),
+    weeks: int = Query(12, ge=1, le=104),
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    How many tasks the current user has, and when they were created
+
+    - **days**: most recent UTC days in `per_day`, today included
+    - **weeks**: most recent weeks (Monday to Sunday) in `per_week`
+
+    Counts are of tasks that still exist. They are kept up to date on every
+    create and delete, so this costs the same for ten tasks or a million.
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        today = utc_day(utcnow())
+        first_day = today - timedelta(days=days - 1)
+        this_week = today - timedelta(days=today.weekday())
+        first_week = this_week - timedelta(weeks=weeks - 1)
+        counts = await repo.get_user_task_days(
+            current_user.id, min(first_day, first_week)
+        )
+        per_week = dict.fromkeys(
+            (first_week + timedelta(weeks=n) for n in range(weeks)), 0
+        )
+        for day, count in counts.items():
+            week = day - timedelta(days=day.weekday())
+            if week in per_week:
+                per_week[week] += count
+        return TaskStats(
+            total=await repo.get_user_task_count(current_user.id),
+            per_day=[
+                TaskPeriodCount(start=day, count=counts.get(day, 0))
+                for day in (first_day + timedelta(days=n) for n in range(days))
+            ],
+            per_week=[
+                TaskPeriodCount(start=week, count=count)
+                for week, count in per_week.items()
+            ],
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task stats failed",
+                "code": "TASK_STATS_ERROR",
+                "message": "Could not complete task stats",
+            },
+        ) from e
+
+
+@router.get(
+    "/changes",
+    response_model=TaskChanges,
+    summary="Sync task changes",
+    response_description="What changed since the token, and the next token",
+)
+async def get_task_changes(
+    since: Optional[str] = Query(
+        None, description="The token of the previous sync; omit to fetch everything"
+    ),
+    limit: int = Query(500, ge=1, le=1000),
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Tasks created, updated or deleted since a previous sync
+
+    - **since**: `token` from the previous response; without it every task
+      is returned
+    - **limit**: most changes per response; `has_more` asks for another round
+
+    A token older than the deletions the purge job has since forgotten gets
+    `410 Gone`: start over without `since`.
+
+    Every write gives the task the next number in a per-user sequence and
+    deletes leave a numbered tombstone, so a sync reads only what changed.
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        after = decode_sync_token(since) if since else None
+        changes = await repo.get_user_task_changes(current_user.id, after, limit)
+        if changes is None:
+            raise SyncTokenExpiredError()
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if changes:
+            token = encode_sync_token(*changes[-1][:2])
+        else:
+            token = since or encode_sync_token(0, NIL)
+        return TaskChanges(
+            changed=[task for _, _, task in changes if task is not None],
+            deleted=[task_id for _, task_id, task in changes if task is None],
+            token=token,
+            has_more=has_more,
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task sync failed",
+                "code": "TASK_SYNC_ERROR",
+                "message": "Could not complete task sync",
+            },
+        ) from e
+
+
+@router.get(
+    "/export",
+    summary="Export all tasks",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "All of the user's tasks, streamed",
+            "content": {media_type: {} for media_type in MEDIA_TYPES.values()},
+        }
+    },
+)
+async def export_tasks(
+    export_format: ExportFormat = Query(ExportFormat.ndjson, alias="format"),
+    session_factory=Depends(get_read_session_factory),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Stream every task of the current user in creation order
+
+    - **format**: `ndjson` (one task per line) or `csv`
+
+    Rows are read from a server-side cursor and flushed one batch at a time,
+    so memory stays flat however many tasks there are.
+    """
+    owner_id = current_user.id
+    escape = escaping_output()
+
+    async def stream():
+        # The request's session is closed before streaming starts, so the
+        # export reads through its own; escaping is taken along the same way
+        escape_output.set(escape)
+        async with open_session(session_factory) as db:
+            if export_format == ExportFormat.csv:
+                yield encode_csv_header()
+            repo = AsyncTaskRepository(db)
+            async for rows in repo.iter_user_tasks(
+                owner_id, settings.EXPORT_BATCH_SIZE
+            ):
+                if export_format == ExportFormat.csv:
+                    yield encode_csv(rows)
+                else:
+                    yield encode_ndjson(rows)
+
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+        },
+    )
+
+
+@router.get(
+    "/events",
+    summary="Stream task changes",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Server-Sent Events for the user's tasks",
+            "content": {"text/event-stream": {}},
+        }
+    },
+)
+async def stream_task_events(
+    last_event_id: Optional[str] = Header(
+        None, description="Resume after this event, as EventSource does on reconnect"
+    ),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Push changes to the current user's tasks instead of polling for them
+
+    - **created**, **updated**: the task, as `GET /tasks/{task_id}` returns it
+    - **deleted**: `{"id": ...}` of the deleted task
+    - **resync**: events were dropped, reload with `GET /tasks/` and carry on
+
+    A reconnect with `Last-Event-ID` replays the events it missed while the
+    server still has them, and starts with **resync** otherwise. Idle streams
+    get a keepalive every `TASK_EVENTS_KEEPALIVE_SECONDS`.
+    """
+    owner_id = current_user.id
+    escape = escaping_output()
+
+    async def stream():
+        # Streaming outlives the request's dependencies
+        escape_output.set(escape)
+        subscription = task_events.subscribe(owner_id)
+        try:
+            missed = []
+            if last_event_id is not None:
+                missed = task_events.replay(owner_id, last_event_id)
+            if missed is None:
+                task_events_resyncs.inc()
+                yield encode_resync(task_events)
+            elif missed:
+                yield b"".join(encode_event(task_events, event) for event in missed)
+            else:
+                yield encode_position(task_events)
+
+            while True:
+                await subscription.wait(settings.TASK_EVENTS_KEEPALIVE_SECONDS)
+                if subscription.resync:
+                    subscription.resync = False
+                    task_events_resyncs.inc()
+                    yield encode_resync(task_events)
+                elif subscription.events:
+                    frames = b"".join(
+                        encode_event(task_events, event)
+                        for event in subscription.events
+                    )
+                    subscription.events.clear()
+                    yield frames
+                else:
+                    yield encode_position(task_events)
+        finally:
+            task_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def reject_bulk(results: list[TaskBulkItemResult]):
+    """Abort an atomic bulk request, reporting which items blocked it"""
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "error": "Bulk operation rejected",
+            "code": "BULK_ITEM_ERROR",
+            "message": "No changes were applied because some items failed",
+            "results": [result.model_dump(mode="json") for result in results],
+        },
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResult,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create many tasks",
+    responses={409: {"description": "Atomic batch rejected"}},
+)
+async def create_tasks_bulk(
+    batch: TaskBulkCreate,
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Create up to `BULK_MAX_ITEMS` tasks in one transaction
+
+    - **items**: tasks to create, same fields as a single create
+    - **mode**: `atomic` (all or nothing) or `best_effort` (per-item results)
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        created = await repo.create_user_tasks(
+            current_user.id, batch.items, batch.mode == BulkMode.atomic
+        )
+        return TaskBulkResult(
+            results=[
+                TaskBulkItemResult(
+                    id=row.id,
+                    status=BulkItemStatus.created,
+                    task=Task.model_validate(row),
+                )
+                if row is not None
+                else TaskBulkItemResult(status=BulkItemStatus.failed)
+                for row in created
+            ]
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task creation failed",
+                "code": "TASK_CREATION_ERROR",
+                "message": "Could not complete task creation",
+            },
+        ) from e
+
+
+@router.patch(
+    "/bulk",
+    response_model=TaskBulkResult,
+    summary="Update many tasks",
+    responses={409: {"description": "Atomic batch rejected"}},
+)
+async def update_tasks_bulk(
+    batch: TaskBulkUpdate,
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Partially update up to `BULK_MAX_ITEMS` tasks in one transaction
+
+    - **items**: `id` plus the fields to change
+    - **mode**: `atomic` (all or nothing) or `best_effort` (per-item results)
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        atomic = batch.mode == BulkMode.atomic
+        statuses, tasks = await repo.update_user_tasks(
+            current_user.id, batch.items, atomic
+        )
+        rejected = atomic and any(statuses)
+        results = []
+        for item, item_status in zip(batch.items, statuses):
+            if item_status is not None:
+                results.append(TaskBulkItemResult(id=item.id, status=item_status))
+            elif rejected:
+                results.append(
+                    TaskBulkItemResult(id=item.id, status=BulkItemStatus.skipped)
+                )
+            else:
+                results.append(
+                    TaskBulkItemResult(
+                        id=item.id,
+                        status=BulkItemStatus.updated,
+                        task=Task.model_validate(tasks[item.id]),
+                    )
+                )
+        if rejected:
+            reject_bulk(results)
+        return TaskBulkResult(results=results)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task update failed",
+                "code": "TASK_UPDATE_ERROR",
+                "message": "Could not complete task update",
+            },
+        ) from e
+
+
+@router.delete(
+    "/bulk",
+    response_model=TaskBulkResult,
+    summary="Delete many tasks",
+    responses={409: {"description": "Atomic batch rejected"}},
+)
+async def delete_tasks_bulk(
+    batch: TaskBulkDelete,
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delete up to `BULK_MAX_ITEMS` tasks in one transaction
+
+    - **ids**: IDs of the tasks to delete
+    - **mode**: `atomic` (all or nothing) or `best_effort` (per-item results)
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        atomic = batch.mode == BulkMode.atomic
+        statuses = await repo.delete_user_tasks(current_user.id, batch.ids, atomic)
+        rejected = atomic and any(statuses)
+        done = BulkItemStatus.skipped if rejected else BulkItemStatus.deleted
+        results = [
+            TaskBulkItemResult(id=task_id, status=item_status or done)
+            for task_id, item_status in zip(batch.ids, statuses)
+        ]
+        if rejected:
+            reject_bulk(results)
+        return TaskBulkResult(results=results)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task deletion failed",
+                "code": "TASK_DELETION_ERROR",
+                "message": "Could not complete task deletion",
+            },
+        ) from e
+
+
+@router.post(
+    "/batch-get",
+    response_model=TaskBatchGetResult,
+    summary="Get many tasks by ID",
+)
+async def batch_get_tasks(
+    batch: TaskBatchGet,
+    db: DBSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Retrieve up to `BATCH_GET_MAX_IDS` tasks in one request and one query
+
+    - **ids**: IDs of the tasks to fetch
+
+    Found tasks come back in request order; IDs that do not exist or belong
+    to another user are listed in `not_found` and `forbidden`.
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        # Repeated IDs are answered once
+        task_ids = list(dict.fromkeys(batch.ids))
+        fetched = await repo.get_user_tasks_by_ids(current_user.id, task_ids)
+        result = TaskBatchGetResult(tasks=[])
+        for task_id, item in zip(task_ids, fetched):
+            if item is BulkItemStatus.not_found:
+                result.not_found.append(task_id)
+            elif item is BulkItemStatus.forbidden:
+                result.forbidden.append(task_id)
+            else:
+                result.tasks.append(Task.model_validate(item))
+        return result
+    except HTTPException as http_exc:
+        raise http_exc
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -74,22 +744,29 @@ async def get_tasks(
     "/{task_id}",
     response_model=Task,
     summary="Get a specific task",
-    responses={404: {"description": "Task not found"}},
+    responses={
+        304: {"description": "Not modified since the given ETag"},
+        404: {"description": "Task not found"},
+    },
 )
 async def get_task(
     task_id: str,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: DBSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user),
 ):
     """
     Retrieve a specific task by its ID
 
     - **task_id**: UUID of the task to retrieve
+
+    Responds 304 when `If-None-Match` holds the task's current `ETag`.
     """
     try:
-        repo = TaskRepository(db)
+        repo = AsyncTaskRepository(db)
 
-        task = repo.get_task(task_id)
+        task = await repo.get_task(task_id)
 
         if not task:
             raise HTTPException(
@@ -102,6 +779,10 @@ async def get_task(
                 detail="You do not have permission to access this task",
             )
 
+        etag = task_etag(task.id, task.version)
+        if is_not_modified(request, etag, task.updated_at):
+            return not_modified(etag, task.updated_at)
+        response.headers.update(cache_headers(etag, task.updated_at))
         return task
     except HTTPException as http_exc:
         raise http_exc
@@ -120,7 +801,7 @@ async def get_task(
 async def update_task(
     task_id: str,
     task: TaskCreate,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -131,9 +812,9 @@ async def update_task(
     - **description**: updated description
     """
     try:
-        repo = TaskRepository(db)
+        repo = AsyncTaskRepository(db)
 
-        user_task = repo.get_task(task_id)
+        user_task = await repo.get_task(task_id)
 
         if not user_task:
             raise HTTPException(
@@ -146,7 +827,7 @@ async def update_task(
                 detail="You do not have permission to access this task",
             )
 
-        updated_task = repo.update_user_task(user_task, task)
+        updated_task = await repo.update_user_task(user_task, task)
 
         return updated_task
     except HTTPException as http_exc:
@@ -163,10 +844,77 @@ async def update_task(
         ) from e
 
 
+@router.patch(
+    "/{task_id}",
+    response_model=Task,
+    summary="Partially update a task",
+    responses={
+        403: {"description": "Task belongs to another user"},
+        404: {"description": "Task not found"},
+        412: {"description": "If-Match does not hold the current ETag"},
+    },
+)
+async def patch_task(
+    task_id: str,
+    task: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: DBSession = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Update only the fields sent, in a single conditional UPDATE
+
+    - **task_id**: UUID of the task to update
+    - **title**/**description**: fields to change; omitted ones are kept
+    - **If-Match**: the task's `ETag`; the update fails with 412 if the task
+      changed since
+    """
+    try:
+        repo = AsyncTaskRepository(db)
+        row = await repo.patch_user_task(
+            task_id,
+            current_user.id,
+            task.model_dump(exclude_unset=True),
+            if_match_version(if_match, task_id),
+        )
+
+        if row is None:
+            # Only failures pay for a second query to say why
+            state = await repo.get_task_state(task_id)
+            if state is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
+                )
+            if current_user.id != state.owner_id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You do not have permission to access this task",
+                )
+            raise PreconditionFailedError(task_etag(task_id, state.version))
+
+        response.headers.update(
+            cache_headers(task_etag(row.id, row.version), row.updated_at)
+        )
+        return row
+    except HTTPException as http_exc:
+        raise http_exc
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "Task update failed",
+                "code": "TASK_UPDATE_ERROR",
+                "message": "Could not complete task update",
+            },
+        ) from e
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: str,
-    db: Session = Depends(get_db),
+    db: DBSession = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ):
     """
@@ -175,9 +923,9 @@ async def delete_task(
     - **task_id**: UUID of the task to delete
     """
     try:
-        repo = TaskRepository(db)
+        repo = AsyncTaskRepository(db)
 
-        user_task = repo.get_task(task_id)
+        user_task = await repo.get_task(task_id)
 
         if not user_task:
             raise HTTPException(
@@ -190,7 +938,7 @@ async def delete_task(
                 detail="You do not have permission to access this task",
             )
 
-        repo.delete_task(user_task)
+        await repo.delete_task(user_task)
 
         return None
     except HTTPException as http_exc:
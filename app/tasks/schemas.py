@@ -1,28 +1,182 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    field_validator,
+    model_serializer,
+    model_validator,
+)
 from typing import Optional
-import html
-from datetime import datetime
+from enum import Enum
+from datetime import date, datetime, UTC
+from app.config import settings
+from .escaping import output_text
 
 
 class TaskBase(BaseModel):
+    """Text is kept as sent; HTML escaping happens when a Task is encoded"""
+
     title: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
 
-    @field_validator("title", "description")
-    @classmethod
-    def sanitize_strings(cls, v):
-        if v is None:
-            return v
-        return html.escape(v)
-
 
 class TaskCreate(TaskBase):
     pass
 
 
+class TaskUpdate(TaskBase):
+    """Partial update: only the fields sent by the client are applied"""
+
+    title: Optional[str] = Field(None, min_length=1, max_length=100)
+
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, v):
+        if v is None:
+            raise ValueError("title cannot be null")
+        return v
+
+
 class Task(TaskBase):
     id: str
     owner_id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    version: int = 1
+    # Row predates raw storage and still holds escaped text
+    text_escaped: bool = Field(False, exclude=True)
 
     model_config = {"from_attributes": True}
+
+    @model_serializer(mode="wrap")
+    def encode_text(self, handler):
+        data = handler(self)
+        data["title"] = output_text(self.title, self.text_escaped)
+        data["description"] = output_text(self.description, self.text_escaped)
+        return data
+
+
+class TaskSort(str, Enum):
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    title = "title"
+    title_desc = "-title"
+
+    @property
+    def field(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
+class TaskFilter(BaseModel):
+    """Filters and ordering for the task list, all compiled to indexed SQL"""
+
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    title_prefix: Optional[str] = Field(None, min_length=1, max_length=100)
+    sort: TaskSort = TaskSort.created_at
+
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def to_utc(cls, v):
+        # Timestamps are stored in UTC; naive input is taken to be UTC
+        if v is None:
+            return v
+        if v.tzinfo is None:
+            return v.replace(tzinfo=UTC)
+        return v.astimezone(UTC)
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if (
+            self.created_after is not None
+            and self.created_before is not None
+            and self.created_after >= self.created_before
+        ):
+            raise ValueError("created_after must be earlier than created_before")
+        return self
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class BulkMode(str, Enum):
+    atomic = "atomic"
+    best_effort = "best_effort"
+
+
+class BulkItemStatus(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    not_found = "not_found"
+    forbidden = "forbidden"
+    failed = "failed"
+    skipped = "skipped"
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: str
+
+
+class TaskBulkCreate(BaseModel):
+    items: list[TaskCreate] = Field(
+        ..., min_length=1, max_length=settings.BULK_MAX_ITEMS
+    )
+    mode: BulkMode = BulkMode.atomic
+
+
+class TaskBulkUpdate(BaseModel):
+    items: list[TaskBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=settings.BULK_MAX_ITEMS
+    )
+    mode: BulkMode = BulkMode.atomic
+
+
+class TaskBulkDelete(BaseModel):
+    ids: list[str] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+    mode: BulkMode = BulkMode.atomic
+
+
+class TaskBulkItemResult(BaseModel):
+    id: Optional[str] = None
+    status: BulkItemStatus
+    task: Optional[Task] = None
+
+
+class TaskBulkResult(BaseModel):
+    results: list[TaskBulkItemResult]
+
+
+class TaskBatchGet(BaseModel):
+    ids: list[str] = Field(..., min_length=1, max_length=settings.BATCH_GET_MAX_IDS)
+
+
+class TaskBatchGetResult(BaseModel):
+    tasks: list[Task]
+    not_found: list[str] = []
+    forbidden: list[str] = []
+
+
+class TaskChanges(BaseModel):
+    changed: list[Task] = Field(
+        description="Tasks created or updated since the token, as they are now"
+    )
+    deleted: list[str] = Field(description="Ids of tasks deleted since the token")
+    token: str = Field(description="Pass as `since` to get what changes next")
+    has_more: bool = Field(description="More changes follow; ask again at once")
+
+
+class TaskPeriodCount(BaseModel):
+    start: date = Field(description="The day, or the Monday starting the week (UTC)")
+    count: int = Field(description="Tasks created in the period and not deleted")
+
+
+class TaskStats(BaseModel):
+    total: int
+    per_day: list[TaskPeriodCount]
+    per_week: list[TaskPeriodCount]
@@ -0,0 +1,241 @@
+import bisect
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, literal_column, or_, select, table
+from sqlalchemy.orm import Session
+
+from .models import Task
+
+TOKEN_RE = re.compile(r"\w+")
+
+# tasks_fts and its triggers are created with the tasks table; see models.py
+task_columns = Task.__table__.columns
+tasks_fts = literal_column("tasks_fts")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def fts_query(q: str) -> str:
+    """Every word of ``q`` as a prefix phrase; all of them must match"""
+    return " ".join(f'"{token}"*' for token in tokenize(q))
+
+
+class FTS5Search:
+    """Ranked search through the SQLite FTS5 index.
+
+    Ranks are FTS5's bm25(), where lower is a better match, so pages continue
+    after a ``(rank, id)`` pair.
+    """
+
+    def search(
+        self,
+        db: Session,
+        user_id: str,
+        q: str,
+        after: Optional[tuple[float, str]] = None,
+        limit: int = 20,
+    ) -> list[tuple]:
+        query = fts_query(q)
+        if not query:
+            # No words to match; FTS5 rejects an empty MATCH
+            return []
+        rank = func.bm25(tasks_fts)
+        statement = (
+            select(*task_columns, rank.label("rank"))
+            .select_from(table("tasks_fts"))
+            .join(
+                Task, literal_column("tasks.rowid") == literal_column("tasks_fts.rowid")
+            )
+            .where(
+                tasks_fts.op("MATCH")(query),
+                Task.owner_id == user_id,
+                # Soft-deleted rows stay in the FTS table until purged
+                Task.deleted_at.is_(None),
+            )
+        )
+        if after is not None:
+            after_rank, after_id = after
+            statement = statement.where(
+                or_(rank > after_rank, and_(rank == after_rank, Task.id > after_id))
+            )
+        rows = db.execute(statement.order_by(rank, Task.id).limit(limit)).all()
+        return [(row, row.rank) for row in rows]
+
+    def index(self, rows: Iterable):
+        """Kept up to date by the triggers"""
+
+    def remove(self, task_ids: Iterable[str]):
+        """Kept up to date by the triggers"""
+
+
+class InvertedIndex:
+    """Inverted index with Okapi BM25 ranking, partitioned by owner.
+
+    Ranks follow the FTS5 convention (negated score, lower is better) so both
+    backends page the same way.
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # owner_id -> term -> task_id -> term frequency
+        self.postings: dict[str, dict[str, dict[str, int]]] = {}
+        # task_id -> (owner_id, terms)
+        self.documents: dict[str, tuple[str, Counter]] = {}
+        # owner_id -> [document count, total document length]
+        self.totals: dict[str, list[int]] = {}
+        self.sorted_terms: dict[str, list[str]] = {}
+
+    def add(self, task_id: str, owner_id: str, text: str):
+        terms = Counter(tokenize(text))
+        with self.lock:
+            self._discard(task_id)
+            postings = self.postings.setdefault(owner_id, {})
+            for term, count in terms.items():
+                postings.setdefault(term, {})[task_id] = count
+            self.documents[task_id] = (owner_id, terms)
+            totals = self.totals.setdefault(owner_id, [0, 0])
+            totals[0] += 1
+            totals[1] += terms.total()
+            self.sorted_terms.pop(owner_id, None)
+
+    def discard(self, task_id: str):
+        with self.lock:
+            self._discard(task_id)
+
+    def clear(self):
+        with self.lock:
+            self.postings.clear()
+            self.documents.clear()
+            self.totals.clear()
+            self.sorted_terms.clear()
+
+    def _discard(self, task_id: str):
+        document = self.documents.pop(task_id, None)
+        if document is None:
+            return
+        owner_id, terms = document
+        postings = self.postings[owner_id]
+        for term in terms:
+            del postings[term][task_id]
+            if not postings[term]:
+                del postings[term]
+        self.totals[owner_id][0] -= 1
+        self.totals[owner_id][1] -= terms.total()
+        self.sorted_terms.pop(owner_id, None)
+
+    def _expand(self, owner_id: str, prefix: str) -> list[str]:
+        terms = self.sorted_terms.get(owner_id)
+        if terms is None:
+            terms = self.sorted_terms[owner_id] = sorted(self.postings[owner_id])
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + "\U0010ffff")
+        return terms[start:end]
+
+    def search(self, owner_id: str, q: str) -> list[tuple[float, str]]:
+        """``(rank, task_id)`` of tasks matching every word of ``q`` as a
+        prefix, best first"""
+        tokens = tokenize(q)
+        with self.lock:
+            if not tokens or not self.totals.get(owner_id, [0])[0]:
+                return []
+            postings = self.postings[owner_id]
+            count, total_length = self.totals[owner_id]
+            average_length = total_length / count or 1
+            scores: Optional[dict[str, float]] = None
+            for token in tokens:
+                frequencies: Counter = Counter()
+                for term in self._expand(owner_id, token):
+                    frequencies.update(postings[term])
+                idf = math.log(
+                    (count - len(frequencies) + 0.5) / (len(frequencies) + 0.5)
+                )
+                idf = max(idf, 1e-6)
+                matched = {}
+                for task_id, tf in frequencies.items():
+                    if scores is not None and task_id not in scores:
+                        continue
+                    length = self.documents[task_id][1].total()
+                    norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                    score = idf * tf * (self.k1 + 1) / (tf + norm)
+                    matched[task_id] = score + (scores or {}).get(task_id, 0.0)
+                scores = matched
+        return sorted((-score, task_id) for task_id, score in scores.items())
+
+
+class InMemorySearch:
+    """Search for databases without FTS5, over an InvertedIndex of this process.
+
+    The index is loaded from the database on first use and then follows the
+    writes made through TaskRepository, so it only sees other processes'
+    writes after a restart.
+    """
+
+    def __init__(self):
+        self.inverted_index = InvertedIndex()
+        self.loaded = False
+        self.load_lock = threading.Lock()
+
+    def load(self, db: Session):
+        with self.load_lock:
+            if self.loaded:
+                return
+            statement = (
+                select(Task.id, Task.owner_id, Task.title, Task.description)
+                .where(Task.deleted_at.is_(None))
+                .execution_options(yield_per=1000)
+            )
+            for row in db.execute(statement):
+                self.inverted_index.add(row.id, row.owner_id, document_text(row))
+            self.loaded = True
+
+    def search(
+        self,
+        db: Session,
+        user_id: str,
+        q: str,
+        after: Optional[tuple[float, str]] = None,
+        limit: int = 20,
+    ) -> list[tuple]:
+        self.load(db)
+        ranked = self.inverted_index.search(user_id, q)
+        if after is not None:
+            ranked = ranked[bisect.bisect_right(ranked, after) :]
+        ranked = ranked[:limit]
+        if not ranked:
+            return []
+        statement = select(*task_columns).where(
+            Task.id.in_([task_id for _, task_id in ranked]), Task.deleted_at.is_(None)
+        )
+        rows = {row.id: row for row in db.execute(statement)}
+        return [(rows[task_id], rank) for rank, task_id in ranked if task_id in rows]
+
+    def index(self, rows: Iterable):
+        for row in rows:
+            self.inverted_index.add(row.id, row.owner_id, document_text(row))
+
+    def remove(self, task_ids: Iterable[str]):
+        for task_id in task_ids:
+            self.inverted_index.discard(task_id)
+
+
+def document_text(row) -> str:
+    return f"{row.title} {row.description or ''}"
+
+
+fts5_search = FTS5Search()
+in_memory_search = InMemorySearch()
+
+
+def search_backend(db: Session):
+    if db.get_bind().dialect.name == "sqlite":
+        return fts5_search
+    return in_memory_search
@@ -0,0 +1,135 @@
+import asyncio
+from typing import Optional
+
+from app.config import settings
+from app.database import open_session
+from app.exceptions import ServiceBusyError
+from app.ids import generate_uuid
+from app.metrics import Counter, Gauge, Histogram
+from .repository import AsyncTaskRepository
+from .schemas import TaskCreate
+
+task_write_batch_rows = Histogram(
+    "task_write_batch_rows",
+    "Tasks inserted per group commit by the write-behind writer",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+task_write_commits = Counter(
+    "task_write_commits_total",
+    "Group commits made by the write-behind writer",
+)
+
+
+class TaskWriter:
+    """Creates tasks through a queue drained by a single writer coroutine.
+
+    ``create`` enqueues the row, with its id already assigned, and waits.
+    The writer takes everything queued, waits up to ``max_delay`` seconds for
+    more while the batch is under ``max_batch`` rows, then inserts and commits
+    the batch at once, resolving each waiting request with its row. A request
+    therefore returns only once its task is committed, while the database
+    sees one commit (one fsync on SQLite) per batch instead of per task.
+
+    Beyond ``max_pending`` queued or uncommitted tasks, ``create`` answers
+    503 instead of letting the queue grow. The writer starts on first use in
+    the running event loop.
+    """
+
+    def __init__(self, max_batch: int, max_delay: float, max_pending: int):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.pending = 0
+        self.queue: Optional[asyncio.Queue] = None
+        self.worker: Optional[asyncio.Task] = None
+        self.pending_gauge = Gauge(
+            "task_write_pending",
+            "Tasks queued or being committed by the write-behind writer",
+            callback=lambda: self.pending,
+        )
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if (
+            self.worker is None
+            or self.worker.done()
+            or self.worker.get_loop() is not loop
+        ):
+            self.queue = asyncio.Queue()
+            self.worker = loop.create_task(self._run(self.queue))
+
+    async def create(self, session_factory, user_id: str, task: TaskCreate):
+        if self.pending >= self.max_pending:
+            raise ServiceBusyError(1)
+        self._ensure_worker()
+        row = {**task.model_dump(), "id": generate_uuid(), "owner_id": user_id}
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((session_factory, row, future))
+        self.pending += 1
+        # Shielded: the row is committed even if the client goes away
+        return await asyncio.shield(future)
+
+    async def stop(self):
+        """Commit what is queued, then stop the writer"""
+        if self.worker is None or self.worker.done():
+            return
+        if self.worker.get_loop() is asyncio.get_running_loop():
+            self.queue.put_nowait(None)
+            await self.worker
+        self.worker = None
+
+    async def _run(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            if batch[0] is not None:
+                self._drain(queue, batch)
+                if len(batch) < self.max_batch and self.max_delay > 0:
+                    await asyncio.sleep(self.max_delay)
+                    self._drain(queue, batch)
+            stopping = batch[-1] is None
+            items = [item for item in batch if item is not None]
+            if items:
+                await self._commit(items)
+            if stopping:
+                return
+
+    def _drain(self, queue: asyncio.Queue, batch: list):
+        while len(batch) < self.max_batch and batch[-1] is not None:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+
+    async def _commit(self, items: list):
+        by_factory = {}
+        for item in items:
+            by_factory.setdefault(item[0], []).append(item)
+        for session_factory, group in by_factory.items():
+            try:
+                async with open_session(session_factory) as db:
+                    created = await AsyncTaskRepository(db).create_tasks(
+                        [row for _, row, _ in group], atomic=False
+                    )
+            except Exception as e:
+                for _, _, future in group:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            finally:
+                self.pending -= len(group)
+            task_write_commits.inc()
+            task_write_batch_rows.observe(len(group))
+            for (_, row, future), task in zip(group, created):
+                if future.done():
+                    continue
+                if task is None:
+                    future.set_exception(RuntimeError(f"Task {row['id']} not created"))
+                else:
+                    future.set_result(task)
+
+
+task_writer = TaskWriter(
+    settings.WRITE_BEHIND_MAX_BATCH,
+    settings.WRITE_BEHIND_MAX_DELAY_MS / 1000,
+    settings.WRITE_BEHIND_MAX_PENDING,
+)
@@ -4,8 +4,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.config import settings
 from app.main import app
-from app.database import Base, get_db
+from app.auth.cache import principal_cache
+from app.database import Base, get_db, get_session_factory
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 
@@ -17,6 +19,15 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+@pytest.fixture(scope="session", autouse=True)
+def no_rate_limits():
+    # Every test client logs in from the same address; test_ratelimit.py
+    # turns limits back on where it needs them
+    settings.RATE_LIMIT_ENABLED = False
+    yield
+    settings.RATE_LIMIT_ENABLED = True
+
+
 @pytest.fixture(scope="module")
 def db_session():
     Base.metadata.create_all(bind=engine)
@@ -37,5 +48,7 @@ def client(db_session):
             db_session.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
+    principal_cache.clear()
     yield TestClient(app)
     app.dependency_overrides.clear()
@@ -0,0 +1,181 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.instrumentation import http_request_db_queries
+from app.tasks.models import Task, utcnow
+from app.tasks.schemas import BulkItemStatus, TaskBulkUpdateItem, TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def login(client, email):
+    response = client.post(
+        "/api/v1/users/login", json={"email": email, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_bulk_create_update_delete(client, db_session):
+    # Setup test users; user2 owns a task user1 must not touch
+    user_repo = UserRepository(db_session)
+    user_repo.create_user(UserCreate(email="bulk1@example.com", password="password123"))
+    user2 = user_repo.create_user(
+        UserCreate(email="bulk2@example.com", password="password123")
+    )
+    other_task = TaskRepository(db_session).create_user_task(
+        user2.id, TaskCreate(title="Not yours")
+    )
+    headers = login(client, "bulk1@example.com")
+
+    # Bulk create
+    response = client.post(
+        "/api/v1/tasks/bulk",
+        json={"items": [{"title": f"Bulk {i}"} for i in range(3)]},
+        headers=headers,
+    )
+    assert response.status_code == 201
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created"] * 3
+    assert [r["task"]["title"] for r in results] == ["Bulk 0", "Bulk 1", "Bulk 2"]
+    ids = [r["id"] for r in results]
+
+    # Atomic update touching a foreign and a missing task changes nothing
+    items = [
+        {"id": ids[0], "title": "Renamed"},
+        {"id": other_task.id, "title": "Hijacked"},
+        {"id": "missing-id", "title": "Ghost"},
+    ]
+    response = client.patch(
+        "/api/v1/tasks/bulk", json={"items": items}, headers=headers
+    )
+    assert response.status_code == 409
+    statuses = [r["status"] for r in response.json()["detail"]["results"]]
+    assert statuses == ["skipped", "forbidden", "not_found"]
+    response = client.get(f"/api/v1/tasks/{ids[0]}", headers=headers)
+    assert response.json()["title"] == "Bulk 0"
+
+    # Best effort applies what it can; unsent fields are left alone
+    client.patch(
+        "/api/v1/tasks/bulk",
+        json={"items": [{"id": ids[1], "description": "Kept title"}]},
+        headers=headers,
+    )
+    response = client.patch(
+        "/api/v1/tasks/bulk",
+        json={"items": items, "mode": "best_effort"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["updated", "forbidden", "not_found"]
+    assert results[0]["task"]["title"] == "Renamed"
+    assert results[0]["task"]["version"] == 2
+    response = client.get(f"/api/v1/tasks/{ids[1]}", headers=headers)
+    assert response.json()["title"] == "Bulk 1"
+    assert response.json()["description"] == "Kept title"
+    assert response.json()["version"] == 2
+
+    # Bulk delete
+    response = client.request(
+        "DELETE",
+        "/api/v1/tasks/bulk",
+        json={"ids": [ids[0], ids[1], other_task.id], "mode": "best_effort"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["deleted", "deleted", "forbidden"]
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["id"] for task in response.json()] == [ids[2]]
+
+
+def test_bulk_create_best_effort(db_session):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="bulk3@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    # Bypass validation to get a row the database rejects
+    tasks = [TaskCreate(title="Good"), TaskCreate.model_construct(title=None)]
+
+    with pytest.raises(IntegrityError):
+        task_repo.create_user_tasks(user.id, tasks)
+    assert task_repo.get_user_tasks(user.id) == []
+
+    created = task_repo.create_user_tasks(user.id, tasks, atomic=False)
+    assert created[0].title == "Good"
+    assert created[1] is None
+    assert [task.title for task in task_repo.get_user_tasks(user.id)] == ["Good"]
+
+
+def test_bulk_update_skips_tasks_deleted_meanwhile(db_session):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="bulk-race@example.com", password="password123")
+    )
+    repo = TaskRepository(db_session)
+    kept, gone = (
+        repo.create_user_task(user.id, TaskCreate(title=title)).id
+        for title in ("Kept", "Gone")
+    )
+    check_owner = repo._check_owner
+
+    def check_then_delete(user_id, task_ids):
+        # A soft delete landing between the ownership check and the UPDATE
+        statuses = check_owner(user_id, task_ids)
+        db_session.execute(
+            update(Task).where(Task.id == gone).values(deleted_at=utcnow())
+        )
+        return statuses
+
+    repo._check_owner = check_then_delete
+    items = [
+        TaskBulkUpdateItem(id=kept, title="Renamed"),
+        TaskBulkUpdateItem(id=gone, title="Revived"),
+    ]
+    statuses, tasks = repo.update_user_tasks(user.id, items, atomic=True)
+    assert statuses == [None, BulkItemStatus.not_found] and tasks == {}
+    assert db_session.get(Task, kept).title == "Kept"
+
+    statuses, tasks = repo.update_user_tasks(user.id, items, atomic=False)
+    assert statuses == [None, BulkItemStatus.not_found]
+    assert list(tasks) == [kept] and tasks[kept].title == "Renamed"
+    db_session.expire_all()
+    deleted = db_session.get(Task, gone)
+    assert deleted.title == "Gone" and deleted.deleted_at is not None
+
+
+def test_batch_get(client, db_session):
+    # Setup test users; user2 owns a task user1 may not read
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="batch1@example.com", password="password123")
+    )
+    user2 = user_repo.create_user(
+        UserCreate(email="batch2@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    other_id = task_repo.create_user_task(user2.id, TaskCreate(title="Not yours")).id
+    ids = [
+        task_repo.create_user_task(user.id, TaskCreate(title=f"Mine {i}")).id
+        for i in range(3)
+    ]
+    headers = login(client, "batch1@example.com")
+
+    route = "/api/v1/tasks/batch-get"
+    queries = http_request_db_queries.sum(method="POST", route=route)
+    response = client.post(
+        route,
+        json={"ids": [ids[2], "missing", other_id, ids[0], ids[2]]},
+        headers=headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [task["id"] for task in body["tasks"]] == [ids[2], ids[0]]
+    assert body["not_found"] == ["missing"]
+    assert body["forbidden"] == [other_id]
+    # Loading the principal, then one query for the whole batch
+    assert http_request_db_queries.sum(method="POST", route=route) == queries + 2
+
+    response = client.post(route, json={"ids": []}, headers=headers)
+    assert response.status_code == 422
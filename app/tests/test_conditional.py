@@ -0,0 +1,219 @@
+from sqlalchemy import select
+
+from app.instrumentation import http_request_db_queries
+from app.tasks.events import task_events
+from app.tasks.models import TaskOwner
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_conditional_get(client, db_session):
+    # Setup test user and task
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="etag@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    task = task_repo.create_user_task(user.id, TaskCreate(title="Cached"))
+    task_id = task.id
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "etag@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["version"] == 1
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    response = client.get(
+        f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = client.get(
+        f"/api/v1/tasks/{task_id}",
+        headers={**headers, "If-Modified-Since": last_modified},
+    )
+    assert response.status_code == 304
+
+    # An update bumps the version and invalidates the old ETag
+    response = client.put(
+        f"/api/v1/tasks/{task_id}", json={"title": "Changed"}, headers=headers
+    )
+    assert response.json()["version"] == 2
+    response = client.get(
+        f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # The list ETag follows creates and deletes
+    response = client.get("/api/v1/tasks/", headers=headers)
+    list_etag = response.headers["etag"]
+    response = client.get(
+        "/api/v1/tasks/", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 304
+
+    other = client.post("/api/v1/tasks/", json={"title": "Second"}, headers=headers)
+    response = client.get(
+        "/api/v1/tasks/", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    list_etag = response.headers["etag"]
+
+    client.delete(f"/api/v1/tasks/{other.json()['id']}", headers=headers)
+    response = client.get(
+        "/api/v1/tasks/", headers={**headers, "If-None-Match": list_etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+
+    # The tag belongs to the query, so another page or filter is not a 304
+    list_etag = response.headers["etag"]
+    for params in (
+        {"skip": 1},
+        {"limit": 1},
+        {"cursor": ""},
+        {"sort": "title"},
+        {"title_prefix": "C"},
+        {"total": True},
+    ):
+        response = client.get(
+            "/api/v1/tasks/",
+            params=params,
+            headers={**headers, "If-None-Match": list_etag},
+        )
+        assert response.status_code == 200, params
+    # Equivalent spellings of a query share it
+    params = {"created_after": "2025-01-01T00:00:00Z"}
+    list_etag = client.get("/api/v1/tasks/", params=params, headers=headers).headers[
+        "etag"
+    ]
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"created_after": "2025-01-01T02:00:00+02:00"},
+        headers={**headers, "If-None-Match": list_etag},
+    )
+    assert response.status_code == 304
+
+
+def test_patch_task(client, db_session):
+    # Setup test users and tasks
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="patch@example.com", password="password123")
+    )
+    other_user = user_repo.create_user(
+        UserCreate(email="patch-other@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    task_id = task_repo.create_user_task(
+        user.id, TaskCreate(title="Draft", description="Keep me")
+    ).id
+    other_id = task_repo.create_user_task(other_user.id, TaskCreate(title="No")).id
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "patch@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    etag = client.get(f"/api/v1/tasks/{task_id}", headers=headers).headers["etag"]
+
+    # Only sent fields change, in a single UPDATE that also claims the
+    # owner's sync sequence number
+    route = "/api/v1/tasks/{task_id}"
+    queries = http_request_db_queries.sum(method="PATCH", route=route)
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}",
+        json={"title": "Final"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 200
+    assert http_request_db_queries.sum(method="PATCH", route=route) == queries + 1
+    assert response.json()["title"] == "Final"
+    assert response.json()["description"] == "Keep me"
+    assert response.json()["version"] == 2
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+
+    # A concurrent editor holding the old ETag is refused
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}",
+        json={"title": "Clobber"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 412
+    assert response.json()["detail"]["code"] == "VERSION_MISMATCH"
+    assert response.headers["etag"] == new_etag
+
+    # Without If-Match the update is unconditional
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}", json={"description": None}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["description"] is None
+
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}", json={"title": None}, headers=headers
+    )
+    assert response.status_code == 422
+    response = client.patch(
+        f"/api/v1/tasks/{other_id}", json={"title": "Mine"}, headers=headers
+    )
+    assert response.status_code == 403
+    response = client.patch(
+        "/api/v1/tasks/non-existent-id", json={"title": "Ghost"}, headers=headers
+    )
+    assert response.status_code == 404
+
+    # Refused and missing tasks take no sequence number
+    seq = select(TaskOwner.seq).where(TaskOwner.owner_id == user.id)
+    before = db_session.scalar(seq)
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}",
+        json={"title": "Stale"},
+        headers={**headers, "If-Match": etag},
+    )
+    assert response.status_code == 412
+    response = client.patch(
+        f"/api/v1/tasks/{other_id[:-4]}beef", json={"title": "Gone"}, headers=headers
+    )
+    assert response.status_code == 404
+    db_session.expire_all()
+    assert db_session.scalar(seq) == before
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}", json={"title": "Again"}, headers=headers
+    )
+    assert db_session.scalar(seq) == before + 1
+
+    # An empty body changes nothing: no write, no new version, no event
+    db_session.expire_all()
+    before = db_session.scalar(seq)
+    etag = client.get(f"/api/v1/tasks/{task_id}", headers=headers).headers["etag"]
+    subscription = task_events.subscribe(user.id)
+    try:
+        response = client.patch(
+            f"/api/v1/tasks/{task_id}", json={}, headers={**headers, "If-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.json()["title"] == "Again"
+        assert response.headers["etag"] == etag
+        assert not subscription.events
+    finally:
+        task_events.unsubscribe(subscription)
+    db_session.expire_all()
+    assert db_session.scalar(seq) == before
+    # The precondition still applies
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}", json={}, headers={**headers, "If-Match": new_etag}
+    )
+    assert response.status_code == 412
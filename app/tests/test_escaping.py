@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.tasks.backfill import unescape_stored_text
+from app.tasks.escaping import escape_html, unescape_html
+from app.tasks.models import Task
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+RAW = """<b>Tom & "Jerry"</b> isn't &amp;"""
+ESCAPED = "&lt;b&gt;Tom &amp; &quot;Jerry&quot;&lt;/b&gt; isn&#x27;t &amp;amp;"
+
+
+def test_escape_html():
+    assert escape_html(RAW) == ESCAPED
+    assert unescape_html(ESCAPED) == RAW
+    assert escape_html("Plain text") == "Plain text"
+    # Only what escape_html produces is reversed
+    assert unescape_html("&copy; &amp;lt;") == "&copy; &lt;"
+
+
+def test_text_stored_raw_and_escaped_on_output(client, db_session, monkeypatch):
+    UserRepository(db_session).create_user(
+        UserCreate(email="escaping@example.com", password="password123")
+    )
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "escaping@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    raw_headers = {**headers, "X-Escape-HTML": "false"}
+
+    response = client.post(
+        "/api/v1/tasks/", json={"title": RAW, "description": RAW}, headers=headers
+    )
+    task_id = response.json()["id"]
+    assert response.json()["title"] == ESCAPED
+    assert "text_escaped" not in response.json()
+    stored = db_session.execute(select(Task.title, Task.text_escaped)).one()
+    assert tuple(stored) == (RAW, False)
+
+    # Sending back what was read does not escape it twice
+    response = client.put(
+        f"/api/v1/tasks/{task_id}", json={"title": RAW}, headers=headers
+    )
+    assert response.json()["title"] == ESCAPED
+
+    response = client.get(f"/api/v1/tasks/{task_id}", headers=raw_headers)
+    assert response.json()["title"] == RAW
+    assert response.headers["vary"] == "X-Escape-HTML"
+    monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+    for request_headers, title in ((headers, ESCAPED), (raw_headers, RAW)):
+        response = client.get("/api/v1/tasks/", headers=request_headers)
+        assert [task["title"] for task in response.json()] == [title]
+
+        # The export streams after the request's dependencies have finished
+        response = client.get("/api/v1/tasks/export", headers=request_headers)
+        assert json.loads(response.text)["title"] == title
+        response = client.get(
+            "/api/v1/tasks/export", params={"format": "csv"}, headers=request_headers
+        )
+        assert next(csv.DictReader(io.StringIO(response.text)))["title"] == title
+
+
+def test_backfill_escaped_rows(client, db_session):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="backfill@example.com", password="password123")
+    )
+    user_id = user.id
+    # Rows as written before text was stored raw
+    for i in range(5):
+        db_session.add(
+            Task(
+                title=f"{ESCAPED} {i}",
+                description=ESCAPED,
+                owner_id=user_id,
+                text_escaped=True,
+            )
+        )
+    db_session.commit()
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "backfill@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    raw_headers = {**headers, "X-Escape-HTML": "false"}
+
+    def responses():
+        return [
+            client.get("/api/v1/tasks/", headers=request_headers)
+            for request_headers in (headers, raw_headers)
+        ]
+
+    escaped, raw = responses()
+    assert escaped.json()[0]["title"] == f"{ESCAPED} 0"
+    assert raw.json()[0]["title"] == f"{RAW} 0"
+
+    # A partial update stores the untouched field raw as well
+    task_id = escaped.json()[0]["id"]
+    response = client.patch(
+        f"/api/v1/tasks/{task_id}", json={"title": "Renamed"}, headers=raw_headers
+    )
+    assert response.json()["description"] == RAW
+    escaped, raw = responses()
+
+    assert unescape_stored_text(db_session, batch_size=2) == 4
+    rows = db_session.execute(
+        select(Task.title, Task.description, Task.text_escaped).where(
+            Task.owner_id == user_id
+        )
+    ).all()
+    assert {(row.description, row.text_escaped) for row in rows} == {(RAW, False)}
+    # Nothing visible changed, not even the list's ETag
+    for before, after in zip((escaped, raw), responses()):
+        assert after.content == before.content
+        assert after.headers["etag"] == before.headers["etag"]
+    assert unescape_stored_text(db_session) == 0
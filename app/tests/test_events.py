@@ -0,0 +1,124 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from app.tasks.events import task_events
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+class EventStream:
+    """GET /api/v1/tasks/events driven as raw ASGI, chunk by chunk"""
+
+    def __init__(self, token: str, last_event_id: str = None):
+        headers = [(b"authorization", f"Bearer {token}".encode())]
+        if last_event_id is not None:
+            headers.append((b"last-event-id", last_event_id.encode()))
+        self.scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/tasks/events",
+            "raw_path": b"/api/v1/tasks/events",
+            "root_path": "",
+            "query_string": b"",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("test", 80),
+        }
+        self.chunks = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.task = asyncio.create_task(app(self.scope, self.receive, self.send))
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            await self.chunks.put(message["body"])
+
+    async def frames(self) -> list[dict]:
+        chunk = await asyncio.wait_for(self.chunks.get(), 5)
+        frames = []
+        for block in chunk.decode().split("\n\n"):
+            fields = {}
+            for line in block.splitlines():
+                name, _, value = line.partition(": ")
+                fields[name] = value
+            if fields:
+                frames.append(fields)
+        return frames
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.mark.asyncio
+async def test_task_events(client, db_session, monkeypatch):
+    UserRepository(db_session).create_user(
+        UserCreate(email="events@example.com", password="password123")
+    )
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as async_client:
+        response = await async_client.post(
+            "/api/v1/users/login",
+            json={"email": "events@example.com", "password": "password123"},
+        )
+        token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        stream = EventStream(token)
+        (position,) = await stream.frames()
+        # Gives a client that has seen nothing yet a point to resume from
+        assert position["id"] == task_events.event_id(task_events.seq)
+
+        response = await async_client.post(
+            "/api/v1/tasks/", json={"title": "<b>Streamed</b>"}, headers=headers
+        )
+        task = response.json()
+        (created,) = await stream.frames()
+        assert created["event"] == "created"
+        assert json.loads(created["data"]) == task
+        assert task["title"] == "&lt;b&gt;Streamed&lt;/b&gt;"
+
+        await async_client.patch(
+            f"/api/v1/tasks/{task['id']}", json={"title": "Renamed"}, headers=headers
+        )
+        (updated,) = await stream.frames()
+        assert updated["event"] == "updated"
+        assert json.loads(updated["data"])["title"] == "Renamed"
+        await async_client.delete(f"/api/v1/tasks/{task['id']}", headers=headers)
+        (deleted,) = await stream.frames()
+        assert deleted["event"] == "deleted"
+        assert json.loads(deleted["data"]) == {"id": task["id"]}
+        await stream.close()
+        assert task_events.subscribers == {}
+
+        # Resuming replays what came after the given event
+        stream = EventStream(token, last_event_id=created["id"])
+        assert [frame["event"] for frame in await stream.frames()] == [
+            "updated",
+            "deleted",
+        ]
+        # A subscriber that falls behind is told to resync, then carries on
+        monkeypatch.setattr(task_events, "buffer_size", 2)
+        for _ in range(3):
+            task_events.publish("deleted", task["owner_id"], task["id"])
+        (resync,) = await stream.frames()
+        assert resync["event"] == "resync"
+        task_events.publish("deleted", task["owner_id"], task["id"])
+        assert [frame["event"] for frame in await stream.frames()] == ["deleted"]
+        await stream.close()
+
+        # Ids from another process, or evicted from the log, cannot resume
+        stream = EventStream(token, last_event_id="00000000-1")
+        assert [frame["event"] for frame in await stream.frames()] == ["resync"]
+        await stream.close()
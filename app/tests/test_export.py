@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+from app.config import settings
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_export_tasks(client, db_session, monkeypatch):
+    # Setup test user and more tasks than one batch
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="export@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    created = [
+        task_repo.create_user_task(user.id, TaskCreate(title=f"Task {i}")).id
+        for i in range(5)
+    ]
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "export@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # NDJSON is the default format
+    response = client.get("/api/v1/tasks/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    tasks = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["id"] for task in tasks] == created
+    assert tasks[0]["title"] == "Task 0"
+
+    response = client.get(
+        "/api/v1/tasks/export", params={"format": "csv"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == created
+    assert rows[4]["title"] == "Task 4"
+
+    # Without auth
+    response = client.get("/api/v1/tasks/export")
+    assert response.status_code == 401
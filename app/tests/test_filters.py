@@ -0,0 +1,146 @@
+import itertools
+from datetime import datetime, timedelta, UTC
+
+from app.tasks.models import Task
+from app.tasks.schemas import TaskFilter, TaskSort
+from app.tasks.repository import TaskRepository, prefix_upper_bound
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_filter_and_sort_tasks(client, db_session):
+    # Setup test user and tasks a day apart
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="filters@example.com", password="password123")
+    )
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    titles = ["Buy milk", "Call bank", "Buy bread", "Walk dog"]
+    for day, title in enumerate(titles):
+        db_session.add(
+            Task(title=title, owner_id=user.id, created_at=start + timedelta(days=day))
+        )
+    db_session.commit()
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "filters@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    def titles_for(**params):
+        response = client.get("/api/v1/tasks/", params=params, headers=headers)
+        assert response.status_code == 200
+        return [task["title"] for task in response.json()]
+
+    assert titles_for() == titles
+    assert titles_for(sort="-created_at") == titles[::-1]
+    assert titles_for(sort="title") == sorted(titles)
+    assert titles_for(title_prefix="Buy", sort="-title") == ["Buy milk", "Buy bread"]
+    assert titles_for(
+        created_after="2025-01-01T12:00:00Z", created_before="2025-01-04"
+    ) == ["Call bank", "Buy bread"]
+    # Offsets are interpreted in other time zones
+    assert titles_for(created_after="2025-01-03T01:00:00+02:00") == titles[2:]
+
+    # Cursors follow the requested order
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            "/api/v1/tasks/",
+            params={"sort": "-title", "limit": 3, "cursor": cursor},
+            headers=headers,
+        )
+        seen += [task["title"] for task in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+    assert seen == sorted(titles, reverse=True)
+
+    # A cursor cannot be replayed against another order
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"sort": "-title", "limit": 1, "cursor": ""},
+        headers=headers,
+    )
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"sort": "title", "cursor": response.headers["x-next-cursor"]},
+        headers=headers,
+    )
+    assert response.status_code == 400
+
+    response = client.get(
+        "/api/v1/tasks/",
+        params={"created_after": "2025-01-03", "created_before": "2025-01-02"},
+        headers=headers,
+    )
+    assert response.status_code == 422
+    response = client.get("/api/v1/tasks/", params={"sort": "owner"}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_title_prefix_beyond_ascii(db_session):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="prefix@example.com", password="password123")
+    )
+    titles = [
+        "Cafe",
+        "Café",
+        "Café crème",
+        "Café\U0010ffff",
+        "Caféx",
+        "Cafë",
+        "Caf\U0010ffff end",
+        "Cag",
+        "日本語",
+        "日本酒",
+    ]
+    for title in titles:
+        db_session.add(Task(title=title, owner_id=user.id))
+    db_session.commit()
+    repo = TaskRepository(db_session)
+
+    def titles_for(prefix):
+        filters = TaskFilter(title_prefix=prefix, sort=TaskSort.title)
+        return [row.title for row in repo.get_user_tasks(user.id, filters=filters)]
+
+    assert titles_for("Café") == ["Café", "Café crème", "Caféx", "Café\U0010ffff"]
+    assert titles_for("Caf\U0010ffff") == ["Caf\U0010ffff end"]
+    assert titles_for("日本") == ["日本語", "日本酒"]
+    assert titles_for("Cafe") == ["Cafe"]
+
+    assert prefix_upper_bound("ab") == "ac"
+    assert prefix_upper_bound("a\U0010ffff") == "b"
+    assert prefix_upper_bound("\ud7ff") == "\ue000"
+    assert prefix_upper_bound("\U0010ffff") is None
+
+
+def test_task_list_queries_use_indexes(db_session):
+    """Every filter/sort combination is an index seek, never a table scan"""
+    connection = db_session.connection()
+    dialect = connection.dialect
+    repo = TaskRepository(db_session)
+    day = datetime(2025, 1, 1, tzinfo=UTC)
+
+    for sort, created_after, created_before, title_prefix, paged in itertools.product(
+        TaskSort, [None, day], [None, day + timedelta(days=1)], [None, "Buy"], [0, 1]
+    ):
+        filters = TaskFilter(
+            created_after=created_after,
+            created_before=created_before,
+            title_prefix=title_prefix,
+            sort=sort,
+        )
+        after = None
+        if paged:
+            after = ("Buy", "id") if sort.field == "title" else (day, "id")
+        statement = repo.list_statement("owner", filters, after).limit(20)
+        sql = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+
+        plan = [
+            row[3]
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+            if "tasks" in row[3]
+        ]
+        assert plan, filters
+        for step in plan:
+            assert step.startswith("SEARCH tasks USING "), (filters, paged, step)
@@ -0,0 +1,43 @@
+import uuid
+
+from sqlalchemy import text
+
+from app.ids import uuid7
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_uuid7_is_time_ordered():
+    ids = [uuid7() for _ in range(1000)]
+    assert all(value.version == 7 for value in ids)
+    assert len(set(ids)) == len(ids)
+    # Ordered to the millisecond; within one the random bits decide
+    milliseconds = [value.int >> 80 for value in ids]
+    assert milliseconds == sorted(milliseconds)
+
+
+def test_keys_stored_as_binary(client, db_session):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="ids@example.com", password="password123")
+    )
+    assert uuid.UUID(user.id).version == 7
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "ids@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    response = client.post("/api/v1/tasks/", json={"title": "Task"}, headers=headers)
+    task_id = response.json()["id"]
+    assert str(uuid.UUID(task_id)) == task_id
+    assert response.json()["owner_id"] == user.id
+    stored = db_session.execute(
+        text("SELECT typeof(id), length(id), length(owner_id) FROM tasks")
+    ).one()
+    assert tuple(stored) == ("blob", 16, 16)
+
+    response = client.get(f"/api/v1/tasks/{task_id.upper()}", headers=headers)
+    assert response.json()["id"] == task_id
+    for invalid in ("not-a-uuid", uuid.UUID(int=0)):
+        response = client.get(f"/api/v1/tasks/{invalid}", headers=headers)
+        assert response.status_code == 404
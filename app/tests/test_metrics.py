@@ -0,0 +1,65 @@
+from app.instrumentation import http_request_db_queries, http_requests
+from app.metrics import Histogram, MetricsRegistry
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_render_histogram():
+    registry = MetricsRegistry()
+    latency = Histogram(
+        "latency_seconds",
+        "Request latency",
+        labels=("route",),
+        buckets=(0.1, 1.0),
+        registry=registry,
+    )
+    latency.observe(0.5, route='/a"b')
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Request latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.1"} 0',
+        'latency_seconds_bucket{route="/a\\"b",le="1.0"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 1',
+        'latency_seconds_sum{route="/a\\"b"} 0.5',
+        'latency_seconds_count{route="/a\\"b"} 1',
+    ]
+
+
+def test_request_metrics(client, db_session):
+    # Setup test user and task
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="metrics@example.com", password="password123")
+    )
+    task = TaskRepository(db_session).create_user_task(
+        user.id, TaskCreate(title="Observed")
+    )
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "metrics@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    route = "/api/v1/tasks/{task_id}"
+    requests = http_requests.value(method="GET", route=route, status=200)
+    queries = http_request_db_queries.sum(method="GET", route=route)
+    assert client.get(f"/api/v1/tasks/{task.id}", headers=headers).status_code == 200
+    assert client.get("/no-such-path").status_code == 404
+
+    # Labelled by path template, with the request's statements attributed
+    assert http_requests.value(method="GET", route=route, status=200) == requests + 1
+    assert http_request_db_queries.sum(method="GET", route=route) > queries
+    assert http_requests.value(method="GET", route="unmatched", status=404) >= 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert (
+        'http_requests_total{method="GET",route="/api/v1/tasks/{task_id}",status="200"}'
+        in response.text
+    )
+    assert 'http_requests_in_progress{method="GET"} 1' in response.text
@@ -0,0 +1,75 @@
+from app.config import settings
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_get_tasks_with_cursor(client, db_session):
+    # Setup test user and tasks
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="pages@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    created = [
+        task_repo.create_user_task(user.id, TaskCreate(title=f"Task {i}")).id
+        for i in range(5)
+    ]
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "pages@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # Walk every page; an empty cursor starts from the beginning
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            "/api/v1/tasks/", params={"cursor": cursor, "limit": 2}, headers=headers
+        )
+        assert response.status_code == 200
+        seen.extend(task["id"] for task in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+
+    assert seen == created
+
+    # Malformed cursor
+    response = client.get(
+        "/api/v1/tasks/", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_CURSOR"
+
+
+def test_fast_serialization_matches_response_model(client, db_session, monkeypatch):
+    # Setup test user and tasks
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="fast@example.com", password="password123")
+    )
+    task_repo = TaskRepository(db_session)
+    task_repo.create_user_task(user.id, TaskCreate(title="Café ☕"))
+    for i in range(3):
+        task_repo.create_user_task(
+            user.id, TaskCreate(title=f"Task {i}", description=f"Details {i}")
+        )
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "fast@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    for params in ({}, {"limit": 2, "skip": 1}, {"cursor": "", "limit": 2}):
+        standard = client.get("/api/v1/tasks/", params=params, headers=headers)
+        monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+        fast = client.get("/api/v1/tasks/", params=params, headers=headers)
+        monkeypatch.setattr(settings, "FAST_SERIALIZATION", False)
+
+        assert fast.status_code == standard.status_code == 200
+        assert fast.content == standard.content
+        assert fast.headers["content-type"] == standard.headers["content-type"]
+        for header in ("etag", "last-modified", "x-next-cursor"):
+            assert fast.headers.get(header) == standard.headers.get(header)
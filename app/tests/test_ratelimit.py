@@ -0,0 +1,108 @@
+import pytest
+
+from app import ratelimit
+from app.config import settings
+from app.ratelimit import InMemoryRateLimitStore, RateLimit, rate_limit_store
+from app.auth.cache import principal_cache
+from app.auth import service
+from app.auth.service import create_access_token
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+@pytest.fixture
+def rate_limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(ratelimit, "auth_limit", RateLimit("auth", 1, 3))
+    monkeypatch.setattr(ratelimit, "user_limit", RateLimit("user", 1, 5))
+    rate_limit_store.clear()
+    yield
+    rate_limit_store.clear()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now)
+    store = InMemoryRateLimitStore(max_keys=4)
+    limit = RateLimit("test", per_minute=30, burst=2)
+
+    assert await store.take("a", limit) == 0
+    assert await store.take("a", limit) == 0
+    assert await store.take("a", limit) == pytest.approx(2)
+    # Other keys have their own bucket
+    assert await store.take("b", limit) == 0
+
+    now += 1
+    assert await store.take("a", limit) == pytest.approx(1)
+    now += 1
+    assert await store.take("a", limit) == 0
+
+    # Refilled buckets are dropped first when the store is full
+    now += 10
+    await store.take("c", limit)
+    await store.take("d", limit)
+    await store.take("e", limit)
+    assert set(store.buckets) == {"c", "d", "e"}
+
+
+def test_rate_limited_requests(client, db_session, rate_limits):
+    UserRepository(db_session).create_user(
+        UserCreate(email="limited@example.com", password="password123")
+    )
+    credentials = {"email": "limited@example.com", "password": "password123"}
+
+    # Logins are limited per client address
+    responses = [client.post("/api/v1/users/login", json=credentials) for _ in range(4)]
+    assert [response.status_code for response in responses] == [200, 200, 200, 429]
+    assert 0 < int(responses[-1].headers["retry-after"]) <= 60
+    assert responses[-1].json()["detail"]["code"] == "RATE_LIMITED"
+    headers = {"Authorization": f"Bearer {responses[0].json()['access_token']}"}
+
+    # Task routes are limited per user, from the first request on
+    statuses = [
+        client.get("/api/v1/tasks/", headers=headers).status_code for _ in range(6)
+    ]
+    assert statuses == [200] * 5 + [429]
+    # Unlimited paths and other limits are unaffected
+    assert client.get("/health").status_code == 200
+    assert client.post("/api/v1/users/login", json=credentials).status_code == 429
+
+
+def test_users_limited_apart_without_principal_cache(
+    client, db_session, rate_limits, monkeypatch
+):
+    monkeypatch.setattr(principal_cache, "ttl", 0)
+    principal_cache.clear()
+    headers = []
+    for email in ("nat-a@example.com", "nat-b@example.com"):
+        UserRepository(db_session).create_user(
+            UserCreate(email=email, password="password123")
+        )
+        token = create_access_token({"sub": email})
+        headers.append({"Authorization": f"Bearer {token}"})
+
+    # The limiter's verified claims are reused by get_current_user
+    decoded = []
+    decode = service.jwt.decode
+    monkeypatch.setattr(
+        service.jwt,
+        "decode",
+        lambda *args, **kw: decoded.append(1) or decode(*args, **kw),
+    )
+    assert client.get("/api/v1/tasks/", headers=headers[1]).status_code == 200
+    assert len(decoded) == 1
+    ratelimit.rate_limit_store.clear()
+
+    # Same client address, but each user draws from a bucket of their own
+    for user_headers in headers:
+        statuses = [
+            client.get("/api/v1/tasks/", headers=user_headers).status_code
+            for _ in range(6)
+        ]
+        assert statuses == [200] * 5 + [429]
+    assert principal_cache.peek(headers[0]["Authorization"][7:]) is None
+
+    # A token that does not verify counts against the address
+    response = client.get("/api/v1/tasks/", headers={"Authorization": "Bearer forged"})
+    assert response.status_code == 401
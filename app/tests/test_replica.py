@@ -0,0 +1,62 @@
+import sqlite3
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.main import app
+from app.auth.cache import principal_cache
+from app.database import Base, create_db_engine, primary_pins
+
+
+def test_read_replica_routing(monkeypatch, tmp_path):
+    primary_path, replica_path = tmp_path / "primary.db", tmp_path / "replica.db"
+    primary = create_db_engine(f"sqlite:///{primary_path}", name="test_primary")
+    replica = create_db_engine(f"sqlite:///{replica_path}", name="test_replica")
+    Base.metadata.create_all(bind=primary)
+
+    def replicate():
+        with sqlite3.connect(primary_path) as source:
+            with sqlite3.connect(replica_path) as target:
+                source.backup(target)
+
+    replicate()
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=primary))
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=replica))
+    monkeypatch.setattr(app, "dependency_overrides", {})
+    principal_cache.clear()
+    primary_pins.clear()
+    client = TestClient(app)
+
+    client.post(
+        "/api/v1/users/register",
+        json={"email": "replica@example.com", "password": "password123"},
+    )
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "replica@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # The replica has not seen the new user; the principal comes from the primary
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+
+    # After a write the user reads from the primary and sees it
+    response = client.post("/api/v1/tasks/", json={"title": "Fresh"}, headers=headers)
+    assert response.status_code == 201
+    assert primary_pins.is_pinned("replica@example.com")
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["title"] for task in response.json()] == ["Fresh"]
+
+    # Once the pin lapses reads go to the (lagging) replica
+    primary_pins.clear()
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert response.json() == []
+    replicate()
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["title"] for task in response.json()] == ["Fresh"]
+    assert not primary_pins.is_pinned("replica@example.com")
+
+    primary.dispose()
+    replica.dispose()
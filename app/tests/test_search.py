@@ -0,0 +1,87 @@
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.tasks.search import InMemorySearch
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def test_search_tasks(client, db_session):
+    # Setup test users and tasks
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="search@example.com", password="password123")
+    )
+    other_user = user_repo.create_user(
+        UserCreate(email="search-other@example.com", password="password123")
+    )
+    user_id, other_user_id = user.id, other_user.id
+    task_repo = TaskRepository(db_session)
+    milk = task_repo.create_user_task(
+        user.id, TaskCreate(title="Milk", description="Buy milk and more milk")
+    ).id
+    bread = task_repo.create_user_task(
+        user.id, TaskCreate(title="Groceries", description="bread, milk")
+    ).id
+    task_repo.create_user_task(user.id, TaskCreate(title="Call the bank"))
+    task_repo.create_user_task(other_user.id, TaskCreate(title="Milk for others"))
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "search@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # Prefix matches, best ranked first, only the user's own tasks
+    response = client.get("/api/v1/tasks/search", params={"q": "mil"}, headers=headers)
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [milk, bread]
+
+    # Every word has to match
+    response = client.get(
+        "/api/v1/tasks/search", params={"q": "bre MILK"}, headers=headers
+    )
+    assert [task["id"] for task in response.json()] == [bread]
+
+    # Cursor pagination
+    response = client.get(
+        "/api/v1/tasks/search", params={"q": "milk", "limit": 1}, headers=headers
+    )
+    assert [task["id"] for task in response.json()] == [milk]
+    response = client.get(
+        "/api/v1/tasks/search",
+        params={"q": "milk", "limit": 1, "cursor": response.headers["x-next-cursor"]},
+        headers=headers,
+    )
+    assert [task["id"] for task in response.json()] == [bread]
+    assert "x-next-cursor" not in response.headers
+
+    # The index follows updates and deletes
+    client.patch(
+        f"/api/v1/tasks/{bread}", json={"description": "bread only"}, headers=headers
+    )
+    client.delete(f"/api/v1/tasks/{milk}", headers=headers)
+    response = client.get("/api/v1/tasks/search", params={"q": "mil"}, headers=headers)
+    assert response.json() == []
+    response = client.get("/api/v1/tasks/search", params={"q": "brea"}, headers=headers)
+    assert [task["id"] for task in response.json()] == [bread]
+
+    response = client.get(
+        "/api/v1/tasks/search", params={"q": "milk", "cursor": "bogus"}, headers=headers
+    )
+    assert response.status_code == 400
+
+    # A query without words matches nothing rather than failing
+    for q in ("!!!", "--"):
+        response = client.get("/api/v1/tasks/search", params={"q": q}, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == []
+
+    # The fallback index ranks and pages the same way
+    in_memory = InMemorySearch()
+    hits = in_memory.search(db_session, other_user_id, "milk fo")
+    assert [task.title for task, _ in hits] == ["Milk for others"]
+    hits = in_memory.search(db_session, user_id, "brea")
+    assert [task.id for task, _ in hits] == [bread]
+    assert in_memory.search(db_session, user_id, "!!!") == []
+    in_memory.remove([bread])
+    assert in_memory.search(db_session, user_id, "brea") == []
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.tasks.models import Task, TaskTombstone
+from app.tasks.purge import purge_deleted
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def login(client, email):
+    response = client.post(
+        "/api/v1/users/login", json={"email": email, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_soft_delete_and_purge(client, db_session, monkeypatch):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="softdelete@example.com", password="password123")
+    )
+    repo = TaskRepository(db_session)
+    kept, hard, soft, bulk = repo.create_user_tasks(
+        user.id, [TaskCreate(title=f"Purge {i}") for i in range(4)]
+    )
+    headers = login(client, "softdelete@example.com")
+    token = client.get("/api/v1/tasks/changes", headers=headers).json()["token"]
+
+    client.delete(f"/api/v1/tasks/{hard.id}", headers=headers)
+    monkeypatch.setattr(settings, "TASK_SOFT_DELETE", True)
+    assert client.delete(f"/api/v1/tasks/{soft.id}", headers=headers).status_code == 204
+    client.request(
+        "DELETE", "/api/v1/tasks/bulk", json={"ids": [bulk.id]}, headers=headers
+    )
+    # Still stored, but gone from every read
+    deleted_at = select(Task.deleted_at).where(Task.id.in_([soft.id, bulk.id]))
+    assert all(db_session.scalars(deleted_at))
+    assert client.get(f"/api/v1/tasks/{soft.id}", headers=headers).status_code == 404
+    assert client.delete(f"/api/v1/tasks/{soft.id}", headers=headers).status_code == 404
+    response = client.patch(
+        f"/api/v1/tasks/{soft.id}", json={"title": "Back"}, headers=headers
+    )
+    assert response.status_code == 404
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert [task["id"] for task in response.json()] == [kept.id]
+    response = client.get(
+        "/api/v1/tasks/search", params={"q": "purge"}, headers=headers
+    )
+    assert [task["id"] for task in response.json()] == [kept.id]
+    export = client.get("/api/v1/tasks/export", headers=headers).text
+    assert kept.id in export and soft.id not in export
+    response = client.post(
+        "/api/v1/tasks/batch-get", json={"ids": [kept.id, soft.id]}, headers=headers
+    )
+    assert response.json()["not_found"] == [soft.id]
+    changes = client.get(
+        "/api/v1/tasks/changes", params={"since": token}, headers=headers
+    ).json()
+    assert changes["deleted"] == [hard.id, soft.id, bulk.id]
+
+    # Nothing is old enough yet
+    assert purge_deleted(db_session, timedelta(hours=1)).rows == 0
+    report = purge_deleted(db_session, timedelta(0), batch_size=2)
+    assert (report.rows, report.chunks) == (3, 2)
+    assert report.lock_wait >= 0 and report.rows_per_second > 0
+    assert db_session.scalar(select(func.count()).select_from(TaskTombstone)) == 0
+    assert db_session.scalar(select(func.count()).where(Task.owner_id == user.id)) == 1
+
+    # The purge forgot deletions an old token has not seen, a newer one is fine
+    response = client.get(
+        "/api/v1/tasks/changes", params={"since": token}, headers=headers
+    )
+    assert response.status_code == 410
+    assert response.json()["detail"]["code"] == "SYNC_TOKEN_EXPIRED"
+    response = client.get(
+        "/api/v1/tasks/changes", params={"since": changes["token"]}, headers=headers
+    )
+    assert response.json()["changed"] == [] and response.json()["deleted"] == []
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.tasks.models import Task, utc_day
+from app.tasks.reconcile import reconcile_counts
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def login(client, email):
+    response = client.post(
+        "/api/v1/users/login", json={"email": email, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def stats(client, headers, **params):
+    response = client.get("/api/v1/tasks/stats", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_task_counts(client, db_session, monkeypatch):
+    user = UserRepository(db_session).create_user(
+        UserCreate(email="stats@example.com", password="password123")
+    )
+    headers = login(client, "stats@example.com")
+    assert stats(client, headers, days=1, weeks=1)["total"] == 0
+
+    ids = [
+        client.post(
+            "/api/v1/tasks/", json={"title": f"Stat {i}"}, headers=headers
+        ).json()["id"]
+        for i in range(2)
+    ]
+    response = client.post(
+        "/api/v1/tasks/bulk",
+        json={"items": [{"title": f"Bulk {i}"} for i in range(4)]},
+        headers=headers,
+    )
+    ids += [result["id"] for result in response.json()["results"]]
+    client.delete(f"/api/v1/tasks/{ids[0]}", headers=headers)
+    monkeypatch.setattr(settings, "TASK_SOFT_DELETE", True)
+    client.request(
+        "DELETE", "/api/v1/tasks/bulk", json={"ids": ids[1:3]}, headers=headers
+    )
+
+    today = utc_day(datetime.now(UTC))
+    body = stats(client, headers, days=3, weeks=2)
+    assert body["total"] == 3
+    assert body["per_day"] == [
+        {"start": str(today - timedelta(days=n)), "count": 3 if n == 0 else 0}
+        for n in (2, 1, 0)
+    ]
+    this_week = today - timedelta(days=today.weekday())
+    assert body["per_week"] == [
+        {"start": str(this_week - timedelta(weeks=1)), "count": 0},
+        {"start": str(this_week), "count": 3},
+    ]
+
+    response = client.get("/api/v1/tasks/", params={"total": True}, headers=headers)
+    assert response.headers["x-total-count"] == "3"
+    response = client.get(
+        "/api/v1/tasks/", params={"total": True, "title_prefix": "B"}, headers=headers
+    )
+    assert "x-total-count" not in response.headers
+    response = client.get("/api/v1/tasks/", headers=headers)
+    assert "x-total-count" not in response.headers
+
+    # Rows written around the repository are not counted until reconciled
+    yesterday = datetime.now(UTC) - timedelta(days=1)
+    db_session.execute(
+        insert(Task),
+        [{"owner_id": user.id, "title": "Imported", "created_at": yesterday}] * 2,
+    )
+    db_session.commit()
+    TaskRepository(db_session).create_user_task(user.id, TaskCreate(title="Counted"))
+    assert stats(client, headers)["total"] == 4
+
+    report = reconcile_counts(db_session, batch_size=1)
+    assert report.repaired == 1 and report.rows == 2
+    body = stats(client, headers, days=2)
+    assert body["total"] == 6
+    assert [day["count"] for day in body["per_day"]] == [2, 4]
+    assert reconcile_counts(db_session).repaired == 0
@@ -0,0 +1,98 @@
+from sqlalchemy import insert, text
+
+from app.tasks.models import Task
+from app.tasks.schemas import TaskCreate
+from app.tasks.repository import TaskRepository
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+def login(client, email):
+    response = client.post(
+        "/api/v1/users/login", json={"email": email, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def sync(client, headers, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/v1/tasks/changes", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_incremental_sync(client, db_session):
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="sync@example.com", password="password123")
+    )
+    other = user_repo.create_user(
+        UserCreate(email="sync2@example.com", password="password123")
+    )
+    # Written around the repository, as tasks older than the sequence were
+    db_session.execute(insert(Task), [{"owner_id": user.id, "title": "Legacy"}])
+    db_session.commit()
+    repo = TaskRepository(db_session)
+    first, second, third = repo.create_user_tasks(
+        user.id, [TaskCreate(title=f"Task {i}") for i in range(3)]
+    )
+    repo.create_user_task(other.id, TaskCreate(title="Not yours"))
+    headers = login(client, "sync@example.com")
+
+    # A first sync has every task, and no deletions
+    full = sync(client, headers)
+    assert [task["title"] for task in full["changed"]] == [
+        "Legacy",
+        "Task 0",
+        "Task 1",
+        "Task 2",
+    ]
+    assert full["deleted"] == [] and not full["has_more"]
+    # Nothing changed, nothing to send, same token back
+    assert sync(client, headers, full["token"]) == {**full, "changed": []}
+
+    client.patch(
+        f"/api/v1/tasks/{first.id}", json={"title": "<i>Renamed</i>"}, headers=headers
+    )
+    client.delete(f"/api/v1/tasks/{second.id}", headers=headers)
+    client.request(
+        "DELETE", "/api/v1/tasks/bulk", json={"ids": [third.id]}, headers=headers
+    )
+    client.post("/api/v1/tasks/", json={"title": "New"}, headers=headers)
+    changes = sync(client, headers, full["token"])
+    assert [task["title"] for task in changes["changed"]] == [
+        "&lt;i&gt;Renamed&lt;/i&gt;",
+        "New",
+    ]
+    assert changes["deleted"] == [second.id, third.id]
+
+    # Paging through the same changes two at a time
+    token, pages = full["token"], []
+    while True:
+        page = sync(client, headers, token, limit=2)
+        pages.append(page["deleted"] + [task["id"] for task in page["changed"]])
+        token = page["token"]
+        if not page["has_more"]:
+            break
+    assert [len(page) for page in pages] == [2, 2]
+    assert sorted(sum(pages, [])) == sorted(
+        changes["deleted"] + [task["id"] for task in changes["changed"]]
+    )
+    assert sync(client, headers, token)["changed"] == []
+
+    response = client.get(
+        "/api/v1/tasks/changes", params={"since": "bm9wZQ"}, headers=headers
+    )
+    assert response.status_code == 400
+
+
+def test_changes_read_from_owner_seq_index(db_session):
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM tasks "
+            "WHERE owner_id = :owner AND (seq, id) > (:seq, :id) ORDER BY seq, id"
+        ),
+        {"owner": b"\0" * 16, "seq": 0, "id": b"\0" * 16},
+    ).all()
+    assert "ix_tasks_owner_id_seq_id" in " ".join(row[-1] for row in plan)
@@ -1,5 +1,9 @@
+from sqlalchemy import text
+
 from app.auth.schemas import UserCreate
 from app.auth.repository import UserRepository
+from app.auth.cache import principal_cache_hits
+from app.auth.utils import password_hasher, password_hash_seconds
 
 
 def test_register_user(client, db_session):
@@ -38,6 +42,36 @@ def test_register_user(client, db_session):
     assert response.status_code == 422
 
 
+def test_register_email_taken_in_any_case(client, db_session):
+    # Inserted behind the route's back, as a concurrent registration would be
+    UserRepository(db_session).create_user(
+        UserCreate(email="Mixed.Case@example.com", password="password123")
+    )
+    response = client.post(
+        "/api/v1/users/register",
+        json={"email": "mixed.case@example.com", "password": "password123"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "EMAIL_EXISTS"
+
+    response = client.post(
+        "/api/v1/users/login",
+        json={"email": "MIXED.CASE@example.com", "password": "password123"},
+    )
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.json()["email"] == "Mixed.Case@example.com"
+
+    plan = db_session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM users "
+            "WHERE lower(email) = lower('mixed.case@example.com')"
+        )
+    ).all()
+    assert "USING INDEX ix_users_email" in plan[0][-1]
+
+
 def test_login_user(client, db_session):
     # Setup test user
     user_repo = UserRepository(db_session)
@@ -101,3 +135,56 @@ def test_get_current_user(client, db_session):
         "/api/v1/users/me", headers={"Authorization": "Bearer invalidtoken"}
     )
     assert response.status_code == 401
+
+
+def test_password_hashing_pool_saturated(client, monkeypatch):
+    hashes_before = password_hash_seconds.count(operation="hash")
+    response = client.post(
+        "/api/v1/users/register",
+        json={"email": "pool@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    assert password_hash_seconds.count(operation="hash") == hashes_before + 1
+
+    # A full backlog is rejected up front instead of queuing
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+    response = client.post(
+        "/api/v1/users/login",
+        json={"email": "pool@example.com", "password": "password123"},
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(password_hasher.retry_after)
+
+
+def test_principal_cache(client, db_session):
+    user_repo = UserRepository(db_session)
+    user = user_repo.create_user(
+        UserCreate(email="cached@example.com", password="password123")
+    )
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "cached@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    # The first request loads the user, the second is served from the cache
+    hits = principal_cache_hits.value()
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    assert principal_cache_hits.value() == hits + 1
+
+    # Changing the email drops the cached principal, and the token's subject
+    # no longer resolves
+    user_repo.update_user_email(user_repo.get_user(user.id), "renamed@example.com")
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+
+    login_response = client.post(
+        "/api/v1/users/login",
+        json={"email": "renamed@example.com", "password": "password123"},
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    # Deactivated users are rejected even while their token is still valid
+    user_repo.deactivate_user(user_repo.get_user(user.id))
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
@@ -0,0 +1,54 @@
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.main import app
+from app.tasks.writebehind import task_write_commits, task_writer
+from app.auth.repository import UserRepository
+from app.auth.schemas import UserCreate
+
+
+@pytest.mark.asyncio
+async def test_write_behind_group_commit(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "WRITE_BEHIND_ENABLED", True)
+    monkeypatch.setattr(task_writer, "max_delay", 0.01)
+    UserRepository(db_session).create_user(
+        UserCreate(email="writebehind@example.com", password="password123")
+    )
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as async_client:
+        response = await async_client.post(
+            "/api/v1/users/login",
+            json={"email": "writebehind@example.com", "password": "password123"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        # Loads the principal into the cache before the concurrent requests
+        await async_client.get("/api/v1/users/me", headers=headers)
+
+        commits = task_write_commits.value()
+        responses = await asyncio.gather(
+            *(
+                async_client.post(
+                    "/api/v1/tasks/", json={"title": f"Task {i}"}, headers=headers
+                )
+                for i in range(20)
+            )
+        )
+        assert [response.status_code for response in responses] == [201] * 20
+        assert task_write_commits.value() - commits < 5
+        assert task_writer.pending == 0
+
+        created = {response.json()["id"]: response.json() for response in responses}
+        assert all(uuid.UUID(task_id).version == 7 for task_id in created)
+        # Committed by the time each request returned
+        response = await async_client.get(
+            "/api/v1/tasks/", params={"limit": 100}, headers=headers
+        )
+        assert {task["id"]: task for task in response.json()} == created
+
+        await task_writer.stop()
@@ -0,0 +1,197 @@
+"""Concurrency benchmark for the database layer.
+
+Seeds a SQLite file with one user owning ``--tasks`` tasks, then drives the
+ASGI app in-process with ``--clients`` parallel clients requesting a deep page
+of ``GET /api/v1/tasks/`` (an offset scan of a few milliseconds). A prober
+hits ``/health`` alongside to show how long the event loop stalls.
+
+Each mode runs in its own interpreter because the engines are configured
+from settings at import time:
+
+- ``sync``: DATABASE_ASYNC=false, the sync Session used on the event loop
+- ``async``: DATABASE_ASYNC=true, AsyncEngine/AsyncSession on aiosqlite
+
+    python -m benchmarks.bench_async_db --clients 200 --duration 15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import configure_environment, percentile
+
+MODES = ("sync", "async")
+EMAIL = "bench@example.com"
+PASSWORD = "benchpassword"
+
+
+def seed(database_url: str, task_count: int):
+    configure_environment(database_url, DATABASE_ASYNC="false")
+    from sqlalchemy import insert
+
+    from app.auth.repository import UserRepository
+    from app.auth.schemas import UserCreate
+    from app.database import Base, SessionLocal, engine
+    from app.tasks.models import Task
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        user = UserRepository(db).create_user(
+            UserCreate(email=EMAIL, password=PASSWORD)
+        )
+        for start in range(0, task_count, 10_000):
+            rows = [
+                {"title": f"Task {i}", "description": "benchmark", "owner_id": user.id}
+                for i in range(start, min(start + 10_000, task_count))
+            ]
+            db.execute(insert(Task), rows)
+        db.commit()
+
+
+def summarize(mode: str, state: dict) -> dict:
+    now = time.perf_counter()
+    completed = list(state["latencies"])
+    stalled = [now - begun for begun in list(state["in_flight"].values())]
+    latencies = completed + stalled
+    elapsed = now - state["started"]
+    return {
+        "mode": mode,
+        "requests": len(completed),
+        "errors": len(state["errors"]),
+        "stalled": len(stalled),
+        "rps": len(completed) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "health_p99_ms": percentile(state["health"] or [elapsed], 99) * 1000,
+    }
+
+
+def report(result: dict):
+    print(json.dumps(result), flush=True)
+    # Skip interpreter shutdown: stalled requests may still hold pool
+    # connections and aiosqlite worker threads.
+    os._exit(0)
+
+
+async def drive(mode: str, clients: int, duration: float, skip: int):
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+    response = await client.post(
+        "/api/v1/users/login", json={"email": EMAIL, "password": PASSWORD}
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    params = {"skip": skip, "limit": 10}
+    state = {
+        "started": time.perf_counter(),
+        "latencies": [],
+        "health": [],
+        "errors": [],
+        "in_flight": {},
+    }
+    deadline = state["started"] + duration
+
+    # A stalled event loop cannot time itself out, so a watchdog thread
+    # reports whatever finished, counting requests still in flight at their
+    # age so far.
+    watchdog = threading.Timer(duration * 2, lambda: report(summarize(mode, state)))
+    watchdog.daemon = True
+    watchdog.start()
+
+    async def worker(number: int):
+        while time.perf_counter() < deadline:
+            state["in_flight"][number] = time.perf_counter()
+            response = await client.get(
+                "/api/v1/tasks/", params=params, headers=headers
+            )
+            begun = state["in_flight"].pop(number)
+            state["latencies"].append(time.perf_counter() - begun)
+            if response.status_code != 200:
+                state["errors"].append(response.status_code)
+
+    async def prober():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await client.get("/health")
+            state["health"].append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(prober(), *(worker(n) for n in range(clients)))
+    report(summarize(mode, state))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--database-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        configure_environment(
+            args.database_url,
+            DATABASE_ASYNC="true" if args.run_mode == "async" else "false",
+        )
+        asyncio.run(
+            drive(args.run_mode, args.clients, args.duration, skip=args.tasks - 10)
+        )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/bench.db"
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from benchmarks.bench_async_db import seed;"
+                f" seed({database_url!r}, {args.tasks})",
+            ],
+            check=True,
+        )
+        print(
+            f"{'mode':<12}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'/health p99':>14}{'errors':>8}{'stalled':>9}"
+        )
+        for mode in args.modes:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_async_db",
+                    "--run-mode",
+                    mode,
+                    "--database-url",
+                    database_url,
+                    "--clients",
+                    str(args.clients),
+                    "--duration",
+                    str(args.duration),
+                    "--tasks",
+                    str(args.tasks),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{mode:<12}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}"
+                f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+                f"{result['health_p99_ms']:>14.1f}{result['errors']:>8}{result['stalled']:>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Task ingest throughput: looping POST /tasks/ vs POST /tasks/bulk.
+
+Drives the ASGI app in-process against a fresh SQLite file and reports tasks
+per second for ``--tasks`` single creates and for the same number of tasks
+sent in batches of ``--batch-size``.
+
+    python -m benchmarks.bench_bulk_ingest --tasks 5000 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from benchmarks.common import configure_environment
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchpassword"
+
+
+async def ingest(task_count: int, batch_size: int) -> tuple[float, float]:
+    import httpx
+
+    from app.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.post(
+            "/api/v1/users/register", json={"email": EMAIL, "password": PASSWORD}
+        )
+        response = await client.post(
+            "/api/v1/users/login", json={"email": EMAIL, "password": PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        started = time.perf_counter()
+        for i in range(task_count):
+            response = await client.post(
+                "/api/v1/tasks/", json={"title": f"Single {i}"}, headers=headers
+            )
+            response.raise_for_status()
+        single = task_count / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        for offset in range(0, task_count, batch_size):
+            items = [
+                {"title": f"Bulk {i}"}
+                for i in range(offset, min(offset + batch_size, task_count))
+            ]
+            response = await client.post(
+                "/api/v1/tasks/bulk", json={"items": items}, headers=headers
+            )
+            response.raise_for_status()
+        bulk = task_count / (time.perf_counter() - started)
+
+    return single, bulk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        single, bulk = asyncio.run(ingest(args.tasks, args.batch_size))
+
+    print(f"single POST /tasks/:    {single:>10.0f} tasks/s")
+    print(f"bulk POST /tasks/bulk:  {bulk:>10.0f} tasks/s ({bulk / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""Cost of holding many idle task event streams, and of fanning out to them.
+
+Opens ``--subscribers`` GET /api/v1/tasks/events streams spread over
+``--users`` users, driving the ASGI app in-process, and reports the Python
+memory each idle stream holds. Then publishes events to single users and
+reports the latency until the stream receives them, and finally one event
+for every user at once and how long until all streams have it.
+
+    python -m benchmarks.bench_events --subscribers 10000 --users 1000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import configure_environment, percentile, user_id
+
+
+def seed(users: int) -> list[str]:
+    """An access token per user"""
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.auth.service import create_access_token
+    from app.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id(n),
+                    "email": f"events{n}@example.com",
+                    "hashed_password": "",
+                }
+                for n in range(users)
+            ],
+        )
+        db.commit()
+    return [
+        create_access_token({"sub": f"events{n}@example.com"}) for n in range(users)
+    ]
+
+
+class Stream:
+    """An event stream driven as raw ASGI, counting the chunks it receives"""
+
+    __slots__ = ("received", "arrived", "closed", "task")
+
+    def __init__(self, app, token: str):
+        self.received = 0
+        self.arrived = asyncio.Event()
+        self.closed = asyncio.Event()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.3"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/v1/tasks/events",
+            "raw_path": b"/api/v1/tasks/events",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        self.task = asyncio.create_task(app(scope, self.receive, self.send))
+
+    async def receive(self):
+        await self.closed.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            self.received += 1
+            self.arrived.set()
+
+    async def next(self):
+        await self.arrived.wait()
+        self.arrived.clear()
+
+
+async def run(args, tokens: list[str]):
+    import httpx
+
+    from app.main import app
+    from app.tasks.events import task_events
+
+    # Load every principal into the cache, as streams reconnecting would
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for token in tokens:
+            await client.get(
+                "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+            )
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    streams = [Stream(app, tokens[n % len(tokens)]) for n in range(args.subscribers)]
+    await asyncio.gather(*(stream.next() for stream in streams))
+    opened = time.perf_counter() - started
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(
+        f"opened {args.subscribers} streams in {opened:.2f}s, "
+        f"{held / args.subscribers / 1024:.1f} KiB each while idle"
+    )
+
+    by_user = {}
+    for n, stream in enumerate(streams):
+        by_user.setdefault(user_id(n % len(tokens)), []).append(stream)
+    owners = list(by_user)
+
+    latencies = []
+    for n in range(args.rounds):
+        owner = owners[n % len(owners)]
+        begun = time.perf_counter()
+        task_events.publish("deleted", owner, owner)
+        await asyncio.gather(*(stream.next() for stream in by_user[owner]))
+        latencies.append(time.perf_counter() - begun)
+    print(
+        f"one event to one user's {args.subscribers // len(tokens)} streams: "
+        f"p50 {percentile(latencies, 50) * 1000:.3f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:.3f} ms"
+    )
+
+    begun = time.perf_counter()
+    for owner in owners:
+        task_events.publish("deleted", owner, owner)
+    await asyncio.gather(*(stream.next() for stream in streams))
+    elapsed = time.perf_counter() - begun
+    print(
+        f"one event to every user: all {args.subscribers} streams had it in "
+        f"{elapsed * 1000:.1f} ms ({args.subscribers / elapsed:.0f} deliveries/s)"
+    )
+
+    for stream in streams:
+        stream.closed.set()
+    await asyncio.gather(*(stream.task for stream in streams))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/events.db", RATE_LIMIT_ENABLED="false")
+        tokens = seed(args.users)
+        asyncio.run(run(args, tokens))
+
+
+if __name__ == "__main__":
+    main()
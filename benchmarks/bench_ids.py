@@ -0,0 +1,122 @@
+"""Insert throughput and index size by primary key format.
+
+Inserts ``--rows`` rows shaped like tasks (key, owner key, created_at, title,
+and the (owner_id, created_at, id) index) into a fresh SQLite file for each
+key format, in transactions of ``--batch-size``, and reports rows per second
+overall and over the last tenth of the rows, when the indexes have long
+outgrown the page cache, followed by the size of each index.
+
+    python -m benchmarks.bench_ids --rows 10000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    text,
+)
+
+from app.ids import BinaryUUID, generate_uuid
+
+OWNERS = 100
+
+# (label, column type, key factory)
+FORMATS = (
+    ("text uuid4", String(36), lambda: str(uuid.uuid4())),
+    ("text uuid7", String(36), generate_uuid),
+    ("binary uuid4", BinaryUUID(), lambda: str(uuid.uuid4())),
+    ("binary uuid7", BinaryUUID(), generate_uuid),
+)
+
+
+def run(path: str, key_type, new_key, rows: int, batch_size: int) -> dict:
+    metadata = MetaData()
+    table = Table(
+        "tasks",
+        metadata,
+        Column("id", key_type, primary_key=True),
+        Column("owner_id", key_type, nullable=False),
+        Column("created_at", DateTime(timezone=True)),
+        Column("title", String(100), nullable=False),
+        Index("ix_tasks_owner_id_created_at_id", "owner_id", "created_at", "id"),
+    )
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    owners = [new_key() for _ in range(OWNERS)]
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+    tail_from = rows - rows // 10
+    tail_started = None
+
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        for start in range(0, rows, batch_size):
+            if tail_started is None and start >= tail_from:
+                tail_started = time.perf_counter()
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                batch.append(
+                    {
+                        "id": new_key(),
+                        "owner_id": owners[i % OWNERS],
+                        "created_at": created_at + timedelta(milliseconds=i),
+                        "title": f"Task {i}",
+                    }
+                )
+            connection.execute(insert(table), batch)
+            connection.commit()
+        finished = time.perf_counter()
+        sizes = dict(
+            connection.execute(
+                text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+            ).all()
+        )
+    engine.dispose()
+
+    tail_started = tail_started or started
+    return {
+        "rows_per_s": rows / (finished - started),
+        "tail_rows_per_s": (rows - tail_from) / (finished - tail_started),
+        "table_mb": sizes["tasks"] / 2**20,
+        "pk_mb": sizes["sqlite_autoindex_tasks_1"] / 2**20,
+        "owner_index_mb": sizes["ix_tasks_owner_id_created_at_id"] / 2**20,
+        "file_mb": os.path.getsize(path) / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(
+        f"{'format':<14}{'rows/s':>10}{'last 10%':>10}{'table MB':>10}"
+        f"{'pk MB':>10}{'owner MB':>10}{'file MB':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, (label, key_type, new_key) in enumerate(FORMATS):
+            result = run(
+                f"{tmp}/ids{number}.db", key_type, new_key, args.rows, args.batch_size
+            )
+            print(
+                f"{label:<14}{result['rows_per_s']:>10.0f}"
+                f"{result['tail_rows_per_s']:>10.0f}{result['table_mb']:>10.1f}"
+                f"{result['pk_mb']:>10.1f}{result['owner_index_mb']:>10.1f}"
+                f"{result['file_mb']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
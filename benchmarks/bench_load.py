@@ -0,0 +1,317 @@
+"""Load test of the whole API with a weighted mix of requests.
+
+Seeds a SQLite file with ``--users`` users owning ``--tasks-per-user`` tasks
+each, then runs ``--concurrency`` clients for ``--duration`` seconds (after
+``--warmup`` seconds that are not recorded). Each client picks requests from
+MIX by weight, as one of the users. The app is either driven in-process
+through httpx's ASGI transport (``--target inprocess``, no network or server
+overhead) or over HTTP against a local uvicorn (``--target uvicorn``).
+
+Reports throughput and p50/p95/p99 latency per endpoint. ``--save`` writes
+them as a JSON baseline; ``--compare`` checks a run against a baseline and
+exits with status 1 if any endpoint's p95 grew, or its throughput fell, by
+more than ``--tolerance``.
+
+    python -m benchmarks.bench_load --save benchmarks/baselines/load_inprocess.json
+    python -m benchmarks.bench_load --compare benchmarks/baselines/load_inprocess.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import configure_environment, percentile, user_id
+
+PASSWORD = "benchpassword"
+WORDS = ("alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel")
+
+# (endpoint, weight); endpoints are labelled by route template
+MIX = (
+    ("GET /api/v1/tasks/", 30),
+    ("GET /api/v1/tasks/{task_id}", 20),
+    ("GET /api/v1/tasks/search", 10),
+    ("POST /api/v1/tasks/batch-get", 5),
+    ("POST /api/v1/tasks/", 10),
+    ("PATCH /api/v1/tasks/{task_id}", 10),
+    ("GET /api/v1/users/me", 5),
+)
+
+
+def seed(users: int, tasks_per_user: int) -> dict[str, list[str]]:
+    """Task ids by user email"""
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.auth.utils import get_password_hash
+    from app.database import Base, SessionLocal, engine
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+    from app.tasks import search  # noqa: F401  (registers the FTS5 DDL)
+
+    rng = random.Random(5)
+    hashed_password = get_password_hash(PASSWORD)
+    task_ids = {}
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        for number in range(users):
+            email = f"load{number}@example.com"
+            db.execute(
+                insert(User),
+                [
+                    {
+                        "id": user_id(number),
+                        "email": email,
+                        "hashed_password": hashed_password,
+                    }
+                ],
+            )
+            rows = [
+                {
+                    "id": generate_uuid(),
+                    "title": " ".join(rng.choices(WORDS, k=3)),
+                    "description": f"Load test task {i} "
+                    + " ".join(rng.choices(WORDS, k=8)),
+                    "owner_id": user_id(number),
+                }
+                for i in range(tasks_per_user)
+            ]
+            db.execute(insert(Task), rows)
+            task_ids[email] = [row["id"] for row in rows]
+        db.commit()
+    return task_ids
+
+
+def request_for(endpoint: str, task_ids: list[str], rng: random.Random):
+    """``(method, url, keyword arguments)`` for one request to ``endpoint``"""
+    method, path = endpoint.split(" ")
+    if endpoint == "GET /api/v1/tasks/":
+        return method, path, {"params": {"limit": 20, "cursor": ""}}
+    if endpoint == "GET /api/v1/tasks/search":
+        return method, path, {"params": {"q": rng.choice(WORDS), "limit": 20}}
+    if endpoint == "POST /api/v1/tasks/batch-get":
+        return method, path, {"json": {"ids": rng.sample(task_ids, 20)}}
+    if endpoint == "POST /api/v1/tasks/":
+        return method, path, {"json": {"title": " ".join(rng.choices(WORDS, k=3))}}
+    if endpoint == "PATCH /api/v1/tasks/{task_id}":
+        url = path.format(task_id=rng.choice(task_ids))
+        return method, url, {"json": {"description": rng.choice(WORDS)}}
+    return method, path.format(task_id=rng.choice(task_ids)), {}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_uvicorn(port: int):
+    import httpx
+
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    async with httpx.AsyncClient() as client:
+        for _ in range(300):
+            try:
+                await client.get(f"http://127.0.0.1:{port}/health")
+                return server
+            except httpx.TransportError:
+                await asyncio.sleep(0.1)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def drive(args, task_ids: dict[str, list[str]]) -> dict:
+    import httpx
+
+    server = None
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.target == "uvicorn":
+        port = free_port()
+        server = await start_uvicorn(port)
+        client = httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        )
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+        )
+
+    try:
+        tokens = {}
+        for email in task_ids:
+            response = await client.post(
+                "/api/v1/users/login", json={"email": email, "password": PASSWORD}
+            )
+            tokens[email] = response.json()["access_token"]
+
+        emails = list(task_ids)
+        endpoints = [endpoint for endpoint, _ in MIX]
+        weights = [weight for _, weight in MIX]
+        latencies = {endpoint: [] for endpoint in endpoints}
+        errors = {endpoint: 0 for endpoint in endpoints}
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        deadline = measure_from + args.duration
+
+        async def worker(number: int):
+            rng = random.Random(number)
+            email = emails[number % len(emails)]
+            headers = {"Authorization": f"Bearer {tokens[email]}"}
+            while time.perf_counter() < deadline:
+                endpoint = rng.choices(endpoints, weights)[0]
+                method, url, kwargs = request_for(endpoint, task_ids[email], rng)
+                begun = time.perf_counter()
+                response = await client.request(method, url, headers=headers, **kwargs)
+                if begun < measure_from:
+                    continue
+                latencies[endpoint].append(time.perf_counter() - begun)
+                if response.status_code >= 400:
+                    errors[endpoint] += 1
+
+        await asyncio.gather(*(worker(n) for n in range(args.concurrency)))
+    finally:
+        await client.aclose()
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    def summary(samples: list[float], error_count: int) -> dict:
+        return {
+            "requests": len(samples),
+            "errors": error_count,
+            "rps": len(samples) / args.duration,
+            "p50_ms": percentile(samples or [0], 50) * 1000,
+            "p95_ms": percentile(samples or [0], 95) * 1000,
+            "p99_ms": percentile(samples or [0], 99) * 1000,
+        }
+
+    return {
+        "config": {
+            "target": args.target,
+            "async_db": args.async_db,
+            "users": args.users,
+            "tasks_per_user": args.tasks_per_user,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+        },
+        "endpoints": {
+            endpoint: summary(latencies[endpoint], errors[endpoint])
+            for endpoint in endpoints
+        },
+        "total": summary(
+            [sample for samples in latencies.values() for sample in samples],
+            sum(errors.values()),
+        ),
+    }
+
+
+def report(result: dict):
+    print(
+        f"{'endpoint':<34}{'requests':>10}{'rps':>10}{'p50 ms':>10}"
+        f"{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+    )
+    rows = {**result["endpoints"], "total": result["total"]}
+    for name, stats in rows.items():
+        print(
+            f"{name:<34}{stats['requests']:>10}{stats['rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+            f"{stats['p99_ms']:>10.2f}{stats['errors']:>8}"
+        )
+
+
+def regressions(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """What got worse than ``baseline`` by more than ``tolerance``"""
+    found = []
+    rows = {**result["endpoints"], "total": result["total"]}
+    expected = {**baseline["endpoints"], "total": baseline["total"]}
+    for name, before in expected.items():
+        after = rows.get(name)
+        if after is None:
+            found.append(f"{name}: missing from this run")
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            found.append(
+                f"{name}: p95 {after['p95_ms']:.2f} ms, baseline {before['p95_ms']:.2f} ms"
+            )
+        if after["rps"] < before["rps"] * (1 - tolerance):
+            found.append(
+                f"{name}: {after['rps']:.1f} rps, baseline {before['rps']:.1f}"
+            )
+        if after["errors"] > before["errors"]:
+            found.append(f"{name}: {after['errors']} errors")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--target", choices=("inprocess", "uvicorn"), default="inprocess"
+    )
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument(
+        "--async-db", action="store_true", help="serve with DATABASE_ASYNC=true"
+    )
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(
+            f"sqlite:///{tmp}/load.db",
+            DATABASE_ASYNC="true" if args.async_db else "false",
+            # A sync session waiting for a connection blocks the event loop,
+            # so every client gets one
+            DB_POOL_SIZE=str(args.concurrency),
+            # The load would otherwise be rejected by the per-user rate limit
+            RATE_LIMIT_ENABLED="false",
+        )
+        task_ids = seed(args.users, args.tasks_per_user)
+        result = asyncio.run(drive(args, task_ids))
+
+    report(result)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(result, file, indent=2)
+            file.write("\n")
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        if baseline["config"] != result["config"]:
+            print(f"warning: baseline was run with {baseline['config']}")
+        found = regressions(result, baseline, args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} of {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
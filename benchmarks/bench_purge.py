@@ -0,0 +1,145 @@
+"""Hard vs soft task deletes, and the purge running next to live writers.
+
+Seeds a SQLite file with ``--users`` users owning ``--tasks`` tasks between
+them and times ``TaskRepository.delete_user_tasks`` removing ``--deletes``
+tasks in batches of ``--delete-batch``, with TASK_SOFT_DELETE off and on.
+Then purges the soft-deleted rows with ``app.tasks.purge`` while another
+thread keeps patching live tasks, and reports the purge's rows per second
+and lock wait next to the writer's latency.
+
+    python -m benchmarks.bench_purge --tasks 200000 --deletes 20000
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from benchmarks.common import configure_environment, percentile, user_id
+
+
+def seed(db, users: int, tasks: int, batch_size: int = 50_000):
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+
+    db.execute(
+        insert(User),
+        [
+            {"id": user_id(n), "email": f"purge{n}@example.com", "hashed_password": ""}
+            for n in range(users)
+        ],
+    )
+    for offset in range(0, tasks, batch_size):
+        db.execute(
+            insert(Task),
+            [
+                {
+                    "id": generate_uuid(),
+                    "title": f"Task {i}",
+                    "owner_id": user_id(i % users),
+                }
+                for i in range(offset, min(offset + batch_size, tasks))
+            ],
+        )
+    db.commit()
+
+
+def delete_some(repo, users: int, count: int, batch: int) -> float:
+    """Seconds to delete ``count`` tasks spread over the users"""
+    from app.tasks.models import Task
+
+    per_user = max(1, count // users)
+    elapsed = 0.0
+    for n in range(users):
+        owner_id = user_id(n)
+        ids = [
+            task_id
+            for (task_id,) in repo.get_user_tasks(
+                owner_id, limit=per_user, columns=(Task.id,)
+            )
+        ]
+        for start in range(0, len(ids), batch):
+            begun = time.perf_counter()
+            repo.delete_user_tasks(owner_id, ids[start : start + batch])
+            elapsed += time.perf_counter() - begun
+    return elapsed
+
+
+def patch_until(stop: threading.Event, users: int, latencies: list[float]):
+    from app.database import SessionLocal
+    from app.tasks.repository import TaskRepository
+
+    with SessionLocal() as db:
+        repo = TaskRepository(db)
+        targets = [
+            (user_id(n), repo.get_user_tasks(user_id(n), limit=1)[0].id)
+            for n in range(users)
+        ]
+        i = 0
+        while not stop.is_set():
+            owner_id, task_id = targets[i % len(targets)]
+            begun = time.perf_counter()
+            repo.patch_user_task(task_id, owner_id, {"title": f"Patched {i}"})
+            latencies.append(time.perf_counter() - begun)
+            i += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--deletes", type=int, default=20_000)
+    parser.add_argument("--delete-batch", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rows-per-second", type=float, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        from app.auth.models import User  # noqa: F401
+        from app.config import settings
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.purge import purge_deleted
+        from app.tasks.repository import TaskRepository
+
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            seed(db, args.users, args.tasks)
+            repo = TaskRepository(db)
+            for label, soft in (("hard", False), ("soft", True)):
+                settings.TASK_SOFT_DELETE = soft
+                elapsed = delete_some(repo, args.users, args.deletes, args.delete_batch)
+                print(
+                    f"{label} delete: {args.deletes / elapsed:.0f} tasks/s in "
+                    f"batches of {args.delete_batch}"
+                )
+
+        stop = threading.Event()
+        latencies: list[float] = []
+        writer = threading.Thread(
+            target=patch_until, args=(stop, args.users, latencies)
+        )
+        writer.start()
+        time.sleep(1)
+        alone = latencies[len(latencies) // 2 :]
+        before = len(latencies)
+        with SessionLocal() as db:
+            report = purge_deleted(
+                db, timedelta(0), args.batch_size, args.rows_per_second
+            )
+        stop.set()
+        writer.join()
+        print(report)
+        for label, samples in (("alone", alone), ("during purge", latencies[before:])):
+            print(
+                f"writer {label}: p50 {percentile(samples, 50) * 1000:.2f} ms, "
+                f"p99 {percentile(samples, 99) * 1000:.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Per-request overhead of RateLimitMiddleware.
+
+Drives the middleware directly with ASGI scopes in front of an app that does
+nothing, and reports the time it adds per request over calling that app
+alone: for login requests from ``--keys`` client addresses, for task
+requests from ``--keys`` users with cached principals and with principals
+not cached yet (whose tokens the middleware verifies itself, for
+get_current_user to reuse), and for paths that are not limited.
+
+    python -m benchmarks.bench_rate_limit --requests 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure_environment
+
+
+async def noop_app(scope, receive, send):
+    pass
+
+
+def scopes(path: str, count: int, tokens: list[str] = ()) -> list[dict]:
+    return [
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "client": (f"10.0.{i // 256 % 256}.{i % 256}", 50000),
+            "headers": [
+                (b"host", b"testserver"),
+                (b"user-agent", b"bench"),
+                *(
+                    [(b"authorization", f"Bearer {tokens[i]}".encode())]
+                    if tokens
+                    else []
+                ),
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+async def per_request_us(app, requests: list[dict], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for scope in requests:
+            await app(scope, None, None)
+    return (time.perf_counter() - started) / (rounds * len(requests)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    args = parser.parse_args()
+
+    # Limits high enough that every request is let through
+    configure_environment(
+        "sqlite://",
+        RATE_LIMIT_AUTH_PER_MINUTE="1e9",
+        RATE_LIMIT_AUTH_BURST="1000000000",
+        RATE_LIMIT_USER_PER_MINUTE="1e9",
+        RATE_LIMIT_USER_BURST="1000000000",
+    )
+    from app.auth.cache import principal_cache
+    from app.auth.schemas import User
+    from app.auth.service import create_access_token
+    from app.ratelimit import RateLimitMiddleware
+
+    tokens = [f"token-{i}" for i in range(args.keys)]
+    for i, token in enumerate(tokens):
+        principal_cache.put(
+            token,
+            User(id=f"user-{i}", email=f"user{i}@example.com", is_active=True),
+        )
+    cold_tokens = [
+        create_access_token({"sub": f"cold{i}@example.com"}) for i in range(args.keys)
+    ]
+    middleware = RateLimitMiddleware(
+        noop_app,
+        by_ip=("/api/v1/users/login", "/api/v1/users/register"),
+        by_user=("/api/v1/tasks", "/api/v1/users/me"),
+    )
+    rounds = max(1, args.requests // args.keys)
+    cases = {
+        "login by ip": scopes("/api/v1/users/login", args.keys),
+        "tasks by user": scopes("/api/v1/tasks/", args.keys, tokens),
+        "tasks, cold": scopes("/api/v1/tasks/", args.keys, cold_tokens),
+        "not limited": scopes("/health", args.keys),
+    }
+
+    async def run():
+        print(
+            f"{'requests':<16}{'baseline us':>12}{'limited us':>12}{'overhead us':>12}"
+        )
+        for name, requests in cases.items():
+            # Warm up, then measure
+            await per_request_us(middleware, requests, 1)
+            baseline = await per_request_us(noop_app, requests, rounds)
+            limited = await per_request_us(middleware, requests, rounds)
+            print(
+                f"{name:<16}{baseline:>12.2f}{limited:>12.2f}{limited - baseline:>12.2f}"
+            )
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cost of encoding GET /tasks pages: response model vs column tuples.
+
+Seeds ``--tasks`` tasks for one owner, then for pages of ``--limit`` rows
+times fetching and encoding the page the way ``response_model=list[Task]``
+does (ORM entities validated into Task models, then dumped) against the
+``FAST_SERIALIZATION`` path (TASK_COLUMNS tuples through encode_tasks).
+
+    python -m benchmarks.bench_serialization --limit 100
+"""
+
+import argparse
+import tempfile
+import time
+
+from benchmarks.common import configure_environment, percentile, user_id
+
+
+def seed(db, task_count: int):
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+
+    db.execute(
+        insert(User),
+        [{"id": user_id(0), "email": "owner@example.com", "hashed_password": ""}],
+    )
+    db.execute(
+        insert(Task),
+        [
+            {
+                "id": generate_uuid(),
+                "title": f"Task {i}",
+                "description": f"Description of task {i} " * 3,
+                "owner_id": user_id(0),
+            }
+            for i in range(task_count)
+        ],
+    )
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        import json
+
+        from pydantic import TypeAdapter
+
+        from app.auth.models import User  # noqa: F401
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.encoding import TASK_COLUMNS, encode_tasks
+        from app.tasks.repository import TaskRepository
+        from app.tasks.schemas import Task
+
+        Base.metadata.create_all(bind=engine)
+        adapter = TypeAdapter(list[Task])
+
+        def standard(repo, skip):
+            # What FastAPI does for a response_model on the default path
+            tasks = repo.get_user_tasks(user_id(0), skip, args.limit)
+            content = adapter.dump_python(
+                adapter.validate_python(tasks, from_attributes=True), mode="json"
+            )
+            return json.dumps(
+                content, ensure_ascii=False, separators=(",", ":")
+            ).encode()
+
+        def fast(repo, skip):
+            rows = repo.get_user_tasks(
+                user_id(0), skip, args.limit, columns=TASK_COLUMNS
+            )
+            return encode_tasks(rows)
+
+        with SessionLocal() as db:
+            seed(db, args.tasks)
+            repo = TaskRepository(db)
+            assert standard(repo, 0) == fast(repo, 0)
+
+            pages = max(1, args.tasks // args.limit)
+            print(f"{'path':<12}{'p50 ms':>10}{'p95 ms':>10}{'us/row':>10}")
+            for name, func in (("standard", standard), ("fast", fast)):
+                samples = []
+                for i in range(args.repeat):
+                    db.expunge_all()
+                    started = time.perf_counter()
+                    func(repo, (i % pages) * args.limit)
+                    samples.append((time.perf_counter() - started) * 1000)
+                p50 = percentile(samples, 50)
+                print(
+                    f"{name:<12}{p50:>10.2f}{percentile(samples, 95):>10.2f}"
+                    f"{p50 * 1000 / args.limit:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Offset vs keyset pagination cost at increasing page depths.
+
+Seeds a SQLite file with one user owning ``--tasks`` tasks and times fetching
+a page of ``--limit`` rows at several depths through
+``TaskRepository.get_user_tasks`` (OFFSET) and
+``TaskRepository.get_user_tasks_after`` (cursor).
+
+    python -m benchmarks.bench_task_pagination --tasks 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, UTC
+
+from benchmarks.common import configure_environment, user_id
+
+
+def seed(db, owner_id: str, task_count: int, batch_size: int = 50_000):
+    from sqlalchemy import insert
+
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    for offset in range(0, task_count, batch_size):
+        rows = [
+            {
+                "id": generate_uuid(),
+                "title": f"Task {i}",
+                "owner_id": owner_id,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + batch_size, task_count))
+        ]
+        db.execute(insert(Task), rows)
+    db.commit()
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        from app.auth.models import User
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.repository import TaskRepository
+
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            owner_id = user_id(0)
+            db.add(User(id=owner_id, email="bench@example.com", hashed_password=""))
+            started = time.perf_counter()
+            seed(db, owner_id, args.tasks)
+            print(f"seeded {args.tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+            repo = TaskRepository(db)
+            depths = sorted(
+                {0, args.tasks // 100, args.tasks // 10, args.tasks // 2}
+                | {args.tasks - args.limit}
+            )
+            print(f"{'page start':>12}{'offset ms':>12}{'cursor ms':>12}")
+            for depth in depths:
+                # The cursor for a page is the last row of the previous one
+                after = None
+                if depth:
+                    (previous,) = repo.get_user_tasks(owner_id, skip=depth - 1, limit=1)
+                    after = (previous.created_at, previous.id)
+                offset_ms = timed(
+                    lambda: repo.get_user_tasks(owner_id, depth, args.limit),
+                    args.repeat,
+                )
+                cursor_ms = timed(
+                    lambda: repo.get_user_tasks_after(owner_id, after, args.limit),
+                    args.repeat,
+                )
+                print(f"{depth:>12}{offset_ms:>12.2f}{cursor_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
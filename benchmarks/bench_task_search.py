@@ -0,0 +1,121 @@
+"""Full-text search latency through TaskRepository.search_user_tasks.
+
+Seeds a SQLite file with ``--tasks`` tasks spread over ``--users`` owners,
+titled and described with words drawn from a fixed vocabulary, then times a
+first page of ``--limit`` hits for whole-word and prefix queries through the
+FTS5 index and through the in-memory fallback index.
+
+    python -m benchmarks.bench_task_search --tasks 1000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from benchmarks.common import configure_environment, percentile, user_id
+
+
+def vocabulary(size: int) -> list[str]:
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(4, 9))))
+    return sorted(words)
+
+
+def seed(db, words: list[str], users: int, task_count: int, batch_size=50_000):
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+
+    db.execute(
+        insert(User),
+        [
+            {"id": user_id(i), "email": f"user{i}@example.com", "hashed_password": ""}
+            for i in range(users)
+        ],
+    )
+    rng = random.Random(11)
+    for offset in range(0, task_count, batch_size):
+        rows = [
+            {
+                "id": generate_uuid(),
+                "title": " ".join(rng.choices(words, k=3)),
+                "description": " ".join(rng.choices(words, k=12)),
+                "owner_id": user_id(i % users),
+            }
+            for i in range(offset, min(offset + batch_size, task_count))
+        ]
+        db.execute(insert(Task), rows)
+    db.commit()
+
+
+def timed(func, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        from app.auth.models import User  # noqa: F401
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.search import InMemorySearch, fts5_search
+
+        words = vocabulary(args.vocabulary)
+        Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            seed(db, words, args.users, args.tasks)
+            print(f"seeded {args.tasks} tasks in {time.perf_counter() - started:.1f}s")
+
+            in_memory = InMemorySearch()
+            started = time.perf_counter()
+            in_memory.load(db)
+            print(f"loaded in-memory index in {time.perf_counter() - started:.1f}s")
+
+            rng = random.Random(3)
+            queries = {
+                "word": [rng.choice(words) for _ in range(args.queries)],
+                "two words": [
+                    " ".join(rng.choices(words, k=2)) for _ in range(args.queries)
+                ],
+                "prefix": [rng.choice(words)[:3] for _ in range(args.queries)],
+            }
+            print(f"{'query':<12}{'backend':<12}{'p50 ms':>10}{'p95 ms':>10}")
+            for name, texts in queries.items():
+                for backend_name, backend in (
+                    ("fts5", fts5_search),
+                    ("in-memory", in_memory),
+                ):
+                    samples = []
+                    for text in texts:
+                        owner = user_id(rng.randrange(args.users))
+                        samples += timed(
+                            lambda: backend.search(db, owner, text, None, args.limit),
+                            1,
+                        )
+                    print(
+                        f"{name:<12}{backend_name:<12}"
+                        f"{percentile(samples, 50):>10.2f}{percentile(samples, 95):>10.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
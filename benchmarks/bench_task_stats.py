@@ -0,0 +1,114 @@
+"""Kept per-owner task counts vs counting, at increasing task counts.
+
+For one user owning each of ``--tasks`` tasks, created over the last 30
+days, times the total and the per-day counts as /tasks/stats reads them, from
+task_owners and task_daily_counts, against COUNT(*) and GROUP BY over the
+tasks themselves. The tasks are seeded around the repository, so the kept
+counts start out wrong and ``app.tasks.reconcile`` repairs them first; its
+time is reported too.
+
+    python -m benchmarks.bench_task_stats --tasks 1000 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+
+from benchmarks.bench_task_pagination import timed
+from benchmarks.common import configure_environment, user_id
+
+DAYS = 30
+
+
+def seed(db, owner_id: str, task_count: int, batch_size: int = 50_000):
+    from sqlalchemy import insert
+
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+
+    now = datetime.now(UTC)
+    step = timedelta(days=DAYS) / task_count
+    for offset in range(0, task_count, batch_size):
+        rows = [
+            {
+                "id": generate_uuid(),
+                "title": f"Task {i}",
+                "owner_id": owner_id,
+                "created_at": now - step * i,
+            }
+            for i in range(offset, min(offset + batch_size, task_count))
+        ]
+        db.execute(insert(Task), rows)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[1000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        from sqlalchemy import func, select
+
+        from app.auth.models import User
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.models import Task, utc_day, utcnow
+        from app.tasks.reconcile import reconcile_batch
+        from app.tasks.repository import TaskRepository
+
+        Base.metadata.create_all(bind=engine)
+        print(
+            f"{'tasks':>10}{'reconcile ms':>14}{'COUNT ms':>10}{'kept ms':>9}"
+            f"{'GROUP BY ms':>13}{'kept ms':>9}"
+        )
+        for n, task_count in enumerate(args.tasks):
+            with SessionLocal() as db:
+                owner_id = user_id(n)
+                db.add(
+                    User(id=owner_id, email=f"stats{n}@example.com", hashed_password="")
+                )
+                seed(db, owner_id, task_count)
+                repo = TaskRepository(db)
+
+                started = time.perf_counter()
+                repo.lock_owners([owner_id])
+                reconcile_batch(db, [owner_id])
+                db.commit()
+                reconcile_ms = (time.perf_counter() - started) * 1000
+
+                since = utc_day(utcnow()) - timedelta(days=DAYS - 1)
+                count = select(func.count()).where(
+                    Task.owner_id == owner_id, Task.deleted_at.is_(None)
+                )
+                day = func.date(Task.created_at)
+                per_day = (
+                    select(day, func.count())
+                    .where(
+                        Task.owner_id == owner_id,
+                        Task.deleted_at.is_(None),
+                        Task.created_at >= since,
+                    )
+                    .group_by(day)
+                )
+                assert repo.get_user_task_count(owner_id) == db.scalar(count)
+                count_ms = timed(lambda: db.scalar(count), args.repeat)
+                kept_count_ms = timed(
+                    lambda: repo.get_user_task_count(owner_id), args.repeat
+                )
+                group_ms = timed(lambda: db.execute(per_day).all(), args.repeat)
+                kept_days_ms = timed(
+                    lambda: repo.get_user_task_days(owner_id, since), args.repeat
+                )
+                print(
+                    f"{task_count:>10}{reconcile_ms:>14.1f}{count_ms:>10.2f}"
+                    f"{kept_count_ms:>9.2f}{group_ms:>13.2f}{kept_days_ms:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
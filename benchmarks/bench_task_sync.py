@@ -0,0 +1,76 @@
+"""Incremental sync vs re-reading the whole list, at increasing list sizes.
+
+Seeds a SQLite file with one user owning ``--tasks`` tasks, takes a sync
+token, then changes ``--changes`` of them (half updated, half deleted) and
+times ``TaskRepository.get_user_task_changes`` from that token against
+reading every task with ``TaskRepository.get_user_tasks``, which is what a
+client without the token has to do.
+
+    python -m benchmarks.bench_task_sync --tasks 1000 10000 100000 1000000
+"""
+
+import argparse
+import tempfile
+
+from benchmarks.bench_task_pagination import seed, timed
+from benchmarks.common import configure_environment, user_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[1000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(f"sqlite:///{tmp}/bench.db")
+        from app.auth.models import User
+        from app.database import Base, SessionLocal, engine
+        from app.tasks.repository import TaskRepository
+
+        Base.metadata.create_all(bind=engine)
+        print(f"{'tasks':>10}{'changes':>9}{'full list ms':>14}{'sync ms':>10}")
+        for n, task_count in enumerate(args.tasks):
+            with SessionLocal() as db:
+                owner_id = user_id(n)
+                db.add(
+                    User(id=owner_id, email=f"sync{n}@example.com", hashed_password="")
+                )
+                seed(db, owner_id, task_count)
+                repo = TaskRepository(db)
+
+                # Where a client that synced everything would stand
+                *_, (seq, task_id, _) = repo.get_user_task_changes(
+                    owner_id, None, task_count
+                )
+                tasks = repo.get_user_tasks(owner_id, limit=args.changes)
+                half = len(tasks) // 2
+                for task in tasks[:half]:
+                    repo.patch_user_task(task.id, owner_id, {"title": "Changed"})
+                repo.delete_user_tasks(owner_id, [task.id for task in tasks[half:]])
+                db.expunge_all()
+
+                changes = repo.get_user_task_changes(
+                    owner_id, (seq, task_id), task_count
+                )
+                assert len(changes) == len(tasks)
+                full_ms = timed(
+                    lambda: repo.get_user_tasks(owner_id, limit=task_count),
+                    args.repeat,
+                )
+                sync_ms = timed(
+                    lambda: repo.get_user_task_changes(
+                        owner_id, (seq, task_id), task_count
+                    ),
+                    args.repeat,
+                )
+                print(
+                    f"{task_count:>10}{len(changes):>9}{full_ms:>14.2f}{sync_ms:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
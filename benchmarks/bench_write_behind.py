@@ -0,0 +1,117 @@
+"""Task creation with a commit per request vs write-behind group commit.
+
+Drives the ASGI app in-process against a fresh SQLite file with
+``--concurrency`` clients creating tasks for ``--duration`` seconds, once
+with WRITE_BEHIND_ENABLED off and once on, and reports tasks created and
+database commits per second and the p50/p99 latency of POST /tasks/.
+
+    python -m benchmarks.bench_write_behind --concurrency 50 --synchronous FULL
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from benchmarks.common import configure_environment, percentile
+
+EMAIL = "bench@example.com"
+PASSWORD = "benchpassword"
+
+
+async def create_tasks(client, headers: dict, concurrency: int, duration: float):
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def worker(number: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            begun = time.perf_counter()
+            response = await client.post(
+                "/api/v1/tasks/", json={"title": f"Task {number}-{i}"}, headers=headers
+            )
+            assert response.status_code == 201, response.text
+            latencies.append(time.perf_counter() - begun)
+            i += 1
+
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies
+
+
+async def run(args):
+    import httpx
+    from sqlalchemy import event
+
+    from app.config import settings
+    from app.database import Base, async_engine, engine
+    from app.main import app
+    from app.tasks.writebehind import task_writer
+
+    Base.metadata.create_all(bind=engine)
+    commits = 0
+
+    def count_commit(connection):
+        nonlocal commits
+        commits += 1
+
+    event.listen(engine, "commit", count_commit)
+    if async_engine is not None:
+        event.listen(async_engine.sync_engine, "commit", count_commit)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        await client.post(
+            "/api/v1/users/register", json={"email": EMAIL, "password": PASSWORD}
+        )
+        response = await client.post(
+            "/api/v1/users/login", json={"email": EMAIL, "password": PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        await client.get("/api/v1/users/me", headers=headers)
+
+        print(f"{'mode':<14}{'tasks/s':>10}{'commits/s':>11}{'p50 ms':>9}{'p99 ms':>9}")
+        for label, enabled in (("per request", False), ("write-behind", True)):
+            settings.WRITE_BEHIND_ENABLED = enabled
+            commits_before = commits
+            latencies = await create_tasks(
+                client, headers, args.concurrency, args.duration
+            )
+            print(
+                f"{label:<14}{len(latencies) / args.duration:>10.0f}"
+                f"{(commits - commits_before) / args.duration:>11.0f}"
+                f"{percentile(latencies, 50) * 1000:>9.2f}"
+                f"{percentile(latencies, 99) * 1000:>9.2f}"
+            )
+        await task_writer.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument(
+        "--async-db", action="store_true", help="serve with DATABASE_ASYNC=true"
+    )
+    parser.add_argument(
+        "--synchronous",
+        default="NORMAL",
+        help="SQLITE_SYNCHRONOUS; FULL syncs the WAL on every commit",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure_environment(
+            f"sqlite:///{tmp}/bench.db",
+            DATABASE_ASYNC="true" if args.async_db else "false",
+            DB_POOL_SIZE=str(args.concurrency),
+            RATE_LIMIT_ENABLED="false",
+            SQLITE_SYNCHRONOUS=args.synchronous,
+        )
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import uuid
+
+
+def configure_environment(database_url: str, **overrides: str):
+    """Point the app settings at ``database_url`` before ``app`` is imported"""
+    os.environ.update(
+        {
+            "DATABASE_URL": database_url,
+            "PORT": os.environ.get("PORT", "8000"),
+            "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret"),
+            "ALGORITHM": os.environ.get("ALGORITHM", "HS256"),
+            "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+            **overrides,
+        }
+    )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def user_id(number: int) -> str:
+    """Fixed id of the ``number``th user a benchmark seeds"""
+    return str(uuid.UUID(int=number + 1))
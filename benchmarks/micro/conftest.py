@@ -0,0 +1,77 @@
+"""Fixtures for the pytest-benchmark microbenchmarks.
+
+The app is pointed at a SQLite file seeded once per session with
+``--bench-users`` users owning ``--bench-tasks`` tasks between them.
+"""
+
+import tempfile
+
+import pytest
+
+from benchmarks.common import configure_environment, user_id
+
+_tmp = tempfile.TemporaryDirectory()
+configure_environment(f"sqlite:///{_tmp.name}/micro.db", RATE_LIMIT_ENABLED="false")
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-users", type=int, default=10)
+    parser.addoption("--bench-tasks", type=int, default=100_000)
+
+
+@pytest.fixture(scope="session")
+def seeded(request):
+    from sqlalchemy import insert
+
+    from app.auth.models import User
+    from app.database import Base, SessionLocal, engine
+    from app.ids import generate_uuid
+    from app.tasks.models import Task
+    from app.tasks import search  # noqa: F401  (registers the FTS5 DDL)
+
+    users = request.config.getoption("--bench-users")
+    task_count = request.config.getoption("--bench-tasks")
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id(i),
+                    "email": f"user{i}@example.com",
+                    "hashed_password": "",
+                }
+                for i in range(users)
+            ],
+        )
+        for start in range(0, task_count, 10_000):
+            rows = [
+                {
+                    "id": generate_uuid(),
+                    "title": f"Task {i} for user {i % users}",
+                    "description": f"Benchmark task number {i}",
+                    "owner_id": user_id(i % users),
+                }
+                for i in range(start, min(start + 10_000, task_count))
+            ]
+            db.execute(insert(Task), rows)
+        db.commit()
+    yield
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(seeded):
+    from app.database import SessionLocal
+
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def user_tasks(db):
+    """The first user's tasks, oldest first"""
+    from app.tasks.repository import TaskRepository
+
+    return TaskRepository(db).get_user_tasks(user_id(0), 0, 1000)
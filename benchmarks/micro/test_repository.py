@@ -0,0 +1,58 @@
+import pytest
+
+from benchmarks.common import user_id
+
+from app.tasks.encoding import TASK_COLUMNS
+from app.tasks.repository import TaskRepository
+from app.tasks.schemas import TaskCreate, TaskFilter, TaskSort
+
+USER = user_id(0)
+
+
+@pytest.fixture
+def repo(db):
+    return TaskRepository(db)
+
+
+def test_get_user_tasks_first_page(benchmark, repo):
+    benchmark(repo.get_user_tasks, USER, 0, 100)
+
+
+def test_get_user_tasks_columns(benchmark, repo):
+    benchmark(repo.get_user_tasks, USER, 0, 100, None, TASK_COLUMNS)
+
+
+def test_get_user_tasks_after(benchmark, repo, user_tasks):
+    middle = user_tasks[len(user_tasks) // 2]
+    benchmark(repo.get_user_tasks_after, USER, (middle.created_at, middle.id), 100)
+
+
+def test_get_user_tasks_filtered(benchmark, repo):
+    filters = TaskFilter(title_prefix="Task 1", sort=TaskSort.title_desc)
+    benchmark(repo.get_user_tasks, USER, 0, 100, filters)
+
+
+def test_get_user_tasks_stamp(benchmark, repo):
+    benchmark(repo.get_user_tasks_stamp, USER)
+
+
+def test_get_task(benchmark, repo, user_tasks):
+    benchmark(repo.get_task, user_tasks[-1].id)
+
+
+def test_get_user_tasks_by_ids(benchmark, repo, user_tasks):
+    benchmark(repo.get_user_tasks_by_ids, USER, [task.id for task in user_tasks[:100]])
+
+
+def test_search_user_tasks(benchmark, repo):
+    benchmark(repo.search_user_tasks, USER, "number 1234", None, 20)
+
+
+def test_patch_user_task(benchmark, repo, user_tasks):
+    task_id = user_tasks[0].id
+    benchmark(repo.patch_user_task, task_id, USER, {"description": "Patched"})
+
+
+def test_create_user_tasks(benchmark, repo):
+    tasks = [TaskCreate(title=f"Created {i}") for i in range(100)]
+    benchmark.pedantic(repo.create_user_tasks, args=(USER, tasks), rounds=20)
@@ -0,0 +1,47 @@
+from pydantic import TypeAdapter
+
+from benchmarks.common import user_id
+
+from app.tasks.encoding import TASK_COLUMNS, encode_tasks
+from app.tasks.pagination import decode_cursor, encode_cursor
+from app.tasks.repository import TaskRepository
+from app.tasks.schemas import Task, TaskCreate, TaskFilter
+
+tasks_adapter = TypeAdapter(list[Task])
+
+
+def test_validate_task_create(benchmark):
+    payload = {"title": "Buy <milk> & bread", "description": "From the shop " * 10}
+    benchmark(TaskCreate.model_validate, payload)
+
+
+def test_validate_task_filter(benchmark):
+    params = {
+        "created_after": "2025-01-01T00:00:00Z",
+        "created_before": "2025-02-01T00:00:00+02:00",
+        "title_prefix": "Buy",
+        "sort": "-title",
+    }
+    benchmark(TaskFilter.model_validate, params)
+
+
+def test_serialize_task_page(benchmark, user_tasks):
+    """What response_model=list[Task] does with a page of 100 ORM tasks"""
+    page = user_tasks[:100]
+
+    def serialize():
+        tasks = tasks_adapter.validate_python(page, from_attributes=True)
+        return tasks_adapter.dump_json(tasks)
+
+    benchmark(serialize)
+
+
+def test_encode_task_page(benchmark, db):
+    """The FAST_SERIALIZATION path for the same page"""
+    rows = TaskRepository(db).get_user_tasks(user_id(0), 0, 100, columns=TASK_COLUMNS)
+    benchmark(encode_tasks, rows)
+
+
+def test_cursor_round_trip(benchmark, user_tasks):
+    task = user_tasks[0]
+    benchmark(lambda: decode_cursor(encode_cursor(task)))